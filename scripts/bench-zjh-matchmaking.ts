@@ -0,0 +1,150 @@
+/**
+ * 炸金花快速匹配压测
+ * 用法：npm run bench:zjh-match -- [玩家数] [每秒到达人数]
+ *
+ * 建一批临时用户（筹码放在最高档，避免与库中已有房间混在一起），按给定速率到达，
+ * 分别走 Redis 批次匹配与直接查表匹配，统计每秒匹配数、入座延迟与开出牌桌的坐满率；
+ * 结束后清理全部临时数据。需要 DATABASE_URL 指向可写的测试库，批次匹配需要 Redis 可用。
+ */
+
+import { randomUUID } from 'crypto';
+import { prisma } from '@/lib/prisma';
+import { redis } from '@/lib/redis';
+import { DEFAULT_ROOM_CONFIG } from '@/lib/zjh/constants';
+import { MATCH_TIERS } from '@/lib/zjh/matchmaking/plan';
+import {
+  matchPlayer,
+  matchPlayerDirect,
+  removeRoomFromQueue,
+  type MatchPlayerResult,
+} from '@/lib/zjh/matchmaking/queue';
+
+const CHIPS = MATCH_TIERS[MATCH_TIERS.length - 1];
+
+interface RunStats {
+  matchesPerSecond: number;
+  p50: number;
+  p95: number;
+  rooms: number;
+  fullRooms: number;
+  fillRate: number;
+  failures: number;
+}
+
+async function createUsers(count: number): Promise<string[]> {
+  const tag = randomUUID().slice(0, 8);
+  const userIds = Array.from({ length: count }, () => randomUUID());
+  await prisma.user.createMany({
+    data: userIds.map((id, i) => ({ id, username: `bench_match_${tag}_${i}`, isGuest: true })),
+  });
+  await prisma.zjhPlayerStats.createMany({
+    data: userIds.map((userId) => ({ userId, currentChips: CHIPS })),
+  });
+  return userIds;
+}
+
+async function removeUsers(userIds: string[]): Promise<void> {
+  const rooms = await prisma.zjhRoom.findMany({
+    where: { ownerId: { in: userIds } },
+    select: { id: true, minChips: true },
+  });
+  for (const room of rooms) await removeRoomFromQueue(room.id, room.minChips);
+  await prisma.zjhRoomPlayer.deleteMany({ where: { userId: { in: userIds } } });
+  await prisma.zjhRoom.deleteMany({ where: { id: { in: rooms.map((r) => r.id) } } });
+  await prisma.zjhPlayerStats.deleteMany({ where: { userId: { in: userIds } } });
+  await prisma.user.deleteMany({ where: { id: { in: userIds } } });
+}
+
+function percentile(sorted: number[], p: number): number {
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+/**
+ * 按到达速率依次发起匹配，等待全部入座
+ */
+async function run(
+  userIds: string[],
+  arrivalsPerSecond: number,
+  match: (userId: string) => Promise<MatchPlayerResult>
+): Promise<RunStats> {
+  const latencies: number[] = [];
+  const seatsByRoom = new Map<string, number>();
+  let failures = 0;
+
+  const start = performance.now();
+  await Promise.all(
+    userIds.map(async (userId, i) => {
+      await new Promise((resolve) => setTimeout(resolve, (i * 1000) / arrivalsPerSecond));
+      const arrivedAt = performance.now();
+      const result = await match(userId).catch(() => null);
+      latencies.push(performance.now() - arrivedAt);
+      if (!result?.ok) {
+        failures++;
+        return;
+      }
+      seatsByRoom.set(result.data.roomId, (seatsByRoom.get(result.data.roomId) ?? 0) + 1);
+    })
+  );
+  const elapsed = (performance.now() - start) / 1000;
+
+  latencies.sort((a, b) => a - b);
+  const seated = userIds.length - failures;
+  const rooms = seatsByRoom.size;
+  return {
+    matchesPerSecond: seated / elapsed,
+    p50: percentile(latencies, 0.5),
+    p95: percentile(latencies, 0.95),
+    rooms,
+    fullRooms: [...seatsByRoom.values()].filter((n) => n >= DEFAULT_ROOM_CONFIG.maxPlayers).length,
+    fillRate: rooms > 0 ? seated / (rooms * DEFAULT_ROOM_CONFIG.maxPlayers) : 0,
+    failures,
+  };
+}
+
+async function waitForRedis(timeoutMs: number): Promise<boolean> {
+  if (redis.status === 'ready') return true;
+  return new Promise((resolve) => {
+    const timer = setTimeout(() => resolve(false), timeoutMs);
+    redis.once('ready', () => {
+      clearTimeout(timer);
+      resolve(true);
+    });
+  });
+}
+
+async function main() {
+  const players = Number.parseInt(process.argv[2] ?? '240', 10);
+  const arrivalsPerSecond = Number.parseInt(process.argv[3] ?? '200', 10);
+  const redisReady = await waitForRedis(5000);
+  console.log(`${players} 名玩家，每秒到达 ${arrivalsPerSecond} 人，每桌 ${DEFAULT_ROOM_CONFIG.maxPlayers} 人`);
+  if (!redisReady) console.log('Redis 不可用，批次匹配会退化为直接查表');
+  console.log('\n方式\t\t匹配/秒\tp50\t\tp95\t\t牌桌\t坐满\t坐满率\t失败');
+
+  const modes: [string, (userId: string) => Promise<MatchPlayerResult>][] = [
+    ['直接查表', (userId) => matchPlayerDirect(userId, CHIPS)],
+    ['Redis 批次', matchPlayer],
+  ];
+  for (const [name, match] of modes) {
+    const userIds = await createUsers(players);
+    try {
+      const stats = await run(userIds, arrivalsPerSecond, match);
+      console.log(
+        `${name}\t${stats.matchesPerSecond.toFixed(1)}\t${stats.p50.toFixed(1)}ms\t\t` +
+          `${stats.p95.toFixed(1)}ms\t\t${stats.rooms}\t${stats.fullRooms}\t` +
+          `${(stats.fillRate * 100).toFixed(1)}%\t${stats.failures}`
+      );
+    } finally {
+      await removeUsers(userIds);
+    }
+  }
+}
+
+main()
+  .catch((error) => {
+    console.error('压测运行失败:', error);
+    process.exit(1);
+  })
+  .finally(async () => {
+    redis.disconnect();
+    await prisma.$disconnect();
+  });
@@ -0,0 +1,134 @@
+/**
+ * 炸金花结算延迟基准
+ * 用法：npm run bench:zjh-settle -- [每档重复次数]
+ *
+ * 对 2–6 名玩家各建临时用户、房间与牌局，测量 settleGameInDb 的耗时，
+ * 以及同一局重复结算（幂等，直接返回）的耗时；结束后清理全部临时数据。
+ * 需要 DATABASE_URL 指向可写的测试库。
+ */
+
+import { randomUUID } from 'crypto';
+import { prisma } from '@/lib/prisma';
+import { createShuffledDeck, dealCards } from '@/lib/zjh/deck';
+import { settleGameInDb } from '@/lib/zjh/settle';
+
+const PLAYER_COUNTS = [2, 3, 4, 5, 6];
+const BASE_ANTE = 10;
+const CHIPS = 10000;
+
+interface Fixture {
+  roomId: string;
+  userIds: string[];
+}
+
+async function createFixture(playerCount: number): Promise<Fixture> {
+  const tag = randomUUID().slice(0, 8);
+  const userIds: string[] = [];
+  for (let i = 0; i < playerCount; i++) {
+    const user = await prisma.user.create({
+      data: { username: `bench_settle_${tag}_${i}`, isGuest: true },
+    });
+    userIds.push(user.id);
+  }
+
+  const room = await prisma.zjhRoom.create({
+    data: {
+      roomCode: tag.slice(0, 6).toUpperCase(),
+      ownerId: userIds[0],
+      status: 'PLAYING',
+      baseAnte: BASE_ANTE,
+      currentPlayers: playerCount,
+      players: {
+        create: userIds.map((userId, seatIndex) => ({ userId, seatIndex, chips: CHIPS })),
+      },
+    },
+  });
+
+  return { roomId: room.id, userIds };
+}
+
+/**
+ * 开一局：每人已下注若干轮，返回 gameId、奖池与赢家
+ */
+async function createGame(fixture: Fixture, gameIndex: number) {
+  const hands = dealCards(createShuffledDeck(), fixture.userIds.length);
+  const bets = fixture.userIds.map((_, i) => BASE_ANTE * (2 + i));
+  const pot = bets.reduce((sum, bet) => sum + bet, 0);
+
+  const game = await prisma.zjhGame.create({
+    data: {
+      roomId: fixture.roomId,
+      gameIndex,
+      status: 'BETTING',
+      deck: [],
+      pot,
+      currentAnte: BASE_ANTE,
+      currentRound: 3,
+      players: {
+        create: fixture.userIds.map((userId, seatIndex) => ({
+          userId,
+          seatIndex,
+          hand: JSON.parse(JSON.stringify(hands[seatIndex])),
+          totalBet: bets[seatIndex],
+          chipsBeforeGame: CHIPS,
+        })),
+      },
+    },
+  });
+
+  return { gameId: game.id, pot, winnerId: fixture.userIds[gameIndex % fixture.userIds.length] };
+}
+
+async function removeFixture(fixture: Fixture): Promise<void> {
+  await prisma.zjhRoom.delete({ where: { id: fixture.roomId } });
+  await prisma.zjhPlayerStats.deleteMany({ where: { userId: { in: fixture.userIds } } });
+  await prisma.user.deleteMany({ where: { id: { in: fixture.userIds } } });
+}
+
+function percentile(sorted: number[], p: number): number {
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+async function main() {
+  const repeats = Number.parseInt(process.argv[2] ?? '20', 10);
+  console.log(`每档 ${repeats} 局\n`);
+  console.log('玩家数\t结算 p50\t结算 p95\t重复结算 p50');
+
+  for (const playerCount of PLAYER_COUNTS) {
+    const fixture = await createFixture(playerCount);
+    const settleMs: number[] = [];
+    const repeatMs: number[] = [];
+
+    try {
+      for (let i = 0; i < repeats; i++) {
+        const { gameId, pot, winnerId } = await createGame(fixture, i + 1);
+
+        let start = performance.now();
+        const settled = await settleGameInDb(gameId, fixture.roomId, winnerId, pot, 3);
+        settleMs.push(performance.now() - start);
+        if (!settled) throw new Error(`牌局 ${gameId} 未能结算`);
+
+        start = performance.now();
+        const again = await settleGameInDb(gameId, fixture.roomId, winnerId, pot, 3);
+        repeatMs.push(performance.now() - start);
+        if (again) throw new Error(`牌局 ${gameId} 被重复结算`);
+      }
+    } finally {
+      await removeFixture(fixture);
+    }
+
+    settleMs.sort((a, b) => a - b);
+    repeatMs.sort((a, b) => a - b);
+    console.log(
+      `${playerCount}\t${percentile(settleMs, 0.5).toFixed(1)}ms\t\t` +
+        `${percentile(settleMs, 0.95).toFixed(1)}ms\t\t${percentile(repeatMs, 0.5).toFixed(1)}ms`
+    );
+  }
+}
+
+main()
+  .catch((error) => {
+    console.error('基准运行失败:', error);
+    process.exit(1);
+  })
+  .finally(() => prisma.$disconnect());
@@ -6,6 +6,7 @@
 
 import { NextRequest, NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
+import { recordLeaderboardScore } from '@/lib/leaderboard/store';
 
 // 提交游戏记录
 export async function POST(request: NextRequest) {
@@ -66,8 +67,8 @@ export async function POST(request: NextRequest) {
       });
     }
 
-    // 更新排行榜（简化版，实际应该使用后台任务）
-    await updateLeaderboard(userId, score);
+    // 更新排行榜（总榜 / 日榜 / 周榜 / 月榜），名次由后台任务回写
+    await recordLeaderboardScore(userId, score);
 
     return NextResponse.json(
       {
@@ -150,42 +151,3 @@ export async function GET(request: NextRequest) {
   }
 }
 
-// 更新排行榜辅助函数
-async function updateLeaderboard(userId: string, score: number) {
-  const period = 'all';
-  const type = 'ALL_TIME';
-
-  // 查找现有记录
-  const existing = await prisma.leaderboard.findUnique({
-    where: {
-      userId_type_period: {
-        userId,
-        type,
-        period,
-      },
-    },
-  });
-
-  if (existing) {
-    // 如果新分数更高，更新记录
-    if (score > existing.score) {
-      await prisma.leaderboard.update({
-        where: { id: existing.id },
-        data: { score },
-      });
-    }
-  } else {
-    // 创建新记录
-    await prisma.leaderboard.create({
-      data: {
-        userId,
-        type,
-        score,
-        rank: 0, // 将在批量更新排名时计算
-        period,
-      },
-    });
-  }
-
-  // TODO: 批量更新排名（应该使用后台任务）
-}
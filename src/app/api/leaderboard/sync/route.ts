@@ -0,0 +1,38 @@
+/**
+ * 排行榜名次回写（后台定时任务）
+ * GET /api/leaderboard/sync - 将各榜单当前周期的名次回写到 Leaderboard.rank
+ *
+ * 由 vercel.json 中的 cron 定期调用，必须配置 CRON_SECRET：
+ * Vercel cron 会自动携带 Authorization: Bearer <CRON_SECRET>，因此也能通过 middleware 的 Bearer 检查；
+ * 未配置时一律拒绝，避免任意 Bearer 请求触发全量名次重建
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+import { syncAllLeaderboardRanks } from '@/lib/leaderboard/store';
+
+export const dynamic = 'force-dynamic';
+
+export async function GET(request: NextRequest) {
+  const secret = process.env.CRON_SECRET;
+  if (!secret) {
+    console.error('未配置 CRON_SECRET，拒绝执行排行榜名次回写');
+    return NextResponse.json({ success: false, error: '服务端未配置 CRON_SECRET' }, { status: 500 });
+  }
+  if (request.headers.get('authorization') !== `Bearer ${secret}`) {
+    return NextResponse.json({ success: false, error: '未授权访问' }, { status: 401 });
+  }
+
+  try {
+    const results = await syncAllLeaderboardRanks();
+    return NextResponse.json({ success: true, data: results });
+  } catch (error) {
+    console.error('回写排行榜名次失败:', error);
+    return NextResponse.json(
+      {
+        success: false,
+        error: '回写排行榜名次失败',
+      },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,165 @@
+/**
+ * 炸金花实时推送（Server-Sent Events）
+ * GET /api/zjh/events?userId=uuu&roomId=xxx&gameId=yyy
+ *
+ * 只有当前坐在该房间（牌局所属房间）的玩家可以订阅
+ *
+ * 推送事件：
+ * - game：牌局增量（操作成功后），不含手牌
+ * - room：房间变更（加入 / 离开 / 准备 / 开局 / 结算）
+ */
+
+import { NextResponse } from 'next/server';
+import { prisma } from '@/lib/prisma';
+import { getLiveTable, isLiveTableMode } from '@/lib/zjh/live/table-store';
+import { gameChannel, roomChannel, subscribe } from '@/lib/zjh/events';
+import type { ZjhStreamEvent } from '@/types/zjh';
+
+export const dynamic = 'force-dynamic';
+export const runtime = 'nodejs';
+
+/** 心跳间隔（毫秒），防止代理因空闲断开连接 */
+const HEARTBEAT_INTERVAL_MS = 15000;
+
+/**
+ * 校验订阅者是否为该房间当前的玩家（未离开）
+ * @returns 无权订阅时的错误响应；可以订阅时返回 null
+ */
+async function checkStreamAccess(
+  userId: string,
+  roomId: string | null,
+  gameId: string | null
+): Promise<NextResponse | null> {
+  let targetRoomId = roomId;
+
+  if (gameId) {
+    // 内存权威模式下，进行中的牌局可能只在内存牌桌中
+    const table = isLiveTableMode() ? await getLiveTable(gameId) : null;
+    const gameRoomId =
+      table?.roomId ??
+      (
+        await prisma.zjhGame.findUnique({
+          where: { id: gameId },
+          select: { roomId: true },
+        })
+      )?.roomId;
+
+    if (!gameRoomId) {
+      return NextResponse.json(
+        { success: false, error: '游戏不存在' },
+        { status: 404 }
+      );
+    }
+    if (roomId && roomId !== gameRoomId) {
+      return NextResponse.json(
+        { success: false, error: '牌局不属于该房间' },
+        { status: 403 }
+      );
+    }
+    targetRoomId = gameRoomId;
+  }
+
+  const player = await prisma.zjhRoomPlayer.findFirst({
+    where: { roomId: targetRoomId!, userId, leftAt: null },
+    select: { id: true },
+  });
+  if (!player) {
+    return NextResponse.json(
+      { success: false, error: '你不在该房间中' },
+      { status: 403 }
+    );
+  }
+
+  return null;
+}
+
+export async function GET(request: Request) {
+  const { searchParams } = new URL(request.url);
+  const roomId = searchParams.get('roomId');
+  const gameId = searchParams.get('gameId');
+  const userId = searchParams.get('userId');
+
+  if (!userId) {
+    return NextResponse.json(
+      { success: false, error: '缺少 userId' },
+      { status: 400 }
+    );
+  }
+
+  if (!roomId && !gameId) {
+    return NextResponse.json(
+      { success: false, error: '缺少 roomId 或 gameId' },
+      { status: 400 }
+    );
+  }
+
+  try {
+    const access = await checkStreamAccess(userId, roomId, gameId);
+    if (access) return access;
+  } catch (error) {
+    console.error('校验推送订阅权限失败:', error);
+    return NextResponse.json(
+      { success: false, error: '服务器内部错误' },
+      { status: 500 }
+    );
+  }
+
+  const encoder = new TextEncoder();
+  const unsubscribers: (() => void)[] = [];
+  let heartbeat: ReturnType<typeof setInterval> | null = null;
+
+  const cleanup = () => {
+    if (heartbeat) clearInterval(heartbeat);
+    heartbeat = null;
+    unsubscribers.splice(0).forEach((unsubscribe) => unsubscribe());
+  };
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      const send = (event: ZjhStreamEvent) => {
+        try {
+          controller.enqueue(
+            encoder.encode(`event: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`)
+          );
+        } catch {
+          cleanup();
+        }
+      };
+
+      if (roomId) unsubscribers.push(subscribe(roomChannel(roomId), send));
+      if (gameId) unsubscribers.push(subscribe(gameChannel(gameId), send));
+
+      // 断线后由浏览器 EventSource 自动重连
+      controller.enqueue(encoder.encode('retry: 3000\n: connected\n\n'));
+
+      heartbeat = setInterval(() => {
+        try {
+          controller.enqueue(encoder.encode(': ping\n\n'));
+        } catch {
+          cleanup();
+        }
+      }, HEARTBEAT_INTERVAL_MS);
+
+      request.signal.addEventListener('abort', () => {
+        cleanup();
+        try {
+          controller.close();
+        } catch {
+          /* 已关闭 */
+        }
+      });
+    },
+    cancel() {
+      cleanup();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+      'X-Accel-Buffering': 'no',
+    },
+  });
+}
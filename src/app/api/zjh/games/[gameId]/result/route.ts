@@ -6,6 +6,7 @@
 import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
 import { HAND_TYPE_DISPLAY } from '@/lib/zjh/constants';
+import { flushLiveTable, isLiveTableMode } from '@/lib/zjh/live/table-store';
 import type { Card, HandType } from '@/types/zjh';
 
 export async function GET(
@@ -22,6 +23,11 @@ export async function GET(
       );
     }
 
+    // 内存权威模式：确保结算已写入数据库
+    if (isLiveTableMode()) {
+      await flushLiveTable(gameId);
+    }
+
     const game = await prisma.zjhGame.findUnique({
       where: { id: gameId },
       include: {
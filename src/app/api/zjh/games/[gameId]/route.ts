@@ -6,6 +6,7 @@
 import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
 import { HAND_TYPE_DISPLAY } from '@/lib/zjh/constants';
+import { getLiveTable, isLiveTableMode } from '@/lib/zjh/live/table-store';
 import type { Card, HandType } from '@/types/zjh';
 
 export async function GET(
@@ -24,22 +25,35 @@ export async function GET(
       );
     }
 
-    const game = await prisma.zjhGame.findUnique({
-      where: { id: gameId },
-      include: {
-        room: true,
-        players: {
-          orderBy: { seatIndex: 'asc' },
+    // 内存权威模式下，进行中的牌局直接读内存牌桌
+    const table = isLiveTableMode() ? await getLiveTable(gameId) : null;
+    const game = table
+      ? {
+          id: table.gameId,
+          roomId: table.roomId,
+          status: table.status,
+          pot: table.pot,
+          currentAnte: table.currentAnte,
+          currentRound: table.currentRound,
+          currentTurn: table.currentTurn,
+          dealerIndex: table.dealerIndex,
+          room: { maxRounds: table.maxRounds },
+          players: table.players,
+          actions: table.actions.slice(-10).reverse(),
+        }
+      : await prisma.zjhGame.findUnique({
+          where: { id: gameId },
           include: {
-            // 无法直接 include user，需要手动查找
+            room: true,
+            players: {
+              orderBy: { seatIndex: 'asc' },
+            },
+            actions: {
+              orderBy: { createdAt: 'desc' },
+              take: 10,
+            },
           },
-        },
-        actions: {
-          orderBy: { createdAt: 'desc' },
-          take: 10,
-        },
-      },
-    });
+        });
 
     if (!game) {
       return NextResponse.json(
@@ -5,9 +5,12 @@
 
 import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
+import { publishRoomUpdate } from '@/lib/zjh/events';
+import { removeRoomFromQueue } from '@/lib/zjh/matchmaking/queue';
 import { initializeGame } from '@/lib/zjh/game-engine';
 import { determineDealerIndex } from '@/lib/zjh/room-manager';
 import { evaluateHand } from '@/lib/zjh/hand-evaluator';
+import { flushLiveTablesForRoom, isLiveTableMode } from '@/lib/zjh/live/table-store';
 import type { StartGameRequest, Card } from '@/types/zjh';
 
 export async function POST(request: Request) {
@@ -22,6 +25,11 @@ export async function POST(request: Request) {
       );
     }
 
+    // 内存权威模式：上一局的结算可能尚未落库
+    if (isLiveTableMode()) {
+      await flushLiveTablesForRoom(roomId);
+    }
+
     // 查找房间
     const room = await prisma.zjhRoom.findUnique({
       where: { id: roomId },
@@ -148,6 +156,9 @@ export async function POST(request: Request) {
       });
     }
 
+    publishRoomUpdate(roomId, game.id);
+    void removeRoomFromQueue(roomId, room.minChips);
+
     return NextResponse.json({
       success: true,
       data: {
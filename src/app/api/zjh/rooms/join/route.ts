@@ -5,6 +5,8 @@
 
 import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
+import { publishRoomUpdate } from '@/lib/zjh/events';
+import { syncRoomSeats } from '@/lib/zjh/matchmaking/queue';
 import { assignSeat } from '@/lib/zjh/room-manager';
 import { INITIAL_CHIPS } from '@/lib/zjh/constants';
 import type { JoinRoomRequest } from '@/types/zjh';
@@ -120,6 +122,9 @@ export async function POST(request: Request) {
       orderBy: { seatIndex: 'asc' },
     });
 
+    publishRoomUpdate(room.id);
+    void syncRoomSeats(room.id);
+
     return NextResponse.json({
       success: true,
       data: {
@@ -5,6 +5,8 @@
 
 import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
+import { publishRoomUpdate } from '@/lib/zjh/events';
+import { syncRoomSeats } from '@/lib/zjh/matchmaking/queue';
 import { selectNewOwner } from '@/lib/zjh/room-manager';
 import type { LeaveRoomRequest } from '@/types/zjh';
 
@@ -85,6 +87,9 @@ export async function POST(request: Request) {
       });
     }
 
+    publishRoomUpdate(roomId);
+    void syncRoomSeats(roomId);
+
     return NextResponse.json({
       success: true,
       data: {
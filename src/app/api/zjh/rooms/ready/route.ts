@@ -5,6 +5,7 @@
 
 import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
+import { publishRoomUpdate } from '@/lib/zjh/events';
 import type { ReadyRequest } from '@/types/zjh';
 
 export async function POST(request: Request) {
@@ -60,6 +61,8 @@ export async function POST(request: Request) {
     const otherPlayers = room.players.filter(p => p.userId !== userId);
     const allReady = otherPlayers.every(p => p.isReady) && isReady && room.players.length >= room.minPlayers;
 
+    publishRoomUpdate(roomId);
+
     return NextResponse.json({
       success: true,
       data: {
@@ -7,6 +7,7 @@ import { NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
 import { generateRoomCode } from '@/lib/zjh/room-manager';
 import { DEFAULT_ROOM_CONFIG, INITIAL_CHIPS } from '@/lib/zjh/constants';
+import { syncRoomSeats } from '@/lib/zjh/matchmaking/queue';
 import type { CreateRoomRequest } from '@/types/zjh';
 
 export async function POST(request: Request) {
@@ -86,6 +87,9 @@ export async function POST(request: Request) {
       },
     });
 
+    // 空位登记到快速匹配索引
+    void syncRoomSeats(room.id);
+
     return NextResponse.json({
       success: true,
       data: {
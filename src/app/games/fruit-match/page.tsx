@@ -12,6 +12,29 @@ import { AuthGuard } from '@/components/auth/AuthGuard';
 import dynamic from 'next/dynamic';
 import { useBackgroundMusic } from '@/hooks/useBackgroundMusic';
 import { useGameSounds } from '@/hooks/useGameSounds';
+import {
+  BOMB,
+  EMPTY,
+  PUMPKIN,
+  RAINBOW,
+  activateSpecial,
+  canSwap,
+  cellIndex,
+  clearCells,
+  collapse,
+  createBoard,
+  createMask,
+  fillBoard,
+  hasCell,
+  hasValidMove,
+  isSpecialFruit,
+  markCell,
+  resolveCascades,
+  setCell,
+  swapCells,
+  type Board,
+  type CellMask,
+} from '@/lib/fruit-match/board';
 import {
   clearFruitMatchGame,
   loadFruitMatchGame,
@@ -90,13 +113,53 @@ interface SwapAnimationState {
   cell2: { row: number; col: number };
 }
 
-// 匹配结果类型
-interface MatchResult {
-  cells: Set<string>;                    // 匹配的单元格
-  specialFruit?: {                       // 要生成的特殊水果
-    type: SpecialFruitType;
-    position: { row: number; col: number };
-  };
+// 棋盘编码（与 @/lib/fruit-match/board 对应）：0 为空，1–7 为 FRUITS，8–10 为特殊水果
+const CODE_TO_FRUIT: (FruitType | null)[] = [];
+CODE_TO_FRUIT[EMPTY] = null;
+FRUITS.forEach((fruit, i) => {
+  CODE_TO_FRUIT[i + 1] = fruit;
+});
+CODE_TO_FRUIT[BOMB] = SPECIAL_FRUITS.BOMB;
+CODE_TO_FRUIT[RAINBOW] = SPECIAL_FRUITS.RAINBOW;
+CODE_TO_FRUIT[PUMPKIN] = SPECIAL_FRUITS.PUMPKIN;
+
+const FRUIT_TO_CODE = new Map<FruitType, number>(
+  CODE_TO_FRUIT.flatMap((fruit, code) => (fruit ? [[fruit, code] as [FruitType, number]] : []))
+);
+
+// 网格 → 棋盘
+function gridToBoard(grid: (FruitType | null)[][]): Board {
+  const board = createBoard();
+  for (let row = 0; row < GRID_SIZE; row++) {
+    for (let col = 0; col < GRID_SIZE; col++) {
+      const fruit = grid[row][col];
+      setCell(board, cellIndex(row, col), fruit ? FRUIT_TO_CODE.get(fruit) ?? EMPTY : EMPTY);
+    }
+  }
+  return board;
+}
+
+// 棋盘 → 网格
+function boardToGrid(board: Board): (FruitType | null)[][] {
+  const grid: (FruitType | null)[][] = [];
+  for (let row = 0; row < GRID_SIZE; row++) {
+    grid[row] = [];
+    for (let col = 0; col < GRID_SIZE; col++) {
+      grid[row][col] = CODE_TO_FRUIT[board.cells[cellIndex(row, col)]];
+    }
+  }
+  return grid;
+}
+
+// 格子集合 → "row-col" 键（用于匹配高亮）
+function maskToKeys(mask: CellMask): Set<string> {
+  const keys = new Set<string>();
+  for (let row = 0; row < GRID_SIZE; row++) {
+    for (let col = 0; col < GRID_SIZE; col++) {
+      if (hasCell(mask, cellIndex(row, col))) keys.add(`${row}-${col}`);
+    }
+  }
+  return keys;
 }
 
 export default function FruitMatchPage() {
@@ -213,173 +276,12 @@ export default function FruitMatchPage() {
     loop: true,
   });
 
-  // 检查是否有匹配（3个或更多相同水果）- 增强版，支持特殊水果生成
-  const findMatches = useCallback((grid: (FruitType | null)[][]): MatchResult => {
-    const matches = new Set<string>();
-    let specialFruit: MatchResult['specialFruit'] = undefined;
-
-    // 检查水平匹配
-    for (let row = 0; row < GRID_SIZE; row++) {
-      for (let col = 0; col < GRID_SIZE - 2; col++) {
-        const fruit = grid[row][col];
-        if (fruit === null || Object.values(SPECIAL_FRUITS).includes(fruit as SpecialFruitType)) continue;
-
-        // 检查是否有3个或更多相同的水果
-        let matchCount = 1;
-        for (let c = col + 1; c < GRID_SIZE; c++) {
-          if (grid[row][c] === fruit) {
-            matchCount++;
-          } else {
-            break;
-          }
-        }
-
-        if (matchCount >= 3) {
-          const matchCells: string[] = [];
-          for (let c = col; c < col + matchCount; c++) {
-            const cellKey = `${row}-${c}`;
-            matches.add(cellKey);
-            matchCells.push(cellKey);
-          }
-
-          // 生成特殊水果
-          if (matchCount >= 5 && !specialFruit) {
-            // 5连消或以上 → 彩虹水果（中间位置）
-            const centerCol = col + Math.floor(matchCount / 2);
-            specialFruit = {
-              type: SPECIAL_FRUITS.RAINBOW,
-              position: { row, col: centerCol },
-            };
-          } else if (matchCount === 4 && !specialFruit) {
-            // 4连消 → 炸弹（中间位置）100%
-            const centerCol = col + Math.floor(matchCount / 2);
-            specialFruit = {
-              type: SPECIAL_FRUITS.BOMB,
-              position: { row, col: centerCol },
-            };
-          } else if (matchCount === 3 && !specialFruit) {
-            // 3连消 → 60% 概率生成炸弹
-            if (Math.random() < 0.6) {
-              const centerCol = col + Math.floor(matchCount / 2);
-              specialFruit = {
-                type: SPECIAL_FRUITS.BOMB,
-                position: { row, col: centerCol },
-              };
-              console.log('🎲 3连消幸运触发！生成炸弹');
-            }
-          }
-        }
-      }
-    }
-
-    // 检查垂直匹配
-    for (let col = 0; col < GRID_SIZE; col++) {
-      for (let row = 0; row < GRID_SIZE - 2; row++) {
-        const fruit = grid[row][col];
-        if (fruit === null || Object.values(SPECIAL_FRUITS).includes(fruit as SpecialFruitType)) continue;
-
-        // 检查是否有3个或更多相同的水果
-        let matchCount = 1;
-        for (let r = row + 1; r < GRID_SIZE; r++) {
-          if (grid[r][col] === fruit) {
-            matchCount++;
-          } else {
-            break;
-          }
-        }
-
-        if (matchCount >= 3) {
-          const matchCells: string[] = [];
-          for (let r = row; r < row + matchCount; r++) {
-            const cellKey = `${r}-${col}`;
-            matches.add(cellKey);
-            matchCells.push(cellKey);
-          }
-
-          // 生成特殊水果
-          if (matchCount >= 5 && !specialFruit) {
-            // 5连消或以上 → 彩虹水果（中间位置）
-            const centerRow = row + Math.floor(matchCount / 2);
-            specialFruit = {
-              type: SPECIAL_FRUITS.RAINBOW,
-              position: { row: centerRow, col },
-            };
-          } else if (matchCount === 4 && !specialFruit) {
-            // 4连消 → 炸弹（中间位置）100%
-            const centerRow = row + Math.floor(matchCount / 2);
-            specialFruit = {
-              type: SPECIAL_FRUITS.BOMB,
-              position: { row: centerRow, col },
-            };
-          } else if (matchCount === 3 && !specialFruit) {
-            // 3连消 → 60% 概率生成炸弹
-            if (Math.random() < 0.6) {
-              const centerRow = row + Math.floor(matchCount / 2);
-              specialFruit = {
-                type: SPECIAL_FRUITS.BOMB,
-                position: { row: centerRow, col },
-              };
-              console.log('🎲 3连消幸运触发！生成炸弹');
-            }
-          }
-        }
-      }
-    }
-
-    return { cells: matches, specialFruit };
-  }, []);
-
-  // 初始化游戏网格
+  // 初始化游戏网格（逐格避开三连，一次生成即无匹配）
   const initializeGrid = useCallback((): (FruitType | null)[][] => {
-    const grid: (FruitType | null)[][] = [];
-    let attempts = 0;
-    const maxAttempts = 100;
-
-    // 生成初始网格，确保没有匹配
-    do {
-      for (let row = 0; row < GRID_SIZE; row++) {
-        grid[row] = [];
-        for (let col = 0; col < GRID_SIZE; col++) {
-          // 随机选择水果，但避免初始就有匹配
-          let fruit: FruitType = FRUITS[0]; // 默认值
-          let valid = false;
-          let tries = 0;
-
-          while (!valid && tries < 50) {
-            const candidateFruit = FRUITS[Math.floor(Math.random() * FRUITS.length)];
-            valid = true;
-
-            // 检查水平匹配（左侧两个）
-            if (col >= 2 && grid[row][col - 1] === candidateFruit && grid[row][col - 2] === candidateFruit) {
-              valid = false;
-            }
-            // 检查垂直匹配（上方两个）
-            if (row >= 2 && grid[row - 1]?.[col] === candidateFruit && grid[row - 2]?.[col] === candidateFruit) {
-              valid = false;
-            }
-
-            if (valid) {
-              fruit = candidateFruit;
-            }
-
-            tries++;
-          }
-
-          grid[row][col] = fruit;
-        }
-      }
-
-      // 检查整个网格是否有匹配
-      const matchResult = findMatches(grid);
-      if (matchResult.cells.size === 0) {
-        break;
-      }
-
-      attempts++;
-    } while (attempts < maxAttempts);
-
-    return grid;
-  }, [findMatches]);
+    const board = createBoard();
+    fillBoard(board);
+    return boardToGrid(board);
+  }, []);
 
   // 初始化用户
   useEffect(() => {
@@ -640,136 +542,9 @@ export default function FruitMatchPage() {
     }
   }, [gameState.gameWon, gameState.gameOver, playWinSound, playLoseSound, submitGameRecord]);
 
-  // 处理特殊水果消除效果
-  const activateSpecialFruit = useCallback((
-    grid: (FruitType | null)[][],
-    row: number,
-    col: number,
-    fruitType: SpecialFruitType,
-    specifiedTargetFruit?: NormalFruitType  // 可选：指定要消除的目标水果（用于彩虹）
-  ): Set<string> => {
-    const cellsToRemove = new Set<string>();
-
-    console.log(`🎆 激活特殊水果: ${fruitType} 在位置 [${row}, ${col}]`, specifiedTargetFruit ? `目标水果: ${specifiedTargetFruit}` : '');
-
-    if (fruitType === SPECIAL_FRUITS.BOMB) {
-      // 炸弹：消除周围3x3区域
-      console.log('💣 炸弹效果：消除3x3区域');
-      for (let r = Math.max(0, row - 1); r <= Math.min(GRID_SIZE - 1, row + 1); r++) {
-        for (let c = Math.max(0, col - 1); c <= Math.min(GRID_SIZE - 1, col + 1); c++) {
-          cellsToRemove.add(`${r}-${c}`);
-        }
-      }
-      console.log(`💣 炸弹将消除 ${cellsToRemove.size} 个单元格`);
-    } else if (fruitType === SPECIAL_FRUITS.RAINBOW) {
-      // 彩虹：消除所有同色水果
-      let targetFruit: NormalFruitType | null = specifiedTargetFruit || null;
-
-      // 如果没有指定目标水果，查找周围的普通水果
-      if (!targetFruit) {
-        console.log('🌈 彩虹效果：查找周围的普通水果');
-        console.log('🔍 周围3x3区域的水果:');
-        for (let r = Math.max(0, row - 1); r <= Math.min(GRID_SIZE - 1, row + 1); r++) {
-          for (let c = Math.max(0, col - 1); c <= Math.min(GRID_SIZE - 1, col + 1); c++) {
-            const fruit = grid[r][c];
-            console.log(`  [${r},${c}]: ${fruit}`);
-            if (fruit && FRUITS.includes(fruit as NormalFruitType)) {
-              targetFruit = fruit as NormalFruitType;
-              console.log(`✅ 找到目标水果: ${targetFruit} 在 [${r}, ${c}]`);
-              break;
-            }
-          }
-          if (targetFruit) break;
-        }
-      } else {
-        console.log(`🌈 彩虹效果：使用指定的目标水果 ${targetFruit}`);
-      }
-
-      if (targetFruit) {
-        console.log(`🎯 彩虹将消除所有 ${targetFruit}`);
-        // 消除所有该颜色的水果
-        for (let r = 0; r < GRID_SIZE; r++) {
-          for (let c = 0; c < GRID_SIZE; c++) {
-            if (grid[r][c] === targetFruit) {
-              cellsToRemove.add(`${r}-${c}`);
-            }
-          }
-        }
-        console.log(`🌈 彩虹将消除 ${cellsToRemove.size} 个 ${targetFruit}`);
-      } else {
-        console.warn('⚠️ 彩虹周围没有找到普通水果！');
-      }
-      cellsToRemove.add(`${row}-${col}`); // 也消除彩虹本身
-    } else if (fruitType === SPECIAL_FRUITS.PUMPKIN) {
-      // 南瓜：十字消除（横竖一排）
-      console.log('🎃 南瓜效果：十字消除（整行+整列）');
-      // 消除整行
-      for (let c = 0; c < GRID_SIZE; c++) {
-        cellsToRemove.add(`${row}-${c}`);
-      }
-      // 消除整列
-      for (let r = 0; r < GRID_SIZE; r++) {
-        cellsToRemove.add(`${r}-${col}`);
-      }
-      console.log(`🎃 南瓜将消除 ${cellsToRemove.size} 个单元格（整行+整列）`);
-    }
-
-    console.log(`✅ 特殊水果激活完成，共标记 ${cellsToRemove.size} 个单元格待消除`);
-    return cellsToRemove;
-  }, []);
-
-  // 消除匹配的水果
-  const removeMatches = useCallback((grid: (FruitType | null)[][], matches: Set<string>): number => {
-    let removedCount = 0;
-    const specialFruitsToActivate: Array<{ row: number; col: number; type: SpecialFruitType }> = [];
-
-    console.log('🔥 removeMatches 被调用，匹配数量:', matches.size);
-    console.log('🔥 匹配的单元格:', Array.from(matches));
-
-    // 先检查匹配中是否有普通水果（用于彩虹激活）
-    let normalFruitInMatch: NormalFruitType | null = null;
-    matches.forEach((key) => {
-      const [row, col] = key.split('-').map(Number);
-      const fruit = grid[row][col];
-      console.log(`  检查单元格 [${row},${col}]: ${fruit}`);
-      if (fruit && FRUITS.includes(fruit as NormalFruitType)) {
-        normalFruitInMatch = fruit as NormalFruitType;
-        console.log(`  ✓ 找到普通水果: ${fruit}`);
-      }
-    });
-
-    // 检查是否有特殊水果需要激活
-    matches.forEach((key) => {
-      const [row, col] = key.split('-').map(Number);
-      const fruit = grid[row][col];
-      if (fruit && Object.values(SPECIAL_FRUITS).includes(fruit as SpecialFruitType)) {
-        specialFruitsToActivate.push({ row, col, type: fruit as SpecialFruitType });
-        console.log(`  ⭐ 发现特殊水果需要激活: ${fruit} 在 [${row}, ${col}]`);
-      }
-    });
-
-    console.log(`🎯 共有 ${specialFruitsToActivate.length} 个特殊水果需要激活`);
-
-    // 激活特殊水果
-    specialFruitsToActivate.forEach(({ row, col, type }) => {
-      // 如果是彩虹且匹配中有普通水果，传入该普通水果作为目标
-      const targetFruit = (type === SPECIAL_FRUITS.RAINBOW && normalFruitInMatch)
-        ? normalFruitInMatch
-        : undefined;
-      console.log(`🚀 正在激活特殊水果: ${type} 在 [${row}, ${col}]`, targetFruit ? `目标水果: ${targetFruit}` : '');
-      const extraCells = activateSpecialFruit(grid, row, col, type, targetFruit);
-      console.log(`💥 激活后额外标记了 ${extraCells.size} 个单元格`);
-      extraCells.forEach((cell) => matches.add(cell));
-    });
-
-    // 移除所有匹配的水果
-    matches.forEach((key) => {
-      const [row, col] = key.split('-').map(Number);
-      if (grid[row][col] !== null) {
-        grid[row][col] = null;
-        removedCount++;
-      }
-    });
+  // 消除格子（其中的特殊水果会被激活），返回消除数量
+  const removeMatches = useCallback((board: Board, mask: CellMask): number => {
+    const removedCount = clearCells(board, mask);
 
     // 播放匹配音效
     if (removedCount > 0) {
@@ -777,137 +552,48 @@ export default function FruitMatchPage() {
     }
 
     return removedCount;
-  }, [playMatchSound, activateSpecialFruit]);
-
-  // 让水果下落
-  const dropFruits = useCallback((grid: (FruitType | null)[][]): void => {
-    for (let col = 0; col < GRID_SIZE; col++) {
-      // 从底部向上移动非空水果
-      let writeIndex = GRID_SIZE - 1;
-      for (let row = GRID_SIZE - 1; row >= 0; row--) {
-        if (grid[row][col] !== null) {
-          if (writeIndex !== row) {
-            grid[writeIndex][col] = grid[row][col];
-            grid[row][col] = null;
-          }
-          writeIndex--;
-        }
-      }
+  }, [playMatchSound]);
 
-      // 填充顶部空位
-      for (let row = writeIndex; row >= 0; row--) {
-        grid[row][col] = FRUITS[Math.floor(Math.random() * FRUITS.length)];
-      }
-    }
-  }, []);
-
-  // 处理匹配和下落（递归，直到没有更多匹配）
-  const processMatches = useCallback((grid: (FruitType | null)[][]): number => {
+  // 处理匹配和下落（连锁，直到没有更多匹配）；dirty 为本次变化的格子
+  const processMatches = useCallback((board: Board, dirty: CellMask): number => {
     let totalScore = 0;
-    let hasMatches = true;
     let comboCount = 0;
 
-    while (hasMatches) {
-      const matchResult = findMatches(grid);
-      if (matchResult.cells.size === 0) {
-        hasMatches = false;
-        setMatchedCells(new Set()); // 清除匹配高亮
-
-        // 重置连击
-        setCurrentCombo(0);
-      } else {
-        setMatchedCells(matchResult.cells); // 设置匹配高亮
-
-        // 如果要生成特殊水果，先标记位置
-        let specialFruitPosition: { row: number; col: number } | null = null;
-        let specialFruitType: SpecialFruitType | null = null;
-
-        if (matchResult.specialFruit) {
-          specialFruitPosition = matchResult.specialFruit.position;
-          specialFruitType = matchResult.specialFruit.type;
-          // 从匹配列表中移除特殊水果生成位置（保留一个水果用于生成特殊水果）
-          matchResult.cells.delete(`${specialFruitPosition.row}-${specialFruitPosition.col}`);
-        }
-
-        const removedCount = removeMatches(grid, matchResult.cells);
-        totalScore += removedCount * 10; // 每个水果10分
-
-        // 生成特殊水果
-        if (specialFruitPosition && specialFruitType) {
-          grid[specialFruitPosition.row][specialFruitPosition.col] = specialFruitType;
-          console.log(`🎉 生成特殊水果: ${specialFruitType} 在 [${specialFruitPosition.row}, ${specialFruitPosition.col}]`);
-        }
-
-        // 更新连击和消除次数
-        comboCount++;
-        setCurrentCombo(comboCount);
-        setMaxCombo((prev) => Math.max(prev, comboCount));
-        setTotalMatches((prev) => prev + 1);
-
-        // 播放得分音效
-        if (removedCount > 0) {
-          playScoreSound(removedCount);
-        }
-
-        dropFruits(grid);
+    resolveCascades(board, dirty, Math.random, (matched, removedCount) => {
+      setMatchedCells(maskToKeys(matched)); // 设置匹配高亮
+      if (removedCount > 0) {
+        playMatchSound();
       }
-    }
-
-    return totalScore;
-  }, [findMatches, removeMatches, dropFruits, playScoreSound]);
-
-  // 检查是否可以交换（交换后是否有匹配）
-  const canSwap = useCallback(
-    (grid: (FruitType | null)[][], row1: number, col1: number, row2: number, col2: number): boolean => {
-      const fruit1 = grid[row1][col1];
-      const fruit2 = grid[row2][col2];
-
-      console.log('🔍 检查交换:', {
-        fruit1,
-        fruit2,
-        position1: [row1, col1],
-        position2: [row2, col2],
-        specialFruits: Object.values(SPECIAL_FRUITS),
-      });
+      totalScore += removedCount * 10; // 每个水果10分
 
-      // 如果其中一个是特殊水果，允许交换
-      const fruit1IsSpecial = fruit1 && Object.values(SPECIAL_FRUITS).includes(fruit1 as SpecialFruitType);
-      const fruit2IsSpecial = fruit2 && Object.values(SPECIAL_FRUITS).includes(fruit2 as SpecialFruitType);
+      // 更新连击和消除次数
+      comboCount++;
+      setCurrentCombo(comboCount);
+      setMaxCombo((prev) => Math.max(prev, comboCount));
+      setTotalMatches((prev) => prev + 1);
 
-      console.log('🎯 特殊水果检查:', {
-        fruit1IsSpecial,
-        fruit2IsSpecial,
-      });
-
-      if (fruit1IsSpecial || fruit2IsSpecial) {
-        console.log('✅ 允许交换（包含特殊水果）');
-        return true;
+      // 播放得分音效
+      if (removedCount > 0) {
+        playScoreSound(removedCount);
       }
+    });
 
-      // 创建临时网格
-      const tempGrid = grid.map((row) => [...row]);
-
-      // 交换
-      const temp = tempGrid[row1][col1];
-      tempGrid[row1][col1] = tempGrid[row2][col2];
-      tempGrid[row2][col2] = temp;
+    setMatchedCells(new Set()); // 清除匹配高亮
+    // 重置连击
+    setCurrentCombo(0);
 
-      // 检查是否有匹配
-      const matchResult = findMatches(tempGrid);
-      const canSwapResult = matchResult.cells.size > 0;
-      console.log('🔄 普通交换检查:', canSwapResult, '匹配数量:', matchResult.cells.size);
-      return canSwapResult;
-    },
-    [findMatches]
-  );
+    return totalScore;
+  }, [playMatchSound, playScoreSound]);
 
   // 执行带动画的交换
   const performSwap = useCallback(
     (row1: number, col1: number, row2: number, col2: number) => {
-      // 检查是否可以交换
-      const newGrid = gameState.grid.map((r) => [...r]);
+      const board = gridToBoard(gameState.grid);
+      const index1 = cellIndex(row1, col1);
+      const index2 = cellIndex(row2, col2);
 
-      if (canSwap(newGrid, row1, col1, row2, col2)) {
+      // 检查是否可以交换（含特殊水果的交换总是允许）
+      if (canSwap(board, index1, index2)) {
         // 播放交换音效
         playSwapSound();
 
@@ -918,13 +604,11 @@ export default function FruitMatchPage() {
         });
 
         // 获取交换前的水果类型
-        const fruit1 = newGrid[row1][col1];
-        const fruit2 = newGrid[row2][col2];
+        const fruit1 = board.cells[index1];
+        const fruit2 = board.cells[index2];
 
-        // 交换网格数据
-        const temp = newGrid[row1][col1];
-        newGrid[row1][col1] = newGrid[row2][col2];
-        newGrid[row2][col2] = temp;
+        // 交换棋盘数据
+        swapCells(board, index1, index2);
 
         // 延迟处理匹配，等待动画完成
         setTimeout(() => {
@@ -932,65 +616,38 @@ export default function FruitMatchPage() {
           setSwapAnimation(null);
 
           let scoreGain = 0;
+          const dirty = createMask();
 
-          // 检查是否有特殊水果被交换
-          const fruit1IsSpecial = fruit1 && Object.values(SPECIAL_FRUITS).includes(fruit1 as SpecialFruitType);
-          const fruit2IsSpecial = fruit2 && Object.values(SPECIAL_FRUITS).includes(fruit2 as SpecialFruitType);
-
-          console.log('🔍 特殊水果交换检查:', {
-            fruit1,
-            fruit1IsSpecial,
-            fruit1Position: [row1, col1],
-            fruit1NewPosition: [row2, col2],
-            fruit2,
-            fruit2IsSpecial,
-            fruit2Position: [row2, col2],
-            fruit2NewPosition: [row1, col1],
-          });
-
-          if (fruit1IsSpecial || fruit2IsSpecial) {
+          if (isSpecialFruit(fruit1) || isSpecialFruit(fruit2)) {
             console.log('✨ 检测到特殊水果交换！开始激活效果...');
-            // 如果有特殊水果，立即激活其效果
-            const cellsToRemove = new Set<string>();
-
-            if (fruit1IsSpecial) {
-              console.log(`🎯 准备激活 fruit1: ${fruit1} (交换后在 [${row2}, ${col2}])`);
-              // 如果 fruit1 是彩虹且 fruit2 是普通水果，传入 fruit2 作为目标
-              const targetFruit = (fruit1 === SPECIAL_FRUITS.RAINBOW && fruit2 && FRUITS.includes(fruit2 as NormalFruitType))
-                ? fruit2 as NormalFruitType
-                : undefined;
-              const extraCells = activateSpecialFruit(newGrid, row2, col2, fruit1 as SpecialFruitType, targetFruit);
-              console.log(`📊 fruit1 激活返回了 ${extraCells.size} 个待消除单元格`);
-              extraCells.forEach((cell) => cellsToRemove.add(cell));
+            // 如果有特殊水果，立即激活其效果；彩虹以交换的另一个普通水果为目标
+            const cellsToRemove = createMask();
+            if (isSpecialFruit(fruit1)) {
+              activateSpecial(board, index2, fruit1, cellsToRemove, fruit2);
             }
-
-            if (fruit2IsSpecial) {
-              console.log(`🎯 准备激活 fruit2: ${fruit2} (交换后在 [${row1}, ${col1}])`);
-              // 如果 fruit2 是彩虹且 fruit1 是普通水果，传入 fruit1 作为目标
-              const targetFruit = (fruit2 === SPECIAL_FRUITS.RAINBOW && fruit1 && FRUITS.includes(fruit1 as NormalFruitType))
-                ? fruit1 as NormalFruitType
-                : undefined;
-              const extraCells = activateSpecialFruit(newGrid, row1, col1, fruit2 as SpecialFruitType, targetFruit);
-              console.log(`📊 fruit2 激活返回了 ${extraCells.size} 个待消除单元格`);
-              extraCells.forEach((cell) => cellsToRemove.add(cell));
+            if (isSpecialFruit(fruit2)) {
+              activateSpecial(board, index1, fruit2, cellsToRemove, fruit1);
             }
 
-            console.log(`💥 总共收集了 ${cellsToRemove.size} 个待消除单元格:`, Array.from(cellsToRemove));
-
-            // 移除激活的单元格
-            console.log('🗑️ 调用 removeMatches...');
-            const removedCount = removeMatches(newGrid, cellsToRemove);
-            console.log(`✅ 实际移除了 ${removedCount} 个水果`);
+            const removedCount = removeMatches(board, cellsToRemove);
             scoreGain += removedCount * 10;
 
-            // 下落并继续处理匹配
-            dropFruits(newGrid);
-            scoreGain += processMatches(newGrid);
+            // 下落后继续处理匹配
+            collapse(board, dirty);
           } else {
-            // 普通匹配处理
-            scoreGain = processMatches(newGrid);
+            // 普通匹配：只需检查交换的两格所在的行列
+            markCell(dirty, index1);
+            markCell(dirty, index2);
+          }
+          scoreGain += processMatches(board, dirty);
+
+          // 没有可交换的水果时重新洗牌
+          if (!hasValidMove(board)) {
+            fillBoard(board);
           }
 
+          const newGrid = boardToGrid(board);
+
           // 更新状态
           setGameState((prev) => {
             const newScore = prev.score + scoreGain;
@@ -1017,7 +674,7 @@ export default function FruitMatchPage() {
         }));
       }
     },
-    [gameState.grid, canSwap, processMatches, playSwapSound, activateSpecialFruit, removeMatches, dropFruits]
+    [gameState.grid, processMatches, playSwapSound, removeMatches]
   );
 
   // 处理单元格点击
@@ -8,15 +8,8 @@
 import { useRef, useMemo, useState, useEffect } from 'react';
 import { useFrame } from '@react-three/fiber';
 import * as THREE from 'three';
-
-// 普通水果类型
-type NormalFruitType = '🍇' | '🍋' | '🍉' | '🍊' | '🍎' | '🍒' | '🍓';
-
-// 特殊水果类型
-type SpecialFruitType = '💣' | '🌈' | '🎃';
-
-// 所有水果类型
-type FruitType = NormalFruitType | SpecialFruitType;
+import { FRUIT_IMAGES, SPECIAL_GLOW_COLORS, isSpecialFruit, type FruitType } from './fruit-assets';
+import { MIN_MOVE_DISTANCE, resolveGesture, type SwipeDirection } from './gesture';
 
 interface FruitCellProps {
   fruit: FruitType;
@@ -26,31 +19,10 @@ interface FruitCellProps {
   isSelected: boolean;
   isMatched: boolean;
   onClick: () => void;
-  onSwipe?: (direction: 'up' | 'down' | 'left' | 'right') => void;
+  onSwipe?: (direction: SwipeDirection) => void;
   scale?: number;
 }
 
-// 水果类型到图片路径的映射
-const fruitImages: Record<FruitType, string> = {
-  // 普通水果 - 使用 7 张独特的图片
-  '🍇': '/images/generated/fruid/Grape.png',
-  '🍋': '/images/generated/fruid/lemon.png',
-  '🍉': '/images/generated/fruid/Watermelon.png',
-  '🍊': '/images/generated/fruid/Orange.png',
-  '🍎': '/images/generated/fruid/Strawberry.png',      // 苹果用草莓（临时）
-  '🍒': '/images/generated/fruid/VerticalStriped.png',
-  '🍓': '/images/generated/fruid/Banana.png',          // 草莓用香蕉（临时）
-  // 特殊水果 - 注意：现在只有彩虹有独特图片！
-  '💣': '/images/generated/fruid/Banana.png',          // 炸弹 - 和草莓重复（需要添加特效区分）
-  '🌈': '/images/generated/fruid/RainbowCandy.png',    // 彩虹 - 唯一独特的特殊水果
-  '🎃': '/images/generated/fruid/Watermelon.png',      // 南瓜 - 和西瓜重复（需要添加特效区分）
-};
-
-// 判断是否为特殊水果
-const isSpecialFruit = (fruit: FruitType): boolean => {
-  return fruit === '💣' || fruit === '🌈' || fruit === '🎃';
-};
-
 export function FruitCell({
   fruit,
   position,
@@ -83,10 +55,6 @@ export function FruitCell({
     hasMoved: false,
   });
 
-  const MIN_SWIPE_DISTANCE = 0.15; // 最小滑动距离（3D空间单位，降低阈值以提高灵敏度）
-  const MAX_SWIPE_TIME = 800; // 最大滑动时间（毫秒，增加时间窗口）
-  const MIN_MOVE_DISTANCE = 0.05; // 判断是否移动的最小距离
-
   // 掉落动画状态 - 基于行列计算延迟
   const dropDelay = useMemo(() => row * 0.05 + col * 0.02, [row, col]);
   const dropAnimationRef = useRef({
@@ -107,7 +75,7 @@ export function FruitCell({
   useEffect(() => {
     const loader = new THREE.TextureLoader();
     loader.load(
-      fruitImages[fruit],
+      FRUIT_IMAGES[fruit],
       (texture) => {
         texture.minFilter = THREE.LinearFilter;
         texture.magFilter = THREE.LinearFilter;
@@ -292,11 +260,7 @@ export function FruitCell({
       {isSpecialFruit(fruit) && !isMatched && (
         <mesh geometry={bgGeometry} position={[0, 0, -0.01]}>
           <meshBasicMaterial
-            color={
-              fruit === '💣' ? '#ff6b00' :   // 炸弹 - 橙色发光
-              fruit === '🌈' ? '#ff00ff' :   // 彩虹 - 品红色发光
-              '#ffa500'                       // 南瓜 - 橙黄色发光
-            }
+            color={SPECIAL_GLOW_COLORS[fruit]}
             side={THREE.DoubleSide}
             transparent
             opacity={0.5}
@@ -362,35 +326,14 @@ export function FruitCell({
           swipeStateRef.current.startPoint = null;
           swipeStateRef.current.hasMoved = false;
 
-          // 检查是否是有效的滑动
-          if (distance >= MIN_SWIPE_DISTANCE && time <= MAX_SWIPE_TIME && onSwipe) {
-            // 确定滑动方向
-            const absX = Math.abs(deltaX);
-            const absY = Math.abs(deltaY);
-
-            if (absX > absY) {
-              // 水平滑动
-              if (deltaX > 0) {
-                console.log('向右滑动');
-                onSwipe('right');
-              } else {
-                console.log('向左滑动');
-                onSwipe('left');
-              }
-            } else {
-              // 垂直滑动
-              if (deltaY > 0) {
-                console.log('向上滑动');
-                onSwipe('up');
-              } else {
-                console.log('向下滑动');
-                onSwipe('down');
-              }
-            }
-          } else if (!hasMoved) {
+          const gesture = resolveGesture(deltaX, deltaY, time, hasMoved, Boolean(onSwipe));
+          if (gesture === 'click') {
             // 如果没有移动过，视为点击
             console.log('视为点击');
             onClick();
+          } else if (gesture) {
+            console.log('滑动方向:', gesture);
+            onSwipe?.(gesture);
           } else {
             // 有移动但距离不够，不触发任何操作
             console.log('移动距离不够，忽略');
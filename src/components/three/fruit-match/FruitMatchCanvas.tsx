@@ -1,6 +1,8 @@
 /**
  * 2D Canvas 包装组件
  * 使用正交相机实现 2D 消消乐效果，自动适配容器尺寸
+ *
+ * 调试参数：?renderer=cells 切换为逐格渲染，?renderStats=1 显示绘制调用数与帧耗时
  */
 
 'use client';
@@ -9,6 +11,8 @@ import { useState, useEffect, useRef, useCallback } from 'react';
 import { Canvas, useThree } from '@react-three/fiber';
 import * as THREE from 'three';
 import { GameScene } from './GameScene';
+import { RenderStatsOverlay, RenderStatsProbe } from './RenderStats';
+import type { FruitRenderMode } from './fruit-assets';
 
 // 普通水果类型
 type NormalFruitType = '🍇' | '🍋' | '🍉' | '🍊' | '🍎' | '🍒' | '🍓';
@@ -31,6 +35,8 @@ interface FruitMatchCanvasProps {
   swapAnimation: SwapAnimationState | null;
   onCellClick: (row: number, col: number) => void;
   onCellSwipe?: (row: number, col: number, direction: 'up' | 'down' | 'left' | 'right') => void;
+  /** 渲染方式，不传时读取地址参数 renderer，默认实例化渲染 */
+  renderMode?: FruitRenderMode;
 }
 
 const GRID_SIZE = 8;
@@ -45,8 +51,12 @@ export function FruitMatchCanvas({
   swapAnimation,
   onCellClick,
   onCellSwipe,
+  renderMode,
 }: FruitMatchCanvasProps) {
   const [isMounted, setIsMounted] = useState(false);
+  const [queryRenderMode, setQueryRenderMode] = useState<FruitRenderMode>('instanced');
+  const [showStats, setShowStats] = useState(false);
+  const statsRef = useRef<HTMLDivElement>(null);
   const [zoom, setZoom] = useState(50);
   const containerRef = useRef<HTMLDivElement>(null);
 
@@ -63,6 +73,9 @@ export function FruitMatchCanvas({
   }, []);
 
   useEffect(() => {
+    const params = new URLSearchParams(window.location.search);
+    setQueryRenderMode(params.get('renderer') === 'cells' ? 'cells' : 'instanced');
+    setShowStats(params.get('renderStats') === '1');
     setIsMounted(true);
   }, []);
 
@@ -73,6 +86,8 @@ export function FruitMatchCanvas({
     return () => ro.disconnect();
   }, [calcZoom]);
 
+  const activeRenderMode = renderMode ?? queryRenderMode;
+
   if (!isMounted) {
     return (
       <div ref={containerRef} className="w-full h-full flex items-center justify-center">
@@ -82,7 +97,7 @@ export function FruitMatchCanvas({
   }
 
   return (
-    <div ref={containerRef} style={{ width: '100%', height: '100%' }}>
+    <div ref={containerRef} style={{ position: 'relative', width: '100%', height: '100%' }}>
       <Canvas
         orthographic
         camera={{
@@ -114,8 +129,11 @@ export function FruitMatchCanvas({
           swapAnimation={swapAnimation}
           onCellClick={onCellClick}
           onCellSwipe={onCellSwipe}
+          renderMode={activeRenderMode}
         />
+        {showStats && <RenderStatsProbe mode={activeRenderMode} target={statsRef} />}
       </Canvas>
+      {showStats && <RenderStatsOverlay ref={statsRef} mode={activeRenderMode} />}
     </div>
   );
 }
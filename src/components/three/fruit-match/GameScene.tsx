@@ -7,15 +7,8 @@
 
 import { Suspense } from 'react';
 import { FruitGrid } from './FruitGrid';
-
-// 普通水果类型
-type NormalFruitType = '🍇' | '🍋' | '🍉' | '🍊' | '🍎' | '🍒' | '🍓';
-
-// 特殊水果类型
-type SpecialFruitType = '💣' | '🌈' | '🎃';
-
-// 所有水果类型
-type FruitType = NormalFruitType | SpecialFruitType;
+import { InstancedFruitGrid } from './InstancedFruitGrid';
+import type { FruitRenderMode, FruitType } from './fruit-assets';
 
 interface SwapAnimationState {
   cell1: { row: number; col: number };
@@ -29,6 +22,8 @@ interface GameSceneProps {
   swapAnimation: SwapAnimationState | null;
   onCellClick: (row: number, col: number) => void;
   onCellSwipe?: (row: number, col: number, direction: 'up' | 'down' | 'left' | 'right') => void;
+  /** 渲染方式，默认实例化渲染 */
+  renderMode?: FruitRenderMode;
 }
 
 export function GameScene({
@@ -38,11 +33,15 @@ export function GameScene({
   swapAnimation,
   onCellClick,
   onCellSwipe,
+  renderMode = 'instanced',
 }: GameSceneProps) {
+  // 实例化渲染：整个网格约 3 次绘制；逐格渲染保留作回退
+  const Grid = renderMode === 'cells' ? FruitGrid : InstancedFruitGrid;
+
   return (
     <Suspense fallback={null}>
       {/* 水果网格 */}
-      <FruitGrid
+      <Grid
         grid={grid}
         selectedCell={selectedCell}
         matchedCells={matchedCells}
@@ -0,0 +1,568 @@
+/**
+ * 2D 水果网格组件（实例化渲染）
+ *
+ * 整个网格只有三次绘制：发光 / 选中背景圆、水果主体（图集 + 高光）、选中边框
+ * 每格的位置与缩放写入 instanceMatrix，颜色、透明度、图集偏移写入实例属性，
+ * 所有格子的动画由同一个 useFrame 驱动；动画效果与逐格渲染的 FruitCell 保持一致
+ */
+
+'use client';
+
+import { useEffect, useMemo, useRef, useState } from 'react';
+import { useFrame, useThree, type ThreeEvent } from '@react-three/fiber';
+import * as THREE from 'three';
+import {
+  CELL_SPACING,
+  FRUIT_RADIUS,
+  GRID_SIZE,
+  SELECTED_COLOR,
+  SPECIAL_GLOW_COLORS,
+  isSpecialFruit,
+  type FruitType,
+} from './fruit-assets';
+import { loadFruitAtlas, type FruitAtlas } from './fruit-atlas';
+import { MIN_MOVE_DISTANCE, resolveGesture, type SwipeDirection } from './gesture';
+
+interface SwapAnimationState {
+  cell1: { row: number; col: number };
+  cell2: { row: number; col: number };
+}
+
+interface InstancedFruitGridProps {
+  grid: (FruitType | null)[][];
+  selectedCell: { row: number; col: number } | null;
+  matchedCells: Set<string>;
+  swapAnimation: SwapAnimationState | null;
+  onCellClick: (row: number, col: number) => void;
+  onCellSwipe?: (row: number, col: number, direction: SwipeDirection) => void;
+  gridSize?: number;
+}
+
+const GLOW_RADIUS = 0.5;
+const DROP_HEIGHT = 12; // 新水果从目标位置上方多高处落下
+const DROP_LERP = 0.12; // 掉落时每帧向目标靠近的比例
+const SWAP_DURATION = 0.3; // 交换动画持续时间（秒）
+
+// 掉落阶段
+const PHASE_WAITING = 0; // 等待延迟
+const PHASE_DROPPING = 1; // 掉落中
+const PHASE_SETTLED = 2; // 已落定
+
+const SELECTED = new THREE.Color(SELECTED_COLOR);
+const GLOW: Partial<Record<FruitType, THREE.Color>> = {};
+for (const [fruit, color] of Object.entries(SPECIAL_GLOW_COLORS)) {
+  GLOW[fruit as FruitType] = new THREE.Color(color);
+}
+
+// 使用 easeOutBack 缓动函数，产生轻微的回弹效果
+const easeOutBack = (t: number): number => {
+  const c1 = 1.70158;
+  const c3 = c1 + 1;
+  return 1 + c3 * Math.pow(t - 1, 3) + c1 * Math.pow(t - 1, 2);
+};
+
+/** 每格的动画状态（结构数组，逐帧原地更新） */
+interface Slots {
+  fruit: (FruitType | null)[];
+  x: Float32Array;
+  y: Float32Array;
+  targetX: Float32Array;
+  targetY: Float32Array;
+  swapFromX: Float32Array;
+  swapFromY: Float32Array;
+  /** 交换开始时间（秒），-1 表示不在交换 */
+  swapStart: Float32Array;
+  /** 开始掉落的时间（秒） */
+  dropAt: Float32Array;
+  phase: Uint8Array;
+  scale: Float32Array;
+  opacity: Float32Array;
+}
+
+function createSlots(count: number): Slots {
+  return {
+    fruit: new Array<FruitType | null>(count).fill(null),
+    x: new Float32Array(count),
+    y: new Float32Array(count),
+    targetX: new Float32Array(count),
+    targetY: new Float32Array(count),
+    swapFromX: new Float32Array(count),
+    swapFromY: new Float32Array(count),
+    swapStart: new Float32Array(count).fill(-1),
+    dropAt: new Float32Array(count),
+    phase: new Uint8Array(count),
+    scale: new Float32Array(count),
+    opacity: new Float32Array(count),
+  };
+}
+
+const DISC_VERTEX_SHADER = /* glsl */ `
+  attribute vec3 aColor;
+  attribute float aOpacity;
+  varying vec3 vColor;
+  varying float vOpacity;
+
+  void main() {
+    vColor = aColor;
+    vOpacity = aOpacity;
+    gl_Position = projectionMatrix * modelViewMatrix * instanceMatrix * vec4(position, 1.0);
+  }
+`;
+
+const DISC_FRAGMENT_SHADER = /* glsl */ `
+  varying vec3 vColor;
+  varying float vOpacity;
+
+  void main() {
+    gl_FragColor = vec4(vColor, vOpacity);
+    #include <tonemapping_fragment>
+    #include <colorspace_fragment>
+  }
+`;
+
+const FRUIT_VERTEX_SHADER = /* glsl */ `
+  attribute vec2 aUvOffset;
+  attribute float aOpacity;
+  uniform vec2 uTileSize;
+  varying vec2 vUv;
+  varying vec2 vLocal;
+  varying float vOpacity;
+
+  void main() {
+    vUv = aUvOffset + uv * uTileSize;
+    vLocal = position.xy;
+    vOpacity = aOpacity;
+    gl_Position = projectionMatrix * modelViewMatrix * instanceMatrix * vec4(position, 1.0);
+  }
+`;
+
+const FRUIT_FRAGMENT_SHADER = /* glsl */ `
+  uniform sampler2D uAtlas;
+  uniform float uAtlasReady;
+  uniform vec3 uPlaceholder;
+  varying vec2 vUv;
+  varying vec2 vLocal;
+  varying float vOpacity;
+
+  void main() {
+    // 图集未就绪时显示灰色占位
+    vec4 fruit = uAtlasReady > 0.5 ? texture2D(uAtlas, vUv) : vec4(uPlaceholder, 1.0);
+    // 左上角高光：半径 0.2、透明度 0.3 的白色圆叠加在水果上
+    float highlight = (1.0 - step(0.2, distance(vLocal, vec2(-0.12, 0.12)))) * 0.3;
+    float alpha = fruit.a + highlight * (1.0 - fruit.a);
+    vec3 color = alpha > 0.0
+      ? (fruit.rgb * fruit.a * (1.0 - highlight) + vec3(highlight)) / alpha
+      : vec3(0.0);
+    gl_FragColor = vec4(color, alpha * vOpacity);
+    #include <tonemapping_fragment>
+    #include <colorspace_fragment>
+  }
+`;
+
+function instancedAttribute(count: number, itemSize: number): THREE.InstancedBufferAttribute {
+  const attribute = new THREE.InstancedBufferAttribute(new Float32Array(count * itemSize), itemSize);
+  attribute.setUsage(THREE.DynamicDrawUsage);
+  return attribute;
+}
+
+export function InstancedFruitGrid({
+  grid,
+  selectedCell,
+  matchedCells,
+  swapAnimation,
+  onCellClick,
+  onCellSwipe,
+  gridSize = GRID_SIZE,
+}: InstancedFruitGridProps) {
+  const count = gridSize * gridSize;
+  const clock = useThree((state) => state.clock);
+  const discRef = useRef<THREE.InstancedMesh>(null);
+  const fruitRef = useRef<THREE.InstancedMesh>(null);
+  const ringRef = useRef<THREE.Mesh>(null);
+  const [atlas, setAtlas] = useState<FruitAtlas | null>(null);
+
+  const slots = useMemo(() => createSlots(count), [count]);
+  const matched = useMemo(() => new Uint8Array(count), [count]);
+  const selectedRef = useRef(-1);
+  /** 属性有变化、下一帧需要上传 */
+  const dirtyRef = useRef(true);
+
+  // 滑动检测状态
+  const gestureRef = useRef({ slot: -1, startX: 0, startY: 0, startTime: 0, hasMoved: false });
+
+  const discGeometry = useMemo(() => {
+    const geometry = new THREE.CircleGeometry(GLOW_RADIUS, 32);
+    geometry.setAttribute('aColor', instancedAttribute(count, 3));
+    geometry.setAttribute('aOpacity', instancedAttribute(count, 1));
+    return geometry;
+  }, [count]);
+
+  const fruitGeometry = useMemo(() => {
+    const geometry = new THREE.CircleGeometry(FRUIT_RADIUS, 32);
+    geometry.setAttribute('aUvOffset', instancedAttribute(count, 2));
+    geometry.setAttribute('aOpacity', instancedAttribute(count, 1));
+    return geometry;
+  }, [count]);
+
+  const discMaterial = useMemo(
+    () =>
+      new THREE.ShaderMaterial({
+        vertexShader: DISC_VERTEX_SHADER,
+        fragmentShader: DISC_FRAGMENT_SHADER,
+        side: THREE.DoubleSide,
+        transparent: true,
+        depthWrite: false,
+      }),
+    []
+  );
+
+  const fruitMaterial = useMemo(
+    () =>
+      new THREE.ShaderMaterial({
+        vertexShader: FRUIT_VERTEX_SHADER,
+        fragmentShader: FRUIT_FRAGMENT_SHADER,
+        uniforms: {
+          uAtlas: { value: null },
+          uAtlasReady: { value: 0 },
+          uTileSize: { value: new THREE.Vector2(1, 1) },
+          uPlaceholder: { value: new THREE.Color('#cccccc') },
+        },
+        side: THREE.DoubleSide,
+        transparent: true,
+        depthWrite: false,
+      }),
+    []
+  );
+
+  useEffect(() => {
+    return () => {
+      discGeometry.dispose();
+      fruitGeometry.dispose();
+    };
+  }, [discGeometry, fruitGeometry]);
+
+  useEffect(() => {
+    return () => {
+      discMaterial.dispose();
+      fruitMaterial.dispose();
+    };
+  }, [discMaterial, fruitMaterial]);
+
+  // 加载共享图集
+  useEffect(() => {
+    let cancelled = false;
+    loadFruitAtlas()
+      .then((loaded) => {
+        if (!cancelled) setAtlas(loaded);
+      })
+      .catch((error) => {
+        console.error('✗ 水果图集生成失败:', error);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
+  // 图集就绪后写入纹理与每格的 UV 偏移
+  useEffect(() => {
+    if (!atlas) return;
+    fruitMaterial.uniforms.uAtlas.value = atlas.texture;
+    fruitMaterial.uniforms.uAtlasReady.value = 1;
+    (fruitMaterial.uniforms.uTileSize.value as THREE.Vector2).set(...atlas.tileSize);
+
+    const uvOffset = fruitGeometry.getAttribute('aUvOffset') as THREE.InstancedBufferAttribute;
+    for (let i = 0; i < count; i++) {
+      const fruit = slots.fruit[i];
+      if (fruit) uvOffset.setXY(i, ...atlas.offsets[fruit]);
+    }
+    uvOffset.needsUpdate = true;
+  }, [atlas, count, fruitGeometry, fruitMaterial, slots]);
+
+  // 网格变化：水果变化的格子从上方重新掉落；位置变化（交换）的格子开始交换动画
+  useEffect(() => {
+    const now = clock.elapsedTime;
+    const offset = ((gridSize - 1) * CELL_SPACING) / 2;
+    const uvOffset = fruitGeometry.getAttribute('aUvOffset') as THREE.InstancedBufferAttribute;
+
+    for (let row = 0; row < gridSize; row++) {
+      for (let col = 0; col < gridSize; col++) {
+        const i = row * gridSize + col;
+        const fruit = grid[row]?.[col] ?? null;
+
+        // 如果正在进行交换动画，交换两个单元格的目标位置
+        let targetRow = row;
+        let targetCol = col;
+        if (swapAnimation) {
+          const { cell1, cell2 } = swapAnimation;
+          if (row === cell1.row && col === cell1.col) {
+            targetRow = cell2.row;
+            targetCol = cell2.col;
+          } else if (row === cell2.row && col === cell2.col) {
+            targetRow = cell1.row;
+            targetCol = cell1.col;
+          }
+        }
+        const targetX = targetCol * CELL_SPACING - offset;
+        const targetY = -targetRow * CELL_SPACING + offset;
+
+        if (fruit !== slots.fruit[i]) {
+          slots.fruit[i] = fruit;
+          if (fruit) {
+            slots.x[i] = targetX;
+            slots.y[i] = targetY + DROP_HEIGHT;
+            slots.phase[i] = PHASE_WAITING;
+            slots.dropAt[i] = now + row * 0.05 + col * 0.02; // 基于行列计算延迟
+            slots.swapStart[i] = -1;
+            slots.scale[i] = 1;
+            slots.opacity[i] = 1;
+            if (atlas) uvOffset.setXY(i, ...atlas.offsets[fruit]);
+          }
+        } else if (
+          fruit &&
+          slots.phase[i] !== PHASE_WAITING &&
+          (targetX !== slots.targetX[i] || targetY !== slots.targetY[i])
+        ) {
+          slots.swapStart[i] = now;
+          slots.swapFromX[i] = slots.x[i];
+          slots.swapFromY[i] = slots.y[i];
+        }
+        slots.targetX[i] = targetX;
+        slots.targetY[i] = targetY;
+      }
+    }
+    uvOffset.needsUpdate = true;
+    dirtyRef.current = true;
+  }, [grid, swapAnimation, gridSize, atlas, clock, fruitGeometry, slots]);
+
+  // 选中与匹配状态
+  useEffect(() => {
+    selectedRef.current = selectedCell ? selectedCell.row * gridSize + selectedCell.col : -1;
+    for (let row = 0; row < gridSize; row++) {
+      for (let col = 0; col < gridSize; col++) {
+        matched[row * gridSize + col] = matchedCells.has(`${row}-${col}`) ? 1 : 0;
+      }
+    }
+    dirtyRef.current = true;
+  }, [selectedCell, matchedCells, gridSize, matched]);
+
+  // 所有格子的动画在同一帧回调中更新
+  const matrix = useMemo(() => new THREE.Matrix4(), []);
+  useFrame((state) => {
+    const disc = discRef.current;
+    const fruitMesh = fruitRef.current;
+    if (!disc || !fruitMesh) return;
+
+    const t = state.clock.elapsedTime;
+    const selected = selectedRef.current;
+    const discColor = discGeometry.getAttribute('aColor') as THREE.InstancedBufferAttribute;
+    const discOpacity = discGeometry.getAttribute('aOpacity') as THREE.InstancedBufferAttribute;
+    const fruitOpacity = fruitGeometry.getAttribute('aOpacity') as THREE.InstancedBufferAttribute;
+    let active = dirtyRef.current;
+    let ringSlot = -1;
+
+    for (let i = 0; i < count; i++) {
+      const fruit = slots.fruit[i];
+      if (!fruit) {
+        matrix.makeScale(0, 0, 0);
+        fruitMesh.setMatrixAt(i, matrix);
+        disc.setMatrixAt(i, matrix);
+        continue;
+      }
+
+      // 初始化掉落动画（带延迟）
+      if (slots.phase[i] === PHASE_WAITING) {
+        active = true;
+        if (t >= slots.dropAt[i]) slots.phase[i] = PHASE_DROPPING;
+      }
+
+      // 掉落动画：使用 lerp 实现平滑掉落
+      if (slots.phase[i] === PHASE_DROPPING) {
+        active = true;
+        slots.x[i] += (slots.targetX[i] - slots.x[i]) * DROP_LERP;
+        slots.y[i] += (slots.targetY[i] - slots.y[i]) * DROP_LERP;
+        if (Math.hypot(slots.targetX[i] - slots.x[i], slots.targetY[i] - slots.y[i]) < 0.01) {
+          slots.phase[i] = PHASE_SETTLED;
+          slots.x[i] = slots.targetX[i];
+          slots.y[i] = slots.targetY[i];
+        }
+      }
+
+      // 交换动画（在掉落动画完成后），过程中先放大后缩小
+      const swapping = slots.swapStart[i] >= 0 && slots.phase[i] === PHASE_SETTLED;
+      if (swapping) {
+        active = true;
+        const progress = Math.min((t - slots.swapStart[i]) / SWAP_DURATION, 1);
+        const eased = easeOutBack(progress);
+        slots.x[i] = slots.swapFromX[i] + (slots.targetX[i] - slots.swapFromX[i]) * eased;
+        slots.y[i] = slots.swapFromY[i] + (slots.targetY[i] - slots.swapFromY[i]) * eased;
+        slots.scale[i] = 1 + Math.sin(progress * Math.PI) * 0.2;
+        if (progress >= 1) {
+          slots.swapStart[i] = -1;
+          slots.x[i] = slots.targetX[i];
+          slots.y[i] = slots.targetY[i];
+        }
+      }
+
+      const isSelected = i === selected;
+      const isMatched = matched[i] === 1;
+      const settled = slots.phase[i] === PHASE_SETTLED && !swapping;
+      if (isSelected && settled) {
+        // 选中：轻微缩放动画
+        active = true;
+        slots.scale[i] = 1 + Math.sin(t * 5) * 0.08;
+      } else if (!isMatched && settled && Math.abs(slots.scale[i] - 1) > 1e-3) {
+        // 恢复原始大小
+        active = true;
+        slots.scale[i] += (1 - slots.scale[i]) * 0.2;
+      }
+
+      // 匹配时消失动画
+      if (isMatched) {
+        active = true;
+        slots.scale[i] -= slots.scale[i] * 0.15;
+        slots.opacity[i] = Math.max(0, slots.opacity[i] - 0.08);
+      } else {
+        slots.opacity[i] = 1;
+      }
+
+      const scale = slots.scale[i];
+      matrix.makeScale(scale, scale, 1).setPosition(slots.x[i], slots.y[i], 0);
+      fruitMesh.setMatrixAt(i, matrix);
+      fruitOpacity.setX(i, slots.opacity[i]);
+
+      // 背景圆：选中时发光，特殊水果常亮
+      const glow = GLOW[fruit];
+      if (isSelected) {
+        discColor.setXYZ(i, SELECTED.r, SELECTED.g, SELECTED.b);
+        discOpacity.setX(i, 0.5 + Math.sin(t * 4) * 0.2);
+        ringSlot = isMatched ? -1 : i;
+      } else if (glow && isSpecialFruit(fruit) && !isMatched) {
+        discColor.setXYZ(i, glow.r, glow.g, glow.b);
+        discOpacity.setX(i, 0.5);
+      } else {
+        matrix.makeScale(0, 0, 0);
+      }
+      matrix.setPosition(slots.x[i], slots.y[i], -0.01);
+      disc.setMatrixAt(i, matrix);
+    }
+
+    // 选中时的边框
+    const ring = ringRef.current;
+    if (ring) {
+      ring.visible = ringSlot >= 0;
+      if (ringSlot >= 0) {
+        ring.position.set(slots.x[ringSlot], slots.y[ringSlot], 0.02);
+        ring.scale.setScalar(slots.scale[ringSlot]);
+      }
+    }
+
+    // 静止时不重复上传实例数据
+    if (!active) return;
+    dirtyRef.current = false;
+    fruitMesh.instanceMatrix.needsUpdate = true;
+    disc.instanceMatrix.needsUpdate = true;
+    fruitOpacity.needsUpdate = true;
+    discColor.needsUpdate = true;
+    discOpacity.needsUpdate = true;
+  });
+
+  useEffect(() => {
+    fruitRef.current?.instanceMatrix.setUsage(THREE.DynamicDrawUsage);
+    discRef.current?.instanceMatrix.setUsage(THREE.DynamicDrawUsage);
+  }, [count]);
+
+  const resetGesture = () => {
+    gestureRef.current.slot = -1;
+    gestureRef.current.hasMoved = false;
+  };
+
+  return (
+    <group>
+      {/* 背景圆：特殊水果发光 / 选中高亮 */}
+      <instancedMesh
+        ref={discRef}
+        args={[discGeometry, discMaterial, count]}
+        frustumCulled={false}
+        renderOrder={0}
+      />
+
+      {/* 水果主体（图集 + 高光） */}
+      <instancedMesh
+        ref={fruitRef}
+        args={[fruitGeometry, fruitMaterial, count]}
+        frustumCulled={false}
+        renderOrder={1}
+        onPointerDown={(e: ThreeEvent<PointerEvent>) => {
+          e.stopPropagation();
+          if (e.instanceId === undefined) return;
+          gestureRef.current = {
+            slot: e.instanceId,
+            startX: e.point.x,
+            startY: e.point.y,
+            startTime: Date.now(),
+            hasMoved: false,
+          };
+          // 阻止默认行为，避免页面滚动
+          if (e.nativeEvent && 'preventDefault' in e.nativeEvent) {
+            e.nativeEvent.preventDefault();
+          }
+        }}
+        onPointerMove={(e: ThreeEvent<PointerEvent>) => {
+          const gesture = gestureRef.current;
+          if (gesture.slot < 0) return;
+          e.stopPropagation();
+          const deltaX = e.point.x - gesture.startX;
+          const deltaY = e.point.y - gesture.startY;
+          if (Math.sqrt(deltaX * deltaX + deltaY * deltaY) > MIN_MOVE_DISTANCE) {
+            gesture.hasMoved = true;
+          }
+        }}
+        onPointerUp={(e: ThreeEvent<PointerEvent>) => {
+          e.stopPropagation();
+          const { slot, startX, startY, startTime, hasMoved } = gestureRef.current;
+          resetGesture();
+          if (slot < 0) return;
+
+          // 手势以按下时的格子为准，抬起时可以已经滑到相邻格子上
+          const row = Math.floor(slot / gridSize);
+          const col = slot % gridSize;
+          const result = resolveGesture(
+            e.point.x - startX,
+            e.point.y - startY,
+            Date.now() - startTime,
+            hasMoved,
+            Boolean(onCellSwipe)
+          );
+          if (result === 'click') {
+            onCellClick(row, col);
+          } else if (result) {
+            onCellSwipe?.(row, col, result);
+          }
+        }}
+        onPointerCancel={(e: ThreeEvent<PointerEvent>) => {
+          e.stopPropagation();
+          resetGesture();
+        }}
+        onPointerOver={(e: ThreeEvent<PointerEvent>) => {
+          e.stopPropagation();
+          document.body.style.cursor = 'pointer';
+        }}
+        onPointerOut={() => {
+          document.body.style.cursor = 'default';
+        }}
+      />
+
+      {/* 选中时的边框 */}
+      <mesh ref={ringRef} visible={false} renderOrder={2}>
+        <ringGeometry args={[0.46, 0.5, 32]} />
+        <meshBasicMaterial
+          color={SELECTED_COLOR}
+          side={THREE.DoubleSide}
+          transparent
+          opacity={0.8}
+          depthWrite={false}
+        />
+      </mesh>
+    </group>
+  );
+}
@@ -0,0 +1,101 @@
+/**
+ * 渲染性能统计：绘制调用数与帧耗时
+ * 在页面地址后加 ?renderStats=1 显示，配合 ?renderer=cells 可对比实例化渲染与逐格渲染
+ */
+
+'use client';
+
+import { useRef, type RefObject } from 'react';
+import { useFrame } from '@react-three/fiber';
+import type { FruitRenderMode } from './fruit-assets';
+
+export interface RenderStatsSample {
+  /** 每帧绘制调用数 */
+  drawCalls: number;
+  /** 每帧三角形数 */
+  triangles: number;
+  /** 平均帧间隔（毫秒） */
+  frameMs: number;
+  /** 统计窗口内最长的帧间隔（毫秒），反映掉帧 */
+  worstFrameMs: number;
+  fps: number;
+}
+
+export function formatRenderStats(mode: FruitRenderMode, sample: RenderStatsSample | null): string {
+  if (!sample) return mode;
+  return (
+    `${mode}\ndraw calls ${sample.drawCalls}  tris ${sample.triangles}\n` +
+    `frame ${sample.frameMs.toFixed(1)}ms  worst ${sample.worstFrameMs.toFixed(1)}ms  ${sample.fps.toFixed(0)} fps`
+  );
+}
+
+interface RenderStatsProbeProps {
+  mode: FruitRenderMode;
+  /** 显示统计的 DOM 节点；直接写文本，不触发 React 重渲染以免干扰测量 */
+  target: RefObject<HTMLDivElement | null>;
+  /** 统计窗口（毫秒） */
+  intervalMs?: number;
+}
+
+/**
+ * 放在 Canvas 内部，按窗口汇总帧数据
+ */
+export function RenderStatsProbe({ mode, target, intervalMs = 500 }: RenderStatsProbeProps) {
+  const windowRef = useRef({ frames: 0, elapsed: 0, worst: 0 });
+
+  useFrame((state, delta) => {
+    const stats = windowRef.current;
+    stats.frames++;
+    stats.elapsed += delta;
+    stats.worst = Math.max(stats.worst, delta);
+    if (stats.elapsed * 1000 < intervalMs) return;
+
+    // 帧回调在渲染之前执行，info 中是上一帧的数据
+    const { calls, triangles } = state.gl.info.render;
+    if (target.current) {
+      target.current.textContent = formatRenderStats(mode, {
+        drawCalls: calls,
+        triangles,
+        frameMs: (stats.elapsed / stats.frames) * 1000,
+        worstFrameMs: stats.worst * 1000,
+        fps: stats.frames / stats.elapsed,
+      });
+    }
+    stats.frames = 0;
+    stats.elapsed = 0;
+    stats.worst = 0;
+  });
+
+  return null;
+}
+
+/**
+ * 统计浮层（Canvas 外部的 DOM），内容由 RenderStatsProbe 写入
+ */
+export function RenderStatsOverlay({
+  mode,
+  ref,
+}: {
+  mode: FruitRenderMode;
+  ref: RefObject<HTMLDivElement | null>;
+}) {
+  return (
+    <div
+      ref={ref}
+      style={{
+        position: 'absolute',
+        top: 4,
+        left: 4,
+        padding: '2px 6px',
+        borderRadius: 4,
+        background: 'rgba(0,0,0,0.6)',
+        color: '#fff',
+        font: '11px/1.4 monospace',
+        pointerEvents: 'none',
+        whiteSpace: 'pre',
+      }}
+    >
+      {mode}
+    </div>
+  );
+}
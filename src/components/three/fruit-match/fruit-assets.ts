@@ -0,0 +1,51 @@
+/**
+ * 水果消消乐渲染资源（逐格渲染与实例化渲染共用）
+ */
+
+// 普通水果类型
+export type NormalFruitType = '🍇' | '🍋' | '🍉' | '🍊' | '🍎' | '🍒' | '🍓';
+
+// 特殊水果类型
+export type SpecialFruitType = '💣' | '🌈' | '🎃';
+
+// 所有水果类型
+export type FruitType = NormalFruitType | SpecialFruitType;
+
+/** 渲染方式：instanced 为实例化渲染（默认），cells 为逐格渲染（回退） */
+export type FruitRenderMode = 'instanced' | 'cells';
+
+// 网格布局
+export const GRID_SIZE = 8;
+export const CELL_SPACING = 1.2;
+export const FRUIT_RADIUS = 0.45;
+
+// 水果类型到图片路径的映射
+export const FRUIT_IMAGES: Record<FruitType, string> = {
+  // 普通水果 - 使用 7 张独特的图片
+  '🍇': '/images/generated/fruid/Grape.png',
+  '🍋': '/images/generated/fruid/lemon.png',
+  '🍉': '/images/generated/fruid/Watermelon.png',
+  '🍊': '/images/generated/fruid/Orange.png',
+  '🍎': '/images/generated/fruid/Strawberry.png',      // 苹果用草莓（临时）
+  '🍒': '/images/generated/fruid/VerticalStriped.png',
+  '🍓': '/images/generated/fruid/Banana.png',          // 草莓用香蕉（临时）
+  // 特殊水果 - 注意：现在只有彩虹有独特图片！
+  '💣': '/images/generated/fruid/Banana.png',          // 炸弹 - 和草莓重复（需要添加特效区分）
+  '🌈': '/images/generated/fruid/RainbowCandy.png',    // 彩虹 - 唯一独特的特殊水果
+  '🎃': '/images/generated/fruid/Watermelon.png',      // 南瓜 - 和西瓜重复（需要添加特效区分）
+};
+
+// 特殊水果发光颜色
+export const SPECIAL_GLOW_COLORS: Partial<Record<FruitType, string>> = {
+  '💣': '#ff6b00', // 炸弹 - 橙色发光
+  '🌈': '#ff00ff', // 彩虹 - 品红色发光
+  '🎃': '#ffa500', // 南瓜 - 橙黄色发光
+};
+
+// 选中高亮颜色
+export const SELECTED_COLOR = '#fdc700';
+
+// 判断是否为特殊水果
+export const isSpecialFruit = (fruit: FruitType): boolean => {
+  return fruit === '💣' || fruit === '🌈' || fruit === '🎃';
+};
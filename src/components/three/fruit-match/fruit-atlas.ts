@@ -0,0 +1,84 @@
+/**
+ * 水果图片纹理图集
+ * 把所有水果图片绘制到一张画布上，实例化渲染时所有格子共用一张纹理，按格子偏移 UV 取图
+ */
+
+import * as THREE from 'three';
+import { FRUIT_IMAGES, type FruitType } from './fruit-assets';
+
+/** 每张图片在图集中的边长（像素） */
+const TILE_PIXELS = 128;
+/** 图集每行的图片数 */
+const ATLAS_COLUMNS = 4;
+
+export interface FruitAtlas {
+  texture: THREE.Texture;
+  /** 单张图片占图集的 UV 尺寸 */
+  tileSize: [number, number];
+  /** 每种水果在图集中的 UV 左下角 */
+  offsets: Record<FruitType, [number, number]>;
+}
+
+let atlasPromise: Promise<FruitAtlas> | null = null;
+
+function loadImage(src: string): Promise<HTMLImageElement | null> {
+  return new Promise((resolve) => {
+    const image = new Image();
+    image.onload = () => resolve(image);
+    image.onerror = (error) => {
+      console.error(`✗ 水果图片加载失败: ${src}`, error);
+      resolve(null);
+    };
+    image.src = src;
+  });
+}
+
+async function buildAtlas(): Promise<FruitAtlas> {
+  // 多种水果共用同一张图片时只绘制一次
+  const sources = [...new Set(Object.values(FRUIT_IMAGES))];
+  const rows = Math.ceil(sources.length / ATLAS_COLUMNS);
+  const images = await Promise.all(sources.map(loadImage));
+
+  const canvas = document.createElement('canvas');
+  canvas.width = ATLAS_COLUMNS * TILE_PIXELS;
+  canvas.height = rows * TILE_PIXELS;
+  const ctx = canvas.getContext('2d');
+
+  const tileSize: [number, number] = [1 / ATLAS_COLUMNS, 1 / rows];
+  const offsetBySource = new Map<string, [number, number]>();
+  sources.forEach((src, i) => {
+    const col = i % ATLAS_COLUMNS;
+    const row = Math.floor(i / ATLAS_COLUMNS);
+    const image = images[i];
+    if (ctx && image) {
+      ctx.drawImage(image, col * TILE_PIXELS, row * TILE_PIXELS, TILE_PIXELS, TILE_PIXELS);
+    }
+    // 纹理默认 flipY，画布第 0 行对应 UV 顶部
+    offsetBySource.set(src, [col * tileSize[0], 1 - (row + 1) * tileSize[1]]);
+  });
+
+  const texture = new THREE.CanvasTexture(canvas);
+  // 图片是 sRGB 像素；与逐格渲染中 R3F 对 map 的处理一致，否则着色器会再编码一次导致发白
+  texture.colorSpace = THREE.SRGBColorSpace;
+  // 不生成 mipmap，避免相邻图片在缩小时互相渗色
+  texture.generateMipmaps = false;
+  texture.minFilter = THREE.LinearFilter;
+  texture.magFilter = THREE.LinearFilter;
+  texture.needsUpdate = true;
+
+  const offsets = {} as Record<FruitType, [number, number]>;
+  for (const fruit of Object.keys(FRUIT_IMAGES) as FruitType[]) {
+    offsets[fruit] = offsetBySource.get(FRUIT_IMAGES[fruit])!;
+  }
+  return { texture, tileSize, offsets };
+}
+
+/**
+ * 加载图集（全局只生成一次）
+ */
+export function loadFruitAtlas(): Promise<FruitAtlas> {
+  if (!atlasPromise) {
+    atlasPromise = buildAtlas();
+  }
+  return atlasPromise;
+}
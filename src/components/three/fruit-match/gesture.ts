@@ -0,0 +1,34 @@
+/**
+ * 单元格手势识别：点击 / 四向滑动
+ */
+
+export type SwipeDirection = 'up' | 'down' | 'left' | 'right';
+
+export const MIN_SWIPE_DISTANCE = 0.15; // 最小滑动距离（3D空间单位，降低阈值以提高灵敏度）
+export const MAX_SWIPE_TIME = 800; // 最大滑动时间（毫秒，增加时间窗口）
+export const MIN_MOVE_DISTANCE = 0.05; // 判断是否移动的最小距离
+
+/**
+ * 根据按下到抬起的位移与耗时判断手势
+ *
+ * @returns 滑动方向；'click' 表示点击；null 表示有移动但距离不够，忽略
+ */
+export function resolveGesture(
+  deltaX: number,
+  deltaY: number,
+  elapsedMs: number,
+  hasMoved: boolean,
+  canSwipe: boolean
+): SwipeDirection | 'click' | null {
+  const distance = Math.sqrt(deltaX * deltaX + deltaY * deltaY);
+
+  // 检查是否是有效的滑动
+  if (distance >= MIN_SWIPE_DISTANCE && elapsedMs <= MAX_SWIPE_TIME && canSwipe) {
+    if (Math.abs(deltaX) > Math.abs(deltaY)) {
+      return deltaX > 0 ? 'right' : 'left';
+    }
+    return deltaY > 0 ? 'up' : 'down';
+  }
+  // 如果没有移动过，视为点击
+  return hasMoved ? null : 'click';
+}
@@ -4,5 +4,9 @@
 
 export { FruitCell } from './FruitCell';
 export { FruitGrid } from './FruitGrid';
+export { InstancedFruitGrid } from './InstancedFruitGrid';
 export { GameScene } from './GameScene';
 export { FruitBackground } from './FruitBackground';
+export { RenderStatsOverlay, RenderStatsProbe, formatRenderStats } from './RenderStats';
+export type { RenderStatsSample } from './RenderStats';
+export type { FruitRenderMode } from './fruit-assets';
@@ -11,9 +11,11 @@ import { Button, Dialog, Input } from 'antd-mobile';
 
 import { useToast } from '@/components/toast';
 import { useZjhAudio } from '@/hooks/useZjhAudio';
+import { useZjhEvents } from '@/hooks/useZjhEvents';
 import { BET_MULTIPLIER } from '@/lib/zjh/constants';
 import { ZJH_BOT_USER_ID } from '@/lib/zjh/bot-constants';
 import { zjhAssets } from '@/lib/zhajinhua/assets';
+import { applyDeltaChips, applyGameDelta } from '@/lib/zhajinhua/game-delta';
 import {
   zjhAction,
   zjhBotStep,
@@ -30,7 +32,13 @@ import {
   zjhSetReady,
   zjhStartGame,
 } from '@/lib/zhajinhua/client-api';
-import type { GamePlayerInfo, GameResultResponse, GameStateResponse, RoomInfo } from '@/types/zjh';
+import type {
+  GamePlayerInfo,
+  GameResultResponse,
+  GameStateResponse,
+  RoomInfo,
+  ZjhStreamEvent,
+} from '@/types/zjh';
 
 import { ZhajinhuaDealerIntro, ZJH_DEALER_INTRO_STORAGE_KEY } from './zhajinhua-dealer-intro';
 import { ZhajinhuaGuidePopup, ZJH_GUIDE_STORAGE_KEY } from './zhajinhua-guide';
@@ -297,25 +305,68 @@ export function ZhajinhuaApp() {
     }
   }, [gameId, userId, refreshStats]);
 
-  /** 房间内轮询 */
+  /** 已合并的最新操作数，用于丢弃乱序/重复的推送 */
+  const lastActionCountRef = useRef(0);
+  useEffect(() => {
+    lastActionCountRef.current = 0;
+  }, [gameId]);
+
+  /** 服务端推送：牌局增量直接合并，房间变更时重新拉取房间 */
+  const handleStreamEvent = useCallback(
+    (event: ZjhStreamEvent) => {
+      if (event.type === 'room') {
+        if (event.roomId !== roomId) return;
+        if (event.gameId && phase === 'room' && event.gameId !== gameId) {
+          setGameId(event.gameId);
+          settlementFetchedRef.current = false;
+          setResult(null);
+          setPhase('playing');
+          playSfx('gameStart');
+        }
+        void refreshRoom();
+        return;
+      }
+
+      if (event.gameId !== gameId || event.actionCount <= lastActionCountRef.current) return;
+      lastActionCountRef.current = event.actionCount;
+      setGameState((prev) => (prev ? applyGameDelta(prev, event) : prev));
+      setRoomInfo((prev) => (prev ? applyDeltaChips(prev, event) : prev));
+      if (event.status === 'SETTLEMENT' || event.status === 'SHOWDOWN') {
+        void refreshGame();
+      }
+    },
+    [roomId, gameId, phase, refreshRoom, refreshGame, playSfx]
+  );
+
+  const streamConnected = useZjhEvents({
+    userId,
+    roomId,
+    gameId: phase === 'playing' ? gameId : null,
+    enabled: phase === 'room' || phase === 'playing',
+    onEvent: handleStreamEvent,
+  });
+
+  /** 房间内：推送连接时只在（重新）连接后拉取一次，断线时回退轮询 */
   useEffect(() => {
     if (phase !== 'room' || !roomId) return;
     void refreshRoom();
+    if (streamConnected) return;
     const t = setInterval(() => void refreshRoom(), 2000);
     return () => clearInterval(t);
-  }, [phase, roomId, refreshRoom]);
+  }, [phase, roomId, refreshRoom, streamConnected]);
 
-  /** 对局中轮询游戏 + 房间（筹码） */
+  /** 对局中：同上，推送断开时轮询游戏 + 房间（筹码） */
   useEffect(() => {
     if (phase !== 'playing' || !gameId || !roomId) return;
     void refreshGame();
     void refreshRoom();
+    if (streamConnected) return;
     const t = setInterval(() => {
       void refreshGame();
       void refreshRoom();
     }, 1500);
     return () => clearInterval(t);
-  }, [phase, gameId, roomId, refreshGame, refreshRoom]);
+  }, [phase, gameId, roomId, refreshGame, refreshRoom, streamConnected]);
 
   /** 轮到机器人时由前端触发服务端走牌（无需真人） */
   const botBusyRef = useRef(false);
@@ -0,0 +1,114 @@
+/**
+ * 炸金花实时推送 Hook
+ * 订阅 /api/zjh/events 的 SSE 流，断线后指数退避重连
+ * 返回当前是否已连接；未连接时调用方应回退到轮询
+ */
+
+'use client';
+
+import { useEffect, useRef, useState } from 'react';
+
+import { zjhOpenEventStream } from '@/lib/zhajinhua/client-api';
+import type { ZjhStreamEvent } from '@/types/zjh';
+
+const RETRY_BASE_MS = 1000;
+const RETRY_MAX_MS = 15000;
+
+/**
+ * 解析一段 SSE 文本块，返回其中的 data 载荷
+ */
+function parseSseBlock(block: string): string | null {
+  const data: string[] = [];
+  for (const line of block.split('\n')) {
+    if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+  }
+  return data.length > 0 ? data.join('\n') : null;
+}
+
+/**
+ * @param userId 当前用户（需坐在所订阅的房间中）
+ * @param roomId 订阅的房间（为空则不订阅房间事件）
+ * @param gameId 订阅的牌局（为空则不订阅牌局事件）
+ * @param enabled 是否启用
+ * @param onEvent 事件回调（可随渲染变化，不会导致重连）
+ */
+export function useZjhEvents({
+  userId,
+  roomId,
+  gameId,
+  enabled,
+  onEvent,
+}: {
+  userId: string | null;
+  roomId: string | null;
+  gameId: string | null;
+  enabled: boolean;
+  onEvent: (event: ZjhStreamEvent) => void;
+}): boolean {
+  const [connected, setConnected] = useState(false);
+  const onEventRef = useRef(onEvent);
+  onEventRef.current = onEvent;
+
+  useEffect(() => {
+    if (!enabled || !userId || (!roomId && !gameId)) {
+      setConnected(false);
+      return;
+    }
+
+    const controller = new AbortController();
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    let attempt = 0;
+
+    const connect = async () => {
+      try {
+        const res = await zjhOpenEventStream({ userId, roomId, gameId }, controller.signal);
+        if (!res.ok || !res.body) throw new Error(`SSE ${res.status}`);
+
+        attempt = 0;
+        setConnected(true);
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        for (;;) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+
+          let sep = buffer.indexOf('\n\n');
+          while (sep !== -1) {
+            const payload = parseSseBlock(buffer.slice(0, sep));
+            buffer = buffer.slice(sep + 2);
+            if (payload) {
+              try {
+                onEventRef.current(JSON.parse(payload) as ZjhStreamEvent);
+              } catch {
+                /* 忽略无法解析的事件 */
+              }
+            }
+            sep = buffer.indexOf('\n\n');
+          }
+        }
+      } catch {
+        /* 连接失败或中断，下面统一重连 */
+      }
+
+      if (controller.signal.aborted) return;
+      setConnected(false);
+      const delay = Math.min(RETRY_MAX_MS, RETRY_BASE_MS * 2 ** attempt);
+      attempt++;
+      retryTimer = setTimeout(() => void connect(), delay);
+    };
+
+    void connect();
+
+    return () => {
+      controller.abort();
+      if (retryTimer) clearTimeout(retryTimer);
+      setConnected(false);
+    };
+  }, [enabled, userId, roomId, gameId]);
+
+  return connected;
+}
@@ -0,0 +1,68 @@
+/**
+ * 成就规则编译与评估测试
+ */
+
+import { describe, it, expect } from 'vitest';
+import type { Achievement } from '@prisma/client';
+
+import { compileRules, findUnlockable } from '../engine';
+
+function achievement(id: string, condition: object): Achievement {
+  return {
+    id,
+    code: id,
+    name: id,
+    description: '',
+    icon: '',
+    category: 'SPECIAL',
+    condition,
+    reward: 0,
+    isActive: true,
+    createdAt: new Date(0),
+  } as Achievement;
+}
+
+const ruleSet = compileRules([
+  achievement('score_1000', { type: 'score', target: 1000, operator: 'gte' }),
+  achievement('combo_5', { type: 'combo', target: 5, operator: 'gte' }),
+  achievement('games_10', { type: 'games', target: 10, operator: 'gte' }),
+  achievement('perfect_win', { type: 'special', code: 'perfect_win' }),
+  achievement('unknown', { type: 'unknown', target: 1 }),
+]);
+
+const user = { id: 'u1', gamesPlayed: 10, totalPlayTime: 0 };
+
+function ids(list: Achievement[]): string[] {
+  return list.map((a) => a.id).sort();
+}
+
+describe('compileRules', () => {
+  it('按条件类型分组，忽略未知类型', () => {
+    expect([...ruleSet.byType.keys()].sort()).toEqual(['combo', 'games', 'score', 'special']);
+  });
+});
+
+describe('findUnlockable', () => {
+  it('满足条件的成就全部返回', () => {
+    const gameData = { score: 1200, maxCombo: 6, moves: 0, isWon: true };
+    expect(ids(findUnlockable(ruleSet, new Set(), { gameData, user }))).toEqual([
+      'combo_5',
+      'games_10',
+      'perfect_win',
+      'score_1000',
+    ]);
+  });
+
+  it('跳过已解锁的成就', () => {
+    const gameData = { score: 1200, maxCombo: 6 };
+    const unlocked = new Set(['score_1000', 'games_10']);
+    expect(ids(findUnlockable(ruleSet, unlocked, { gameData, user }))).toEqual(['combo_5']);
+  });
+
+  it('gameData 中没有触发字段的规则不评估', () => {
+    expect(ids(findUnlockable(ruleSet, new Set(), { gameData: { maxCombo: 9 }, user }))).toEqual([
+      'combo_5',
+      'games_10',
+    ]);
+  });
+});
@@ -0,0 +1,232 @@
+/**
+ * 成就检查引擎
+ *
+ * - 规则集：启用的成就按 condition.type 编译并分组，缓存在进程内，ACHIEVEMENT_RULES_TTL_MS 后自动刷新
+ *   （成就只由 prisma/seed.ts 写入，修改后最多一个 TTL 内生效）
+ * - 每次检查：一次查询取出用户全部 UserAchievement，只评估未解锁、且触发字段出现在 gameData 中的规则
+ * - 解锁：一条 INSERT ... ON CONFLICT 批量写入
+ * - 对局结束后由客户端单独调用 /api/achievements/check 触发，不阻塞提交记录的请求
+ */
+
+import { randomUUID } from 'crypto';
+import { Prisma } from '@prisma/client';
+import type { Achievement, UserAchievement } from '@prisma/client';
+import { prisma } from '@/lib/prisma';
+import type { AchievementCondition } from '@/types/api';
+
+/** 规则集缓存有效期（毫秒） */
+export const ACHIEVEMENT_RULES_TTL_MS = 60_000;
+
+/** 一局结束后上报的数据 */
+export interface AchievementGameData {
+  score?: number;
+  maxCombo?: number;
+  moves?: number;
+  isWon?: boolean;
+}
+
+/** 规则评估所需的用户统计 */
+export interface AchievementUserStats {
+  id: string;
+  gamesPlayed: number;
+  totalPlayTime: number;
+}
+
+interface RuleContext {
+  gameData: AchievementGameData;
+  user: AchievementUserStats;
+}
+
+interface RuleDefinition {
+  /** 触发字段：gameData 中出现其一才评估；为空表示依赖用户统计，每局都评估 */
+  triggers: (keyof AchievementGameData)[];
+  test: (condition: AchievementCondition, ctx: RuleContext) => boolean;
+}
+
+interface CompiledRule {
+  achievement: Achievement;
+  test: (ctx: RuleContext) => boolean;
+}
+
+export interface RuleSet {
+  loadedAt: number;
+  byType: Map<string, CompiledRule[]>;
+  byId: Map<string, Achievement>;
+}
+
+export type UnlockedAchievement = UserAchievement & { achievement: Achievement };
+
+// 比较值
+function compareValue(value: number | undefined, target: number, operator: string): boolean {
+  if (value === undefined) return false;
+  switch (operator) {
+    case 'gte':
+      return value >= target;
+    case 'lte':
+      return value <= target;
+    case 'eq':
+      return value === target;
+    default:
+      return false;
+  }
+}
+
+const RULE_DEFINITIONS: Record<string, RuleDefinition> = {
+  // 单局得分
+  score: {
+    triggers: ['score'],
+    test: (c, { gameData }) => compareValue(gameData.score, c.target, c.operator ?? 'gte'),
+  },
+  // 最大连击
+  combo: {
+    triggers: ['maxCombo'],
+    test: (c, { gameData }) => compareValue(gameData.maxCombo, c.target, c.operator ?? 'gte'),
+  },
+  // 游戏次数
+  games: {
+    triggers: [],
+    test: (c, { user }) => compareValue(user.gamesPlayed, c.target, c.operator ?? 'gte'),
+  },
+  // 游戏时长
+  time: {
+    triggers: [],
+    test: (c, { user }) => compareValue(user.totalPlayTime, c.target, c.operator ?? 'gte'),
+  },
+  // 特殊成就
+  special: {
+    triggers: ['moves', 'isWon'],
+    test: (c, { gameData }) => {
+      if (c.code === 'perfect_win') {
+        // 完美通关：不剩余步数的情况下达成目标分数
+        return gameData.moves === 0 && gameData.isWon === true;
+      }
+      return false;
+    },
+  },
+};
+
+const globalForAchievementRules = globalThis as unknown as {
+  achievementRuleSet: RuleSet | null | undefined;
+};
+
+/**
+ * 编译规则集：按 condition.type 分组，未知类型忽略
+ */
+export function compileRules(achievements: Achievement[]): RuleSet {
+  const byType = new Map<string, CompiledRule[]>();
+  for (const achievement of achievements) {
+    const condition = achievement.condition as unknown as AchievementCondition;
+    const definition = RULE_DEFINITIONS[condition?.type];
+    if (!definition) continue;
+
+    let rules = byType.get(condition.type);
+    if (!rules) {
+      rules = [];
+      byType.set(condition.type, rules);
+    }
+    rules.push({ achievement, test: (ctx) => definition.test(condition, ctx) });
+  }
+
+  return {
+    loadedAt: Date.now(),
+    byType,
+    byId: new Map(achievements.map((a) => [a.id, a])),
+  };
+}
+
+async function getRuleSet(): Promise<RuleSet> {
+  const cached = globalForAchievementRules.achievementRuleSet;
+  if (cached && Date.now() - cached.loadedAt < ACHIEVEMENT_RULES_TTL_MS) {
+    return cached;
+  }
+
+  const achievements = await prisma.achievement.findMany({
+    where: { isActive: true },
+  });
+  const ruleSet = compileRules(achievements);
+  globalForAchievementRules.achievementRuleSet = ruleSet;
+  return ruleSet;
+}
+
+/**
+ * 找出本局满足条件、尚未解锁的成就
+ */
+export function findUnlockable(
+  ruleSet: RuleSet,
+  unlockedIds: Set<string>,
+  ctx: { gameData: AchievementGameData; user: AchievementUserStats }
+): Achievement[] {
+  const result: Achievement[] = [];
+  for (const [type, rules] of ruleSet.byType) {
+    const { triggers } = RULE_DEFINITIONS[type];
+    if (triggers.length > 0 && !triggers.some((field) => ctx.gameData[field] !== undefined)) {
+      continue;
+    }
+    for (const rule of rules) {
+      if (!unlockedIds.has(rule.achievement.id) && rule.test(ctx)) {
+        result.push(rule.achievement);
+      }
+    }
+  }
+  return result;
+}
+
+/**
+ * 批量解锁；已解锁的行保持原 unlockedAt，全部返回
+ */
+async function unlockAll(
+  userId: string,
+  achievementIds: string[],
+  unlockedAt: Date
+): Promise<UserAchievement[]> {
+  const values = Prisma.join(
+    achievementIds.map(
+      (achievementId) =>
+        Prisma.sql`(${randomUUID()}, ${userId}, ${achievementId}, 100, true, ${unlockedAt})`
+    )
+  );
+  return prisma.$queryRaw<UserAchievement[]>`
+    INSERT INTO "UserAchievement" AS ua
+      (id, "userId", "achievementId", progress, "isUnlocked", "unlockedAt")
+    VALUES ${values}
+    ON CONFLICT ("userId", "achievementId") DO UPDATE SET
+      progress = 100,
+      "isUnlocked" = true,
+      "unlockedAt" = CASE WHEN ua."isUnlocked" THEN ua."unlockedAt" ELSE EXCLUDED."unlockedAt" END
+    RETURNING *
+  `;
+}
+
+/**
+ * 检查并解锁成就
+ *
+ * @returns 本局解锁的成就
+ */
+export async function checkAchievements(
+  user: AchievementUserStats,
+  gameData: AchievementGameData
+): Promise<UnlockedAchievement[]> {
+  const [ruleSet, userAchievements] = await Promise.all([
+    getRuleSet(),
+    prisma.userAchievement.findMany({ where: { userId: user.id } }),
+  ]);
+
+  const unlockedIds = new Set(
+    userAchievements.filter((ua) => ua.isUnlocked).map((ua) => ua.achievementId)
+  );
+  const unlockable = findUnlockable(ruleSet, unlockedIds, { gameData, user });
+
+  const unlockedAt = new Date();
+  const written =
+    unlockable.length > 0
+      ? await unlockAll(user.id, unlockable.map((a) => a.id), unlockedAt)
+      : [];
+
+  // 并发检查时另一请求先解锁的行保持原 unlockedAt，不算作本次解锁
+  const result = written.filter((ua) => ua.unlockedAt?.getTime() === unlockedAt.getTime());
+
+  return result.flatMap((ua) => {
+    const achievement = ruleSet.byId.get(ua.achievementId);
+    return achievement ? [{ ...ua, achievement }] : [];
+  });
+}
@@ -0,0 +1,125 @@
+/**
+ * 消消乐连锁消除基准：每秒可处理的“交换 → 连锁结束”次数
+ * 运行：npm run bench
+ *
+ * 对照组是重构前页面内的做法：emoji 二维数组、每轮整盘扫描、"row-col" 字符串键、交换前复制棋盘
+ */
+
+import { bench, describe } from 'vitest';
+
+import {
+  BOARD_SIZE,
+  createBoard,
+  createMask,
+  fillBoard,
+  findHint,
+  markCell,
+  resolveCascades,
+  swapCells,
+} from '../board';
+import { seeded } from './seeded';
+
+const ROUNDS = 256;
+
+const board = createBoard();
+const dirty = createMask();
+// 两组使用相同的确定性随机序列
+const bitboardRandom = seeded(42);
+
+describe('交换并连锁消除', () => {
+  bench('位掩码棋盘', () => {
+    for (let n = 0; n < ROUNDS; n++) {
+      fillBoard(board, bitboardRandom);
+      const hint = findHint(board);
+      if (!hint) continue;
+      swapCells(board, hint.from, hint.to);
+      dirty.fill(0);
+      markCell(dirty, hint.from);
+      markCell(dirty, hint.to);
+      resolveCascades(board, dirty, bitboardRandom);
+    }
+  });
+
+  const FRUITS = ['🍇', '🍋', '🍉', '🍊', '🍎', '🍒', '🍓'];
+  const SPECIALS = ['💣', '🌈', '🎃'];
+  const stringRandom = seeded(42);
+
+  function findMatches(grid: (string | null)[][]): Set<string> {
+    const matches = new Set<string>();
+    for (let row = 0; row < BOARD_SIZE; row++) {
+      for (let col = 0; col < BOARD_SIZE - 2; col++) {
+        const fruit = grid[row][col];
+        if (fruit === null || SPECIALS.includes(fruit)) continue;
+        let count = 1;
+        while (col + count < BOARD_SIZE && grid[row][col + count] === fruit) count++;
+        if (count >= 3) for (let c = col; c < col + count; c++) matches.add(`${row}-${c}`);
+      }
+    }
+    for (let col = 0; col < BOARD_SIZE; col++) {
+      for (let row = 0; row < BOARD_SIZE - 2; row++) {
+        const fruit = grid[row][col];
+        if (fruit === null || SPECIALS.includes(fruit)) continue;
+        let count = 1;
+        while (row + count < BOARD_SIZE && grid[row + count][col] === fruit) count++;
+        if (count >= 3) for (let r = row; r < row + count; r++) matches.add(`${r}-${col}`);
+      }
+    }
+    return matches;
+  }
+
+  function randomGrid(): (string | null)[][] {
+    const grid: (string | null)[][] = [];
+    do {
+      for (let row = 0; row < BOARD_SIZE; row++) {
+        grid[row] = [];
+        for (let col = 0; col < BOARD_SIZE; col++) {
+          grid[row][col] = FRUITS[Math.floor(stringRandom() * FRUITS.length)];
+        }
+      }
+    } while (findMatches(grid).size > 0);
+    return grid;
+  }
+
+  function findMove(grid: (string | null)[][]): [number, number, number, number] | null {
+    for (let row = 0; row < BOARD_SIZE; row++) {
+      for (let col = 0; col < BOARD_SIZE; col++) {
+        for (const [r2, c2] of [[row, col + 1], [row + 1, col]]) {
+          if (r2 >= BOARD_SIZE || c2 >= BOARD_SIZE) continue;
+          const temp = grid.map((r) => [...r]);
+          [temp[row][col], temp[r2][c2]] = [temp[r2][c2], temp[row][col]];
+          if (findMatches(temp).size > 0) return [row, col, r2, c2];
+        }
+      }
+    }
+    return null;
+  }
+
+  bench('字符串二维数组（对照）', () => {
+    for (let n = 0; n < ROUNDS; n++) {
+      const grid = randomGrid();
+      const move = findMove(grid);
+      if (!move) continue;
+      const [r1, c1, r2, c2] = move;
+      [grid[r1][c1], grid[r2][c2]] = [grid[r2][c2], grid[r1][c1]];
+      for (let matches = findMatches(grid); matches.size > 0; matches = findMatches(grid)) {
+        matches.forEach((key) => {
+          const [row, col] = key.split('-').map(Number);
+          grid[row][col] = null;
+        });
+        for (let col = 0; col < BOARD_SIZE; col++) {
+          let write = BOARD_SIZE - 1;
+          for (let row = BOARD_SIZE - 1; row >= 0; row--) {
+            if (grid[row][col] !== null) {
+              grid[write][col] = grid[row][col];
+              if (write !== row) grid[row][col] = null;
+              write--;
+            }
+          }
+          for (let row = write; row >= 0; row--) {
+            grid[row][col] = FRUITS[Math.floor(stringRandom() * FRUITS.length)];
+          }
+        }
+      }
+    }
+  });
+});
@@ -0,0 +1,298 @@
+/**
+ * 消消乐棋盘核心测试：位掩码检测与逐格扫描的参考实现逐一对照
+ */
+
+import { describe, it, expect } from 'vitest';
+import fc from 'fast-check';
+
+import {
+  BOARD_SIZE,
+  BOMB,
+  CELL_COUNT,
+  EMPTY,
+  NORMAL_FRUIT_COUNT,
+  PUMPKIN,
+  RAINBOW,
+  activateSpecial,
+  canSwap,
+  cellIndex,
+  clearCells,
+  collapse,
+  createBoard,
+  createMask,
+  createMatchScan,
+  fillBoard,
+  findAllMatches,
+  findHint,
+  findMatches,
+  hasCell,
+  isMaskEmpty,
+  markCell,
+  resolveCascades,
+  setCell,
+  swapCells,
+  type Board,
+} from '../board';
+import { seeded } from './seeded';
+
+function boardFrom(codes: number[]): Board {
+  const board = createBoard();
+  codes.forEach((code, index) => setCell(board, index, code));
+  return board;
+}
+
+/** 逐格扫描的参考实现：返回所有处于三连（及以上）中的格子 */
+function referenceMatches(cells: Uint8Array): Set<number> {
+  const result = new Set<number>();
+  const isNormal = (code: number) => code >= 1 && code <= NORMAL_FRUIT_COUNT;
+  for (let row = 0; row < BOARD_SIZE; row++) {
+    for (let col = 0; col < BOARD_SIZE; col++) {
+      const code = cells[cellIndex(row, col)];
+      if (!isNormal(code)) continue;
+      let h = 0;
+      while (col + h < BOARD_SIZE && cells[cellIndex(row, col + h)] === code) h++;
+      if (h >= 3) for (let i = 0; i < h; i++) result.add(cellIndex(row, col + i));
+      let v = 0;
+      while (row + v < BOARD_SIZE && cells[cellIndex(row + v, col)] === code) v++;
+      if (v >= 3) for (let i = 0; i < v; i++) result.add(cellIndex(row + i, col));
+    }
+  }
+  return result;
+}
+
+function maskCells(mask: Uint8Array): Set<number> {
+  const result = new Set<number>();
+  for (let index = 0; index < CELL_COUNT; index++) {
+    if (hasCell(mask, index)) result.add(index);
+  }
+  return result;
+}
+
+/** 位掩码与格子内容一致 */
+function expectConsistent(board: Board): void {
+  for (let code = 1; code <= NORMAL_FRUIT_COUNT; code++) {
+    for (let row = 0; row < BOARD_SIZE; row++) {
+      let expected = 0;
+      for (let col = 0; col < BOARD_SIZE; col++) {
+        if (board.cells[cellIndex(row, col)] === code) expected |= 1 << col;
+      }
+      expect(board.rows[code * BOARD_SIZE + row]).toBe(expected);
+    }
+  }
+}
+
+const cellsArb = fc.array(fc.integer({ min: 1, max: NORMAL_FRUIT_COUNT }), {
+  minLength: CELL_COUNT,
+  maxLength: CELL_COUNT,
+});
+
+describe('findMatches', () => {
+  it('整盘检测与参考实现一致', () => {
+    fc.assert(
+      fc.property(cellsArb, (codes) => {
+        const board = boardFrom(codes);
+        const scan = createMatchScan();
+        const found = findAllMatches(board, scan, () => 1);
+        const expected = referenceMatches(board.cells);
+        expect(maskCells(scan.matched)).toEqual(expected);
+        expect(found).toBe(expected.size > 0);
+      }),
+      { numRuns: 500 }
+    );
+  });
+
+  it('稳定棋盘交换后，只检查两格的结果与整盘检测一致', () => {
+    const random = seeded(1);
+    const board = createBoard();
+    const scan = createMatchScan();
+    for (let n = 0; n < 200; n++) {
+      fillBoard(board, random);
+      for (let a = 0; a < CELL_COUNT; a++) {
+        const neighbors = [(a & 7) < BOARD_SIZE - 1 ? a + 1 : -1, a + BOARD_SIZE];
+        for (const b of neighbors) {
+          if (b < 0 || b >= CELL_COUNT) continue;
+          swapCells(board, a, b);
+          const dirty = createMask();
+          markCell(dirty, a);
+          markCell(dirty, b);
+          findMatches(board, dirty, scan, () => 1);
+          expect(maskCells(scan.matched)).toEqual(referenceMatches(board.cells));
+          swapCells(board, a, b);
+        }
+      }
+    }
+  });
+
+  it('4 连生成炸弹、5 连生成彩虹，位置在中间', () => {
+    const scan = createMatchScan();
+    const codes = new Array(CELL_COUNT).fill(0).map((_, i) => 1 + ((i + (i >> 3)) % 2) * 2);
+
+    const four = boardFrom(codes);
+    for (let col = 0; col < 4; col++) setCell(four, cellIndex(7, col), 5);
+    findAllMatches(four, scan, () => 1);
+    expect(scan.special).toBe(BOMB);
+    expect(scan.specialIndex).toBe(cellIndex(7, 2));
+
+    const five = boardFrom(codes);
+    for (let row = 2; row < 7; row++) setCell(five, cellIndex(row, 4), 6);
+    findAllMatches(five, scan, () => 1);
+    expect(scan.special).toBe(RAINBOW);
+    expect(scan.specialIndex).toBe(cellIndex(4, 4));
+  });
+
+  it('3 连按概率生成炸弹', () => {
+    const scan = createMatchScan();
+    const codes = new Array(CELL_COUNT).fill(0).map((_, i) => 1 + ((i + (i >> 3)) % 2) * 2);
+    const board = boardFrom(codes);
+    for (let col = 3; col < 6; col++) setCell(board, cellIndex(0, col), 4);
+
+    findAllMatches(board, scan, () => 0.99);
+    expect(scan.special).toBe(EMPTY);
+    findAllMatches(board, scan, () => 0);
+    expect(scan.special).toBe(BOMB);
+    expect(scan.specialIndex).toBe(cellIndex(0, 4));
+  });
+});
+
+describe('fillBoard', () => {
+  it('生成的棋盘没有匹配、没有特殊水果，且至少有一步可走', () => {
+    const random = seeded(2);
+    const board = createBoard();
+    const scan = createMatchScan();
+    for (let n = 0; n < 500; n++) {
+      fillBoard(board, random);
+      expect(findAllMatches(board, scan)).toBe(false);
+      expect(board.cells.every((code) => code >= 1 && code <= NORMAL_FRUIT_COUNT)).toBe(true);
+      expect(findHint(board)).not.toBeNull();
+      expectConsistent(board);
+    }
+  });
+});
+
+describe('canSwap / findHint', () => {
+  it('与复制棋盘后整盘检测的结果一致', () => {
+    fc.assert(
+      fc.property(fc.integer(), (seed) => {
+        const board = createBoard();
+        fillBoard(board, seeded(seed));
+        const before = board.cells.slice();
+        for (let a = 0; a < CELL_COUNT; a++) {
+          for (const b of [a + 1, a + BOARD_SIZE]) {
+            if (b >= CELL_COUNT || (b === a + 1 && (a & 7) === BOARD_SIZE - 1)) continue;
+            const copy = before.slice();
+            [copy[a], copy[b]] = [copy[b], copy[a]];
+            expect(canSwap(board, a, b)).toBe(referenceMatches(copy).size > 0);
+          }
+        }
+        expect(board.cells).toEqual(before);
+
+        const hint = findHint(board);
+        expect(hint).not.toBeNull();
+        expect(canSwap(board, hint!.from, hint!.to)).toBe(true);
+      }),
+      { numRuns: 100 }
+    );
+  });
+
+  it('含特殊水果的交换总是允许', () => {
+    const board = createBoard();
+    fillBoard(board, seeded(3));
+    setCell(board, 10, PUMPKIN);
+    expect(canSwap(board, 10, 11)).toBe(true);
+    expect(canSwap(board, 2, 10)).toBe(true);
+  });
+});
+
+describe('clearCells / collapse', () => {
+  it('炸弹消除 3x3，南瓜消除整行整列，彩虹消除同色', () => {
+    const board = createBoard();
+    fillBoard(board, seeded(4));
+
+    const bomb = createMask();
+    activateSpecial(board, cellIndex(0, 0), BOMB, bomb);
+    expect(maskCells(bomb)).toEqual(
+      new Set([cellIndex(0, 0), cellIndex(0, 1), cellIndex(1, 0), cellIndex(1, 1)])
+    );
+
+    const pumpkin = createMask();
+    activateSpecial(board, cellIndex(3, 5), PUMPKIN, pumpkin);
+    expect(maskCells(pumpkin).size).toBe(BOARD_SIZE * 2 - 1);
+
+    const target = board.cells[cellIndex(6, 6)];
+    const rainbow = createMask();
+    activateSpecial(board, cellIndex(2, 2), RAINBOW, rainbow, target);
+    const expected = new Set<number>([cellIndex(2, 2)]);
+    board.cells.forEach((code, index) => {
+      if (code === target) expected.add(index);
+    });
+    expect(maskCells(rainbow)).toEqual(expected);
+  });
+
+  it('消除中的特殊水果会被激活', () => {
+    const board = createBoard();
+    fillBoard(board, seeded(5));
+    setCell(board, cellIndex(4, 4), BOMB);
+    const mask = createMask();
+    markCell(mask, cellIndex(4, 4));
+    expect(clearCells(board, mask)).toBe(9);
+    for (let row = 3; row <= 5; row++) {
+      for (let col = 3; col <= 5; col++) expect(board.cells[cellIndex(row, col)]).toBe(EMPTY);
+    }
+    expectConsistent(board);
+  });
+
+  it('下落保持列内顺序，补满空位并标记变化的格子', () => {
+    fc.assert(
+      fc.property(cellsArb, fc.array(fc.boolean(), { minLength: 64, maxLength: 64 }), (codes, holes) => {
+        const board = boardFrom(codes.map((code, i) => (holes[i] ? EMPTY : code)));
+        const before = board.cells.slice();
+        const dirty = createMask();
+        collapse(board, dirty, seeded(6));
+
+        expect(board.cells.includes(EMPTY)).toBe(false);
+        expectConsistent(board);
+        for (let col = 0; col < BOARD_SIZE; col++) {
+          const column = [];
+          for (let row = 0; row < BOARD_SIZE; row++) {
+            const code = before[cellIndex(row, col)];
+            if (code !== EMPTY) column.push(code);
+          }
+          for (let i = 0; i < column.length; i++) {
+            const row = BOARD_SIZE - column.length + i;
+            expect(board.cells[cellIndex(row, col)]).toBe(column[i]);
+          }
+          for (let row = 0; row < BOARD_SIZE; row++) {
+            const index = cellIndex(row, col);
+            if (before[index] !== board.cells[index]) expect(hasCell(dirty, index)).toBe(true);
+          }
+        }
+      })
+    );
+  });
+});
+
+describe('resolveCascades', () => {
+  it('连锁结束后棋盘稳定，位掩码一致', () => {
+    const random = seeded(7);
+    const board = createBoard();
+    const scan = createMatchScan();
+    const dirty = createMask();
+    let cascades = 0;
+    for (let n = 0; n < 300; n++) {
+      fillBoard(board, random);
+      const hint = findHint(board)!;
+      swapCells(board, hint.from, hint.to);
+      dirty.fill(0);
+      markCell(dirty, hint.from);
+      markCell(dirty, hint.to);
+      cascades += resolveCascades(board, dirty, random, (matched, removed) => {
+        expect(isMaskEmpty(matched)).toBe(false);
+        expect(removed).toBeGreaterThan(0);
+      });
+      expect(findAllMatches(board, scan)).toBe(false);
+      expect(board.cells.includes(EMPTY)).toBe(false);
+      expectConsistent(board);
+    }
+    expect(cascades).toBeGreaterThanOrEqual(300);
+  });
+});
@@ -0,0 +1,509 @@
+/**
+ * 水果消消乐棋盘核心（与 UI 无关，可在页面与基准测试中共用）
+ *
+ * 格子编码：0 为空，1–7 为普通水果，8–10 为特殊水果；格子下标 index = row * 8 + col
+ * 每种普通水果维护一组行位掩码（下标 code * 8 + row，第 col 位表示该格是这种水果），
+ * 三连检测即按位与：横向 m & m>>1 & m>>2，纵向 r0 & r1 & r2；特殊水果不参与三连
+ *
+ * - 匹配检测只扫描“脏”格所在的行与列（交换的两格、下落 / 补充的格子）
+ * - 下落与补充原地完成，不分配内存，并写出新的脏格掩码供下一轮检测
+ * - 交换可行性、死局判断与提示：原地交换后只检查两格所在的行列，再换回
+ */
+
+export const BOARD_SIZE = 8;
+export const CELL_COUNT = BOARD_SIZE * BOARD_SIZE;
+
+/** 空格 */
+export const EMPTY = 0;
+/** 普通水果种类数（编码 1–7） */
+export const NORMAL_FRUIT_COUNT = 7;
+/** 炸弹：消除周围 3x3 区域 */
+export const BOMB = 8;
+/** 彩虹：消除所有同色水果 */
+export const RAINBOW = 9;
+/** 南瓜：十字消除（整行 + 整列） */
+export const PUMPKIN = 10;
+
+/** 3 连消生成炸弹的概率 */
+export const TRIPLE_BOMB_CHANCE = 0.6;
+
+/** 返回 [0, 1) 的随机数，默认 Math.random */
+export type RandomSource = () => number;
+
+/**
+ * 格子集合：每行一个字节，第 col 位表示 (row, col)
+ */
+export type CellMask = Uint8Array;
+
+export interface Board {
+  /** 每格的编码 */
+  cells: Uint8Array;
+  /** 每种普通水果的行位掩码，下标 code * BOARD_SIZE + row */
+  rows: Uint8Array;
+}
+
+/** 一次匹配检测的结果（可复用，避免每轮分配） */
+export interface MatchScan {
+  /** 匹配的格子 */
+  matched: CellMask;
+  /** 要生成的特殊水果，EMPTY 表示不生成 */
+  special: number;
+  /** 特殊水果生成位置 */
+  specialIndex: number;
+}
+
+/** 提示：交换这两个格子可以消除 */
+export interface SwapHint {
+  from: number;
+  to: number;
+}
+
+const FULL_ROW = (1 << BOARD_SIZE) - 1;
+
+export function isNormalFruit(code: number): boolean {
+  return code >= 1 && code <= NORMAL_FRUIT_COUNT;
+}
+
+export function isSpecialFruit(code: number): boolean {
+  return code >= BOMB && code <= PUMPKIN;
+}
+
+export function cellIndex(row: number, col: number): number {
+  return row * BOARD_SIZE + col;
+}
+
+export function createBoard(): Board {
+  return {
+    cells: new Uint8Array(CELL_COUNT),
+    rows: new Uint8Array((NORMAL_FRUIT_COUNT + 1) * BOARD_SIZE),
+  };
+}
+
+export function createMask(): CellMask {
+  return new Uint8Array(BOARD_SIZE);
+}
+
+export function createMatchScan(): MatchScan {
+  return { matched: createMask(), special: EMPTY, specialIndex: -1 };
+}
+
+export function markCell(mask: CellMask, index: number): void {
+  mask[index >> 3] |= 1 << (index & 7);
+}
+
+export function hasCell(mask: CellMask, index: number): boolean {
+  return (mask[index >> 3] & (1 << (index & 7))) !== 0;
+}
+
+export function unmarkCell(mask: CellMask, index: number): void {
+  mask[index >> 3] &= ~(1 << (index & 7));
+}
+
+export function isMaskEmpty(mask: CellMask): boolean {
+  for (let row = 0; row < BOARD_SIZE; row++) {
+    if (mask[row] !== 0) return false;
+  }
+  return true;
+}
+
+/**
+ * 写入一格并同步位掩码
+ */
+export function setCell(board: Board, index: number, code: number): void {
+  const old = board.cells[index];
+  if (old === code) return;
+  const row = index >> 3;
+  const bit = 1 << (index & 7);
+  if (isNormalFruit(old)) board.rows[old * BOARD_SIZE + row] &= ~bit;
+  if (isNormalFruit(code)) board.rows[code * BOARD_SIZE + row] |= bit;
+  board.cells[index] = code;
+}
+
+export function swapCells(board: Board, a: number, b: number): void {
+  const codeA = board.cells[a];
+  setCell(board, a, board.cells[b]);
+  setCell(board, b, codeA);
+}
+
+/**
+ * 行内长度 ≥ 3 的连续段（展开为全部成员位）
+ */
+function horizontalRuns(m: number): number {
+  const starts = m & (m >> 1) & (m >> 2);
+  return (starts | (starts << 1) | (starts << 2)) & FULL_ROW;
+}
+
+/** 纵向匹配的临时掩码 */
+const verticalScratch = new Uint8Array(BOARD_SIZE);
+
+/**
+ * 按扫描顺序为第一个满足条件的连续段生成特殊水果：
+ * ≥5 连 → 彩虹，4 连 → 炸弹，3 连 → 按概率生成炸弹
+ */
+function considerRun(
+  out: MatchScan,
+  length: number,
+  centerIndex: number,
+  random: RandomSource
+): void {
+  if (out.special !== EMPTY) return;
+  if (length >= 5) {
+    out.special = RAINBOW;
+  } else if (length === 4) {
+    out.special = BOMB;
+  } else if (random() < TRIPLE_BOMB_CHANCE) {
+    out.special = BOMB;
+  } else {
+    return;
+  }
+  out.specialIndex = centerIndex;
+}
+
+/**
+ * 检测包含脏格的行与列中的三连（及以上）
+ * 棋盘其余部分应当是稳定的（上一轮已经没有匹配），新出现的匹配必然经过脏格
+ *
+ * @returns 是否有匹配，结果写入 out
+ */
+export function findMatches(
+  board: Board,
+  dirty: CellMask,
+  out: MatchScan,
+  random: RandomSource = Math.random
+): boolean {
+  const { cells, rows } = board;
+  const matched = out.matched;
+  matched.fill(0);
+  out.special = EMPTY;
+  out.specialIndex = -1;
+
+  let dirtyCols = 0;
+  for (let row = 0; row < BOARD_SIZE; row++) dirtyCols |= dirty[row];
+  if (dirtyCols === 0) return false;
+
+  // 横向：只看有脏格的行
+  for (let row = 0; row < BOARD_SIZE; row++) {
+    if (dirty[row] === 0) continue;
+    let runs = 0;
+    for (let code = 1; code <= NORMAL_FRUIT_COUNT; code++) {
+      runs |= horizontalRuns(rows[code * BOARD_SIZE + row]);
+    }
+    if (runs === 0) continue;
+    matched[row] |= runs;
+
+    // 按列顺序拆出连续段（相邻的不同水果各自成段）
+    const base = row * BOARD_SIZE;
+    let col = 0;
+    while (col < BOARD_SIZE) {
+      if ((runs & (1 << col)) === 0) {
+        col++;
+        continue;
+      }
+      const code = cells[base + col];
+      let end = col + 1;
+      while (end < BOARD_SIZE && (runs & (1 << end)) !== 0 && cells[base + end] === code) end++;
+      const length = end - col;
+      considerRun(out, length, base + col + (length >> 1), random);
+      col = end;
+    }
+  }
+
+  // 纵向：只看有脏格的列
+  const vertical = verticalScratch;
+  vertical.fill(0);
+  let verticalCols = 0;
+  for (let code = 1; code <= NORMAL_FRUIT_COUNT; code++) {
+    const offset = code * BOARD_SIZE;
+    for (let row = 0; row + 2 < BOARD_SIZE; row++) {
+      const starts = rows[offset + row] & rows[offset + row + 1] & rows[offset + row + 2] & dirtyCols;
+      if (starts === 0) continue;
+      vertical[row] |= starts;
+      vertical[row + 1] |= starts;
+      vertical[row + 2] |= starts;
+      verticalCols |= starts;
+    }
+  }
+  if (verticalCols !== 0) {
+    for (let row = 0; row < BOARD_SIZE; row++) matched[row] |= vertical[row];
+
+    for (let col = 0; col < BOARD_SIZE; col++) {
+      const bit = 1 << col;
+      if ((verticalCols & bit) === 0) continue;
+      let row = 0;
+      while (row < BOARD_SIZE) {
+        if ((vertical[row] & bit) === 0) {
+          row++;
+          continue;
+        }
+        const code = cells[row * BOARD_SIZE + col];
+        let end = row + 1;
+        while (
+          end < BOARD_SIZE &&
+          (vertical[end] & bit) !== 0 &&
+          cells[end * BOARD_SIZE + col] === code
+        ) {
+          end++;
+        }
+        const length = end - row;
+        considerRun(out, length, (row + (length >> 1)) * BOARD_SIZE + col, random);
+        row = end;
+      }
+    }
+  }
+
+  return !isMaskEmpty(matched);
+}
+
+/**
+ * 整盘检测（不依赖脏格），用于校验外部传入的棋盘
+ */
+export function findAllMatches(
+  board: Board,
+  out: MatchScan,
+  random: RandomSource = Math.random
+): boolean {
+  const all = createMask().fill(FULL_ROW);
+  return findMatches(board, all, out, random);
+}
+
+/**
+ * 激活一个特殊水果，把受影响的格子并入 mask
+ *
+ * @param target 彩虹的目标水果；不传时取周围 3x3 内的第一个普通水果
+ */
+export function activateSpecial(
+  board: Board,
+  index: number,
+  code: number,
+  mask: CellMask,
+  target: number = EMPTY
+): void {
+  const row = index >> 3;
+  const col = index & 7;
+
+  if (code === BOMB) {
+    const span = ((0b111 << col) >> 1) & FULL_ROW;
+    for (let r = Math.max(0, row - 1); r <= Math.min(BOARD_SIZE - 1, row + 1); r++) {
+      mask[r] |= span;
+    }
+  } else if (code === RAINBOW) {
+    let fruit = isNormalFruit(target) ? target : EMPTY;
+    for (let r = Math.max(0, row - 1); r <= Math.min(BOARD_SIZE - 1, row + 1) && !fruit; r++) {
+      for (let c = Math.max(0, col - 1); c <= Math.min(BOARD_SIZE - 1, col + 1); c++) {
+        const neighbor = board.cells[r * BOARD_SIZE + c];
+        if (isNormalFruit(neighbor)) {
+          fruit = neighbor;
+          break;
+        }
+      }
+    }
+    if (fruit) {
+      const offset = fruit * BOARD_SIZE;
+      for (let r = 0; r < BOARD_SIZE; r++) mask[r] |= board.rows[offset + r];
+    }
+    markCell(mask, index);
+  } else if (code === PUMPKIN) {
+    const bit = 1 << col;
+    for (let r = 0; r < BOARD_SIZE; r++) mask[r] |= bit;
+    mask[row] = FULL_ROW;
+  }
+}
+
+/** 待激活特殊水果的临时列表 */
+const specialScratch = new Uint8Array(CELL_COUNT);
+
+/**
+ * 消除 mask 中的格子；其中的特殊水果先被激活（彩虹以消除范围内的普通水果为目标）
+ * mask 会被扩展为实际消除的范围
+ *
+ * @returns 实际消除的水果数
+ */
+export function clearCells(board: Board, mask: CellMask): number {
+  const { cells } = board;
+  let specialCount = 0;
+  let fruitInMask = EMPTY;
+  for (let row = 0; row < BOARD_SIZE; row++) {
+    let bits = mask[row];
+    while (bits !== 0) {
+      const col = 31 - Math.clz32(bits & -bits);
+      bits &= bits - 1;
+      const index = row * BOARD_SIZE + col;
+      const code = cells[index];
+      if (isSpecialFruit(code)) {
+        specialScratch[specialCount++] = index;
+      } else if (code !== EMPTY && fruitInMask === EMPTY) {
+        fruitInMask = code;
+      }
+    }
+  }
+
+  for (let i = 0; i < specialCount; i++) {
+    const index = specialScratch[i];
+    const code = cells[index];
+    activateSpecial(board, index, code, mask, code === RAINBOW ? fruitInMask : EMPTY);
+  }
+
+  let removed = 0;
+  for (let row = 0; row < BOARD_SIZE; row++) {
+    let bits = mask[row];
+    while (bits !== 0) {
+      const col = 31 - Math.clz32(bits & -bits);
+      bits &= bits - 1;
+      const index = row * BOARD_SIZE + col;
+      if (cells[index] !== EMPTY) {
+        setCell(board, index, EMPTY);
+        removed++;
+      }
+    }
+  }
+  return removed;
+}
+
+function randomFruit(random: RandomSource): number {
+  return 1 + Math.floor(random() * NORMAL_FRUIT_COUNT);
+}
+
+/**
+ * 水果下落并从顶部补充，原地完成
+ * dirty 被改写为位置发生变化或新补充的格子
+ */
+export function collapse(board: Board, dirty: CellMask, random: RandomSource = Math.random): void {
+  const { cells } = board;
+  dirty.fill(0);
+  for (let col = 0; col < BOARD_SIZE; col++) {
+    const bit = 1 << col;
+    // 从底部向上移动非空水果
+    let write = BOARD_SIZE - 1;
+    for (let row = BOARD_SIZE - 1; row >= 0; row--) {
+      const code = cells[row * BOARD_SIZE + col];
+      if (code === EMPTY) continue;
+      if (write !== row) {
+        setCell(board, write * BOARD_SIZE + col, code);
+        setCell(board, row * BOARD_SIZE + col, EMPTY);
+        dirty[write] |= bit;
+      }
+      write--;
+    }
+    // 填充顶部空位
+    for (let row = write; row >= 0; row--) {
+      setCell(board, row * BOARD_SIZE + col, randomFruit(random));
+      dirty[row] |= bit;
+    }
+  }
+}
+
+/**
+ * 连锁消除直到没有匹配
+ *
+ * @param dirty 本次变化的格子（例如交换的两格），处理过程中被复用
+ * @param onStep 每轮消除后回调：本轮消除范围、消除数量、生成的特殊水果
+ * @returns 连锁轮数
+ */
+export function resolveCascades(
+  board: Board,
+  dirty: CellMask,
+  random: RandomSource = Math.random,
+  onStep?: (matched: CellMask, removed: number, scan: MatchScan) => void,
+  scan: MatchScan = cascadeScan
+): number {
+  let steps = 0;
+  while (findMatches(board, dirty, scan, random)) {
+    // 保留一个格子用于生成特殊水果
+    if (scan.special !== EMPTY) unmarkCell(scan.matched, scan.specialIndex);
+    const removed = clearCells(board, scan.matched);
+    if (scan.special !== EMPTY) setCell(board, scan.specialIndex, scan.special);
+
+    steps++;
+    onStep?.(scan.matched, removed, scan);
+    collapse(board, dirty, random);
+  }
+  return steps;
+}
+
+const cascadeScan = createMatchScan();
+
+/**
+ * 该格是否处于三连（及以上）之中
+ */
+function isInMatch(board: Board, index: number): boolean {
+  const code = board.cells[index];
+  if (!isNormalFruit(code)) return false;
+  const offset = code * BOARD_SIZE;
+  const row = index >> 3;
+  const bit = 1 << (index & 7);
+  if ((horizontalRuns(board.rows[offset + row]) & bit) !== 0) return true;
+
+  let length = 1;
+  for (let r = row - 1; r >= 0 && (board.rows[offset + r] & bit) !== 0; r--) length++;
+  for (let r = row + 1; r < BOARD_SIZE && (board.rows[offset + r] & bit) !== 0; r++) length++;
+  return length >= 3;
+}
+
+/**
+ * 交换相邻两格后是否能消除（含特殊水果的交换总是允许）
+ * 原地交换检查后换回，不复制棋盘
+ */
+export function canSwap(board: Board, a: number, b: number): boolean {
+  const codeA = board.cells[a];
+  const codeB = board.cells[b];
+  if (codeA === EMPTY || codeB === EMPTY) return false;
+  if (isSpecialFruit(codeA) || isSpecialFruit(codeB)) return true;
+  if (codeA === codeB) return false;
+
+  swapCells(board, a, b);
+  const result = isInMatch(board, a) || isInMatch(board, b);
+  swapCells(board, a, b);
+  return result;
+}
+
+/**
+ * 找一步可行的交换（从左上角开始，先横后纵），没有则返回 null
+ */
+export function findHint(board: Board): SwapHint | null {
+  for (let index = 0; index < CELL_COUNT; index++) {
+    if ((index & 7) < BOARD_SIZE - 1 && canSwap(board, index, index + 1)) {
+      return { from: index, to: index + 1 };
+    }
+    if (index + BOARD_SIZE < CELL_COUNT && canSwap(board, index, index + BOARD_SIZE)) {
+      return { from: index, to: index + BOARD_SIZE };
+    }
+  }
+  return null;
+}
+
+export function hasValidMove(board: Board): boolean {
+  return findHint(board) !== null;
+}
+
+/** 生成新棋盘的最大尝试次数（极少数情况下生成的棋盘没有可行交换） */
+const MAX_FILL_ATTEMPTS = 100;
+
+/**
+ * 随机填满棋盘：逐格排除会与左侧 / 上方两格组成三连的水果，一次生成即无匹配；
+ * 若没有可行交换则重新生成
+ */
+export function fillBoard(board: Board, random: RandomSource = Math.random): void {
+  const { cells } = board;
+  for (let attempt = 0; attempt < MAX_FILL_ATTEMPTS; attempt++) {
+    for (let index = 0; index < CELL_COUNT; index++) {
+      const row = index >> 3;
+      const col = index & 7;
+      const left = col >= 2 && cells[index - 1] === cells[index - 2] ? cells[index - 1] : EMPTY;
+      const up =
+        row >= 2 && cells[index - BOARD_SIZE] === cells[index - 2 * BOARD_SIZE]
+          ? cells[index - BOARD_SIZE]
+          : EMPTY;
+
+      // 在未被排除的水果中均匀选取
+      const excluded = (left !== EMPTY ? 1 : 0) + (up !== EMPTY && up !== left ? 1 : 0);
+      let pick = Math.floor(random() * (NORMAL_FRUIT_COUNT - excluded));
+      let code = 1;
+      for (; code <= NORMAL_FRUIT_COUNT; code++) {
+        if (code === left || code === up) continue;
+        if (pick-- === 0) break;
+      }
+      setCell(board, index, code);
+    }
+    if (hasValidMove(board)) return;
+  }
+}
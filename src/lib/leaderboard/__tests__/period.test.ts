@@ -0,0 +1,43 @@
+/**
+ * 排行榜周期测试
+ */
+
+import { describe, it, expect } from 'vitest';
+
+import { getPeriod, getWeekNumber, isLeaderboardType } from '../period';
+
+describe('getPeriod', () => {
+  const now = new Date(2026, 0, 12, 12, 0, 0);
+
+  it('四种榜单的周期格式', () => {
+    expect(getPeriod('ALL_TIME', now)).toBe('all');
+    expect(getPeriod('DAILY', now)).toBe(now.toISOString().split('T')[0]);
+    expect(getPeriod('WEEKLY', now)).toBe('2026-W03');
+    expect(getPeriod('MONTHLY', now)).toBe('2026-01');
+  });
+
+  it('跨年的一周使用 ISO 周年，整周落在同一个周期', () => {
+    expect(getPeriod('WEEKLY', new Date(2025, 11, 28))).toBe('2025-W52');
+    expect(getPeriod('WEEKLY', new Date(2025, 11, 29))).toBe('2026-W01');
+    expect(getPeriod('WEEKLY', new Date(2026, 0, 1))).toBe('2026-W01');
+    expect(getPeriod('WEEKLY', new Date(2026, 0, 4))).toBe('2026-W01');
+    expect(getPeriod('WEEKLY', new Date(2026, 11, 31))).toBe('2026-W53');
+    expect(getPeriod('WEEKLY', new Date(2027, 0, 1))).toBe('2026-W53');
+    expect(getPeriod('WEEKLY', new Date(2027, 0, 4))).toBe('2027-W01');
+  });
+});
+
+describe('getWeekNumber', () => {
+  it('按 ISO 8601 计算周数', () => {
+    expect(getWeekNumber(new Date(2026, 0, 1))).toEqual({ year: 2026, week: 1 });
+    expect(getWeekNumber(new Date(2025, 11, 29))).toEqual({ year: 2026, week: 1 });
+    expect(getWeekNumber(new Date(2027, 0, 1))).toEqual({ year: 2026, week: 53 });
+  });
+});
+
+describe('isLeaderboardType', () => {
+  it('只接受已知类型', () => {
+    expect(isLeaderboardType('WEEKLY')).toBe(true);
+    expect(isLeaderboardType('YEARLY')).toBe(false);
+  });
+});
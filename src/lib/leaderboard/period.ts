@@ -0,0 +1,57 @@
+/**
+ * 排行榜周期
+ * 每种榜单按周期分桶：all / YYYY-MM-DD / YYYY-Www / YYYY-MM
+ */
+
+import type { LeaderboardType } from '@/types/api';
+
+/** 全部榜单类型（每条游戏记录都会写入这四个榜） */
+export const LEADERBOARD_TYPES: LeaderboardType[] = ['ALL_TIME', 'DAILY', 'WEEKLY', 'MONTHLY'];
+
+/**
+ * 榜单 key 的过期时间（秒），每次写入时刷新
+ * 周期结束后不再有写入，保留一段时间供查询上一期，随后由 Redis 自动清除
+ */
+export const LEADERBOARD_TTL_SECONDS: Record<LeaderboardType, number | null> = {
+  ALL_TIME: null,
+  DAILY: 2 * 24 * 60 * 60,
+  WEEKLY: 14 * 24 * 60 * 60,
+  MONTHLY: 62 * 24 * 60 * 60,
+};
+
+export function isLeaderboardType(value: string): value is LeaderboardType {
+  return (LEADERBOARD_TYPES as string[]).includes(value);
+}
+
+/**
+ * 根据类型获取周期
+ */
+export function getPeriod(type: LeaderboardType, now: Date = new Date()): string {
+  switch (type) {
+    case 'DAILY':
+      return now.toISOString().split('T')[0]; // YYYY-MM-DD
+    case 'WEEKLY': {
+      // 跨年的那一周整周归入同一个周年（如 2025-12-29 属于 2026-W01）
+      const { year, week } = getWeekNumber(now);
+      return `${year}-W${week.toString().padStart(2, '0')}`;
+    }
+    case 'MONTHLY':
+      return `${now.getFullYear()}-${(now.getMonth() + 1).toString().padStart(2, '0')}`;
+    case 'ALL_TIME':
+    default:
+      return 'all';
+  }
+}
+
+/**
+ * 获取周数与所属的周年（ISO 8601）
+ * 周年为该周星期四所在的年份，年初 / 年末的几天可能与日历年不同
+ */
+export function getWeekNumber(date: Date): { year: number; week: number } {
+  const d = new Date(Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()));
+  const dayNum = d.getUTCDay() || 7;
+  d.setUTCDate(d.getUTCDate() + 4 - dayNum);
+  const yearStart = new Date(Date.UTC(d.getUTCFullYear(), 0, 1));
+  const week = Math.ceil(((d.getTime() - yearStart.getTime()) / 86400000 + 1) / 7);
+  return { year: d.getUTCFullYear(), week };
+}
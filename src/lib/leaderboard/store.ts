@@ -0,0 +1,309 @@
+/**
+ * 排行榜存储
+ *
+ * Leaderboard 表是数据来源；每个 (类型, 周期) 在 Redis 中有一个 ZSET 作为排序索引：
+ * - 写入：一条 SQL 同时 upsert 四个榜单（取较高分），再对已加载的 ZSET 执行 ZADD GT
+ * - 读取：ZREVRANGE 取前 K 名、ZREVRANK 取用户名次，均为 O(log n)；ZSET 不存在时从表中重建
+ *   （写入临时 key 后 RENAME，再补写重建期间更新过的分数）
+ * - 周期榜 key 带 TTL，周期结束后自动过期
+ * - rank 列由后台任务 syncLeaderboardRanks 定期按 ZSET 顺序回写
+ * Redis 不可用时退化为直接查表
+ */
+
+import { randomUUID } from 'crypto';
+import { Prisma } from '@prisma/client';
+import { prisma } from '@/lib/prisma';
+import { redis } from '@/lib/redis';
+import type { LeaderboardType } from '@/types/api';
+import { LEADERBOARD_TTL_SECONDS, LEADERBOARD_TYPES, getPeriod } from './period';
+
+const KEY_PREFIX = 'leaderboard:';
+
+/** 重建 ZSET / 回写 rank 时每批处理的条数 */
+const BATCH_SIZE = 1000;
+
+/**
+ * 重建后补写的时间余量（毫秒）：updatedAt 取自写入事务开始时的 NOW()，
+ * 快照开始前已开始、之后才提交的写入也要覆盖到
+ */
+const REBUILD_CATCH_UP_SLACK_MS = 10_000;
+
+/**
+ * 仅当 ZSET 已加载时才写入，避免把只有一名用户的 ZSET 当成完整榜单；
+ * 未加载的榜单在下次读取时从表中整体重建
+ * KEYS[1] = 榜单 key，ARGV = [分数, 用户 ID, TTL 秒（0 表示不过期）]
+ */
+const ZADD_IF_LOADED_SCRIPT = `
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+redis.call('ZADD', KEYS[1], 'GT', ARGV[1], ARGV[2])
+if tonumber(ARGV[3]) > 0 then
+  redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+`;
+
+const USER_SELECT = {
+  id: true,
+  username: true,
+  avatar: true,
+  isGuest: true,
+} as const;
+
+export function leaderboardKey(type: LeaderboardType, period: string): string {
+  return `${KEY_PREFIX}${type}:${period}`;
+}
+
+function isRedisReady(): boolean {
+  return redis.status === 'ready';
+}
+
+/**
+ * 从表中重建 ZSET（整体替换）
+ *
+ * 先写入临时 key 再 RENAME 覆盖；读取快照到 RENAME 之间写入的分数可能被旧快照覆盖
+ * （或因 ZSET 尚未加载而被跳过），所以最后按 updatedAt 取出重建期间更新过的行，用 ZADD GT 补写
+ */
+async function loadBoard(type: LeaderboardType, period: string): Promise<void> {
+  const key = leaderboardKey(type, period);
+  const tempKey = `${key}:rebuild:${randomUUID()}`;
+  const ttl = LEADERBOARD_TTL_SECONDS[type];
+
+  const [{ now: startedAt }] = await prisma.$queryRaw<{ now: Date }[]>`SELECT NOW() AS now`;
+  const rows = await prisma.leaderboard.findMany({
+    where: { type, period },
+    select: { userId: true, score: true },
+  });
+
+  const multi = redis.multi();
+  for (let i = 0; i < rows.length; i += BATCH_SIZE) {
+    const args: (string | number)[] = [];
+    for (const row of rows.slice(i, i + BATCH_SIZE)) args.push(row.score, row.userId);
+    multi.zadd(tempKey, ...args);
+  }
+  if (rows.length > 0) {
+    multi.rename(tempKey, key);
+    if (ttl) multi.expire(key, ttl);
+  } else {
+    multi.del(key);
+  }
+  await multi.exec();
+
+  const recent = await prisma.leaderboard.findMany({
+    where: {
+      type,
+      period,
+      updatedAt: { gte: new Date(startedAt.getTime() - REBUILD_CATCH_UP_SLACK_MS) },
+    },
+    select: { userId: true, score: true },
+  });
+  if (recent.length === 0) return;
+
+  const catchUp = redis.multi();
+  for (let i = 0; i < recent.length; i += BATCH_SIZE) {
+    const args: (string | number)[] = [];
+    for (const row of recent.slice(i, i + BATCH_SIZE)) args.push(row.score, row.userId);
+    catchUp.zadd(key, 'GT', ...args);
+  }
+  if (ttl) catchUp.expire(key, ttl);
+  await catchUp.exec();
+}
+
+/**
+ * 确保 ZSET 已加载
+ */
+async function ensureBoard(type: LeaderboardType, period: string): Promise<void> {
+  if ((await redis.exists(leaderboardKey(type, period))) === 0) {
+    await loadBoard(type, period);
+  }
+}
+
+/**
+ * 记录一局得分：四个榜单各保留该用户在本周期的最高分
+ */
+export async function recordLeaderboardScore(
+  userId: string,
+  score: number,
+  now: Date = new Date()
+): Promise<void> {
+  const boards = LEADERBOARD_TYPES.map((type) => ({ type, period: getPeriod(type, now) }));
+
+  const values = Prisma.join(
+    boards.map(
+      (b) => Prisma.sql`(
+        ${randomUUID()}, ${userId}, ${b.type}::"LeaderboardType", ${score}, 0, ${b.period}, NOW()
+      )`
+    )
+  );
+  await prisma.$executeRaw`
+    INSERT INTO "Leaderboard" AS l (id, "userId", type, score, rank, period, "updatedAt")
+    VALUES ${values}
+    ON CONFLICT ("userId", type, period) DO UPDATE
+      SET score = EXCLUDED.score, "updatedAt" = NOW()
+      WHERE EXCLUDED.score > l.score
+  `;
+
+  if (!isRedisReady()) return;
+  try {
+    const pipeline = redis.pipeline();
+    for (const b of boards) {
+      pipeline.eval(
+        ZADD_IF_LOADED_SCRIPT,
+        1,
+        leaderboardKey(b.type, b.period),
+        score,
+        userId,
+        LEADERBOARD_TTL_SECONDS[b.type] ?? 0
+      );
+    }
+    await pipeline.exec();
+  } catch (error) {
+    // 表已写入；ZSET 的缺失由 syncLeaderboardRanks 对账时补齐
+    console.error('排行榜 ZSET 更新失败:', error);
+  }
+}
+
+/**
+ * 按 userId 顺序取出榜单记录（附带用户信息），rank 为 1 起的名次
+ */
+async function loadEntries(
+  type: LeaderboardType,
+  period: string,
+  userIds: string[],
+  firstRank: number
+) {
+  if (userIds.length === 0) return [];
+  const entries = await prisma.leaderboard.findMany({
+    where: { type, period, userId: { in: userIds } },
+    include: { user: { select: USER_SELECT } },
+  });
+  const byUser = new Map(entries.map((e) => [e.userId, e]));
+  return userIds.flatMap((userId, index) => {
+    const entry = byUser.get(userId);
+    return entry ? [{ ...entry, rank: firstRank + index }] : [];
+  });
+}
+
+/**
+ * 获取前 limit 名
+ */
+export async function getLeaderboardTop(type: LeaderboardType, period: string, limit: number) {
+  if (isRedisReady()) {
+    try {
+      await ensureBoard(type, period);
+      const userIds = await redis.zrevrange(leaderboardKey(type, period), 0, limit - 1);
+      return await loadEntries(type, period, userIds, 1);
+    } catch (error) {
+      console.error('读取排行榜 ZSET 失败，改为查表:', error);
+    }
+  }
+
+  const leaderboard = await prisma.leaderboard.findMany({
+    where: { type, period },
+    orderBy: { score: 'desc' },
+    take: limit,
+    include: { user: { select: USER_SELECT } },
+  });
+  return leaderboard.map((entry, index) => ({ ...entry, rank: index + 1 }));
+}
+
+/**
+ * 获取用户在榜单中的记录与名次（未上榜返回 null）
+ */
+export async function getLeaderboardUserRank(
+  type: LeaderboardType,
+  period: string,
+  userId: string
+) {
+  const userEntry = await prisma.leaderboard.findUnique({
+    where: { userId_type_period: { userId, type, period } },
+    include: { user: { select: USER_SELECT } },
+  });
+  if (!userEntry) return null;
+
+  if (isRedisReady()) {
+    try {
+      await ensureBoard(type, period);
+      const rank = await redis.zrevrank(leaderboardKey(type, period), userId);
+      if (rank !== null) return { ...userEntry, rank: rank + 1 };
+    } catch (error) {
+      console.error('读取排行榜名次失败，改为查表:', error);
+    }
+  }
+
+  const betterScores = await prisma.leaderboard.count({
+    where: { type, period, score: { gt: userEntry.score } },
+  });
+  return { ...userEntry, rank: betterScores + 1 };
+}
+
+/**
+ * 批量回写 rank 列（只更新发生变化的行）
+ */
+async function writeRanks(
+  type: LeaderboardType,
+  period: string,
+  userIds: string[],
+  firstRank: number
+): Promise<number> {
+  const values = Prisma.join(
+    userIds.map((userId, i) => Prisma.sql`(${userId}, ${firstRank + i})`)
+  );
+  return prisma.$executeRaw`
+    UPDATE "Leaderboard" AS l
+    SET rank = v.rank::integer
+    FROM (VALUES ${values}) AS v("userId", rank)
+    WHERE l.type = ${type}::"LeaderboardType" AND l.period = ${period}
+      AND l."userId" = v."userId" AND l.rank <> v.rank::integer
+  `;
+}
+
+/**
+ * 把某个榜单的名次回写到 Leaderboard.rank，返回更新的行数
+ * 同分时按 userId 倒序，与 ZREVRANGE 的顺序一致
+ */
+export async function syncLeaderboardRanks(type: LeaderboardType, period: string): Promise<number> {
+  if (!isRedisReady()) {
+    return prisma.$executeRaw`
+      UPDATE "Leaderboard" AS l
+      SET rank = r.rank::integer
+      FROM (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY score DESC, "userId" DESC) AS rank
+        FROM "Leaderboard"
+        WHERE type = ${type}::"LeaderboardType" AND period = ${period}
+      ) AS r
+      WHERE l.id = r.id AND l.rank <> r.rank
+    `;
+  }
+
+  // 对账：ZSET 条数与表不一致（写 ZSET 失败）则整体重建；重建期间的并发写入由 loadBoard 补写
+  const key = leaderboardKey(type, period);
+  const [size, count] = await Promise.all([
+    redis.zcard(key),
+    prisma.leaderboard.count({ where: { type, period } }),
+  ]);
+  if (size !== count) {
+    await loadBoard(type, period);
+  }
+
+  let updated = 0;
+  for (let start = 0; start < count; start += BATCH_SIZE) {
+    const userIds = await redis.zrevrange(key, start, start + BATCH_SIZE - 1);
+    if (userIds.length === 0) break;
+    updated += await writeRanks(type, period, userIds, start + 1);
+  }
+  return updated;
+}
+
+/**
+ * 回写全部榜单当前周期的名次（后台任务入口）
+ */
+export async function syncAllLeaderboardRanks(now: Date = new Date()) {
+  const results: { type: LeaderboardType; period: string; updated: number }[] = [];
+  for (const type of LEADERBOARD_TYPES) {
+    const period = getPeriod(type, now);
+    results.push({ type, period, updated: await syncLeaderboardRanks(type, period) });
+  }
+  return results;
+}
@@ -182,6 +182,22 @@ export async function zjhCompare(userId: string, gameId: string, targetUserId: s
   return parseJson<Record<string, unknown>>(res);
 }
 
+/**
+ * 打开实时推送流（SSE）
+ * 使用 fetch 而非 EventSource，以便携带 Authorization 头
+ */
+export async function zjhOpenEventStream(
+  params: { userId: string; roomId?: string | null; gameId?: string | null },
+  signal: AbortSignal
+) {
+  const query = new URLSearchParams({ userId: params.userId });
+  if (params.roomId) query.set('roomId', params.roomId);
+  if (params.gameId) query.set('gameId', params.gameId);
+  const headers = authHeaders();
+  headers['Accept'] = 'text/event-stream';
+  return fetch(`/api/zjh/events?${query.toString()}`, { headers, signal, cache: 'no-store' });
+}
+
 export async function zjhFetchGameResult(gameId: string) {
   const res = await fetch(`/api/zjh/games/${encodeURIComponent(gameId)}/result`, {
     headers: authHeaders(),
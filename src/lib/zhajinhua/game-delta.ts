@@ -0,0 +1,47 @@
+/**
+ * 将服务端推送的牌局增量合并进前端状态
+ * 增量不含手牌，已知的手牌/牌型信息保持不变
+ */
+
+import type { GameStateResponse, RoomInfo, ZjhGameDelta } from '@/types/zjh';
+
+/** 最近操作保留条数（与 GET /api/zjh/games/:gameId 一致） */
+const RECENT_ACTIONS_LIMIT = 10;
+
+/**
+ * 合并牌局增量
+ */
+export function applyGameDelta(state: GameStateResponse, delta: ZjhGameDelta): GameStateResponse {
+  const deltaPlayers = new Map(delta.players.map((p) => [p.userId, p]));
+  const recentActions = delta.lastAction
+    ? [delta.lastAction, ...state.recentActions].slice(0, RECENT_ACTIONS_LIMIT)
+    : state.recentActions;
+
+  return {
+    ...state,
+    status: delta.status,
+    pot: delta.pot,
+    currentAnte: delta.currentAnte,
+    currentRound: delta.currentRound,
+    currentTurn: delta.currentTurn,
+    players: state.players.map((p) => {
+      const d = deltaPlayers.get(p.userId);
+      return d ? { ...p, status: d.status, hasLooked: d.hasLooked, totalBet: d.totalBet } : p;
+    }),
+    recentActions,
+  };
+}
+
+/**
+ * 用牌局增量中的筹码更新房间玩家筹码
+ */
+export function applyDeltaChips(room: RoomInfo, delta: ZjhGameDelta): RoomInfo {
+  const chips = new Map(delta.players.map((p) => [p.userId, p.chips]));
+  return {
+    ...room,
+    players: room.players.map((p) => {
+      const c = chips.get(p.userId);
+      return c === undefined ? p : { ...p, chips: c };
+    }),
+  };
+}
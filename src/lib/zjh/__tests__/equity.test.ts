@@ -0,0 +1,105 @@
+/**
+ * 胜率模拟与机器人期望收益决策测试
+ */
+
+import { describe, it, expect } from 'vitest';
+
+import { decideBotBetting } from '../bot-ai';
+import { createDeck } from '../deck';
+import { estimateEquity, getCachedEquity } from '../equity/estimate';
+import { simulateEquity } from '../equity/simulate';
+import { compareHands } from '../hand-evaluator';
+import type { Card } from '@/types/zjh';
+
+// 测试中不启动 worker 线程，估算在当前线程完成
+process.env.ZJH_EQUITY_WORKERS = '0';
+
+const deck = createDeck();
+
+/** 'As Kh 9d' → 手牌 */
+function parseHand(text: string): Card[] {
+  return text.split(' ').map((token) => {
+    const card = deck.find((c) => `${c.rank}${c.suit[0]}` === token);
+    if (!card) throw new Error(`无效的牌 ${token}`);
+    return card;
+  });
+}
+
+/** 穷举单个对手的全部手牌，计算精确胜率 */
+function exactHeadsUpEquity(hand: Card[]): number {
+  const rest = deck.filter((c) => !hand.includes(c));
+  let share = 0;
+  let count = 0;
+  for (let i = 0; i < rest.length; i++) {
+    for (let j = i + 1; j < rest.length; j++) {
+      for (let k = j + 1; k < rest.length; k++) {
+        const cmp = compareHands(hand, [rest[i], rest[j], rest[k]]);
+        share += cmp > 0 ? 1 : cmp === 0 ? 0.5 : 0;
+        count++;
+      }
+    }
+  }
+  return share / count;
+}
+
+describe('simulateEquity', () => {
+  it.each(['As Ah Ad', 'Qh Qs 9d', 'Ah Kd 9c', '2h 3s 5d', '7h 4s 2d'])(
+    '%s 单挑胜率与穷举结果一致',
+    (text) => {
+      const hand = parseHand(text);
+      expect(simulateEquity(hand, 1, 100000, 42)).toBeCloseTo(exactHeadsUpEquity(hand), 2);
+    }
+  );
+
+  it('相同种子结果可复现', () => {
+    const hand = parseHand('Ah Kd 9c');
+    expect(simulateEquity(hand, 3, 5000, 7)).toBe(simulateEquity(hand, 3, 5000, 7));
+  });
+
+  it('对手越多胜率越低', () => {
+    const hand = parseHand('Qh Qs 9d');
+    const equities = [1, 2, 3, 4, 5].map((n) => simulateEquity(hand, n, 20000, 99));
+    for (let i = 1; i < equities.length; i++) {
+      expect(equities[i]).toBeLessThan(equities[i - 1]);
+    }
+  });
+});
+
+describe('estimateEquity', () => {
+  it('结果写入缓存，再次估算直接命中', async () => {
+    const hand = parseHand('Js Jh 4c');
+    expect(getCachedEquity(hand, 2)).toBeUndefined();
+    const equity = await estimateEquity(hand, 2, 1000);
+    expect(getCachedEquity(hand, 2)).toBe(equity);
+    // 牌的顺序不影响缓存键
+    expect(await estimateEquity([hand[2], hand[0], hand[1]], 2, 1000)).toBe(equity);
+  });
+});
+
+describe('decideBotBetting', () => {
+  const base = { pot: 60, currentAnte: 10, currentChips: 1000, opponents: 2, hasLooked: true };
+
+  it('胜率很低时弃牌', () => {
+    expect(decideBotBetting({ ...base, equity: 0.02 })).toEqual({ action: 'FOLD' });
+  });
+
+  it('胜率中等时跟注', () => {
+    expect(decideBotBetting({ ...base, equity: 0.45 }).action).toBe('CALL');
+  });
+
+  it('强牌加注，加注额在规则范围内', () => {
+    const decision = decideBotBetting({ ...base, equity: 0.8 });
+    expect(decision.action).toBe('RAISE');
+    expect(decision.amount).toBeGreaterThanOrEqual(20);
+    expect(decision.amount).toBeLessThanOrEqual(40);
+  });
+
+  it('几乎必胜时全押', () => {
+    expect(decideBotBetting({ ...base, equity: 0.995 })).toEqual({ action: 'ALL_IN' });
+  });
+
+  it('筹码不足以跟注时只在全押与弃牌之间选择', () => {
+    const decision = decideBotBetting({ ...base, currentChips: 15, equity: 0.6 });
+    expect(['ALL_IN', 'FOLD']).toContain(decision.action);
+  });
+});
@@ -0,0 +1,116 @@
+/**
+ * 实时事件订阅测试（Redis 订阅连接用内存假连接代替）
+ */
+
+import { describe, it, expect, vi } from 'vitest';
+import { EventEmitter } from 'events';
+
+import type { ZjhRoomEvent } from '@/types/zjh';
+
+/**
+ * 模拟 ioredis 的离线队列：未就绪时，禁用离线队列的连接直接拒绝命令，启用的则排队到就绪后执行
+ */
+const { FakeRedis } = vi.hoisted(() => {
+  class FakeRedis extends EventEmitter {
+    status = 'connecting';
+    subscribed = new Set<string>();
+    failNextSubscribe = false;
+    private queue: (() => void)[] = [];
+    duplicates: FakeRedis[] = [];
+    private options: { enableOfflineQueue?: boolean };
+
+    constructor(options: { enableOfflineQueue?: boolean } = {}) {
+      super();
+      this.options = options;
+    }
+
+    duplicate(override: { enableOfflineQueue?: boolean } = {}): FakeRedis {
+      const copy = new FakeRedis({ ...this.options, ...override });
+      this.duplicates.push(copy);
+      return copy;
+    }
+
+    subscribe(...channels: string[]): Promise<number> {
+      if (this.failNextSubscribe) {
+        this.failNextSubscribe = false;
+        return Promise.reject(new Error('Connection is closed.'));
+      }
+      const run = () => channels.forEach((channel) => this.subscribed.add(channel));
+      if (this.status === 'ready') {
+        run();
+        return Promise.resolve(this.subscribed.size);
+      }
+      if (!this.options.enableOfflineQueue) {
+        return Promise.reject(new Error("Stream isn't writeable and enableOfflineQueue options is false"));
+      }
+      return new Promise((resolve) => {
+        this.queue.push(() => {
+          run();
+          resolve(this.subscribed.size);
+        });
+      });
+    }
+
+    unsubscribe(...channels: string[]): Promise<number> {
+      channels.forEach((channel) => this.subscribed.delete(channel));
+      return Promise.resolve(this.subscribed.size);
+    }
+
+    /** 连接（重新）就绪：先执行排队的命令，再触发 ready */
+    becomeReady(): void {
+      this.status = 'ready';
+      this.queue.splice(0).forEach((run) => run());
+      this.emit('ready');
+    }
+  }
+  return { FakeRedis };
+});
+
+const { redis } = vi.hoisted(() => ({ redis: new FakeRedis({ enableOfflineQueue: false }) }));
+
+vi.mock('@/lib/redis', () => ({ redis }));
+vi.mock('@/lib/prisma', () => ({ prisma: {} }));
+
+import { roomChannel, subscribe } from '../events';
+
+function subscriber(): InstanceType<typeof FakeRedis> {
+  expect(redis.duplicates.length).toBe(1);
+  return redis.duplicates[0];
+}
+
+const flush = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+describe('subscribe', () => {
+  it('订阅连接未就绪时先订阅，就绪后仍能收到事件', async () => {
+    const received: unknown[] = [];
+    const channel = roomChannel('before-ready');
+    subscribe(channel, (event) => received.push(event));
+
+    const sub = subscriber();
+    expect(sub.status).toBe('connecting');
+    sub.becomeReady();
+    await flush();
+    expect(sub.subscribed.has(channel)).toBe(true);
+
+    const event: ZjhRoomEvent = { type: 'room', roomId: 'before-ready' };
+    sub.emit('message', channel, JSON.stringify(event));
+    expect(received).toEqual([event]);
+  });
+
+  it('SUBSCRIBE 失败的频道在连接重新就绪后补订阅', async () => {
+    const sub = subscriber();
+    const channel = roomChannel('retry');
+    sub.failNextSubscribe = true;
+    const unsubscribe = subscribe(channel, () => {});
+    await flush();
+    expect(sub.subscribed.has(channel)).toBe(false);
+
+    sub.becomeReady();
+    await flush();
+    expect(sub.subscribed.has(channel)).toBe(true);
+
+    unsubscribe();
+    await flush();
+    expect(sub.subscribed.has(channel)).toBe(false);
+  });
+});
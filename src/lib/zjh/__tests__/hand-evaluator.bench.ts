@@ -0,0 +1,41 @@
+/**
+ * 牌型评估微基准：查表 vs 逐张计算
+ * 运行：npm run bench
+ */
+
+import { bench, describe } from 'vitest';
+
+import { createDeck } from '../deck';
+import {
+  compareHands,
+  compareHandsReference,
+  evaluateHand,
+  evaluateHandReference,
+} from '../hand-evaluator';
+import type { Card } from '@/types/zjh';
+
+const deck = createDeck();
+const hands: Card[][] = [];
+for (let n = 0; n < 4096; n++) {
+  const picked = new Set<number>();
+  while (picked.size < 3) picked.add(Math.floor(Math.random() * deck.length));
+  hands.push([...picked].map((i) => deck[i]));
+}
+
+describe('evaluateHand', () => {
+  bench('查表', () => {
+    for (const hand of hands) evaluateHand(hand);
+  });
+  bench('参考实现', () => {
+    for (const hand of hands) evaluateHandReference(hand);
+  });
+});
+
+describe('compareHands', () => {
+  bench('查表', () => {
+    for (let i = 1; i < hands.length; i++) compareHands(hands[i - 1], hands[i]);
+  });
+  bench('参考实现', () => {
+    for (let i = 1; i < hands.length; i++) compareHandsReference(hands[i - 1], hands[i]);
+  });
+});
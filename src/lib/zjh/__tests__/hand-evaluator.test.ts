@@ -0,0 +1,97 @@
+/**
+ * 查表牌型评估测试
+ * 穷举全部 22100 种三张牌组合，验证查表结果与逐张计算的参考实现完全一致
+ */
+
+import fc from 'fast-check';
+import { describe, it, expect } from 'vitest';
+
+import { createDeck } from '../deck';
+import {
+  compareHands,
+  compareHandsReference,
+  evaluateHand,
+  evaluateHandReference,
+} from '../hand-evaluator';
+import { HAND_COUNT, decodeCard, encodeCard, handIndexOf, is235At } from '../hand-table';
+import type { Card } from '@/types/zjh';
+
+const deck = createDeck();
+
+const allHands: Card[][] = [];
+for (let i = 0; i < deck.length; i++) {
+  for (let j = i + 1; j < deck.length; j++) {
+    for (let k = j + 1; k < deck.length; k++) {
+      allHands.push([deck[i], deck[j], deck[k]]);
+    }
+  }
+}
+
+const handArb = fc
+  .uniqueArray(fc.integer({ min: 0, max: 51 }), { minLength: 3, maxLength: 3 })
+  .map((idx) => idx.map((i) => deck[i]));
+
+describe('hand-table', () => {
+  it('牌编码可逆', () => {
+    for (const card of deck) {
+      expect(decodeCard(encodeCard(card))).toEqual(card);
+    }
+  });
+
+  it('组合下标是 0..22099 的双射，且与牌的顺序无关', () => {
+    expect(allHands.length).toBe(HAND_COUNT);
+    const seen = new Uint8Array(HAND_COUNT);
+    for (const hand of allHands) {
+      const index = handIndexOf(hand);
+      expect(index).toBeGreaterThanOrEqual(0);
+      expect(index).toBeLessThan(HAND_COUNT);
+      expect(seen[index]).toBe(0);
+      seen[index] = 1;
+      expect(handIndexOf([hand[2], hand[0], hand[1]])).toBe(index);
+    }
+  });
+});
+
+describe('evaluateHand', () => {
+  it('穷举：查表结果与参考实现一致', () => {
+    for (const hand of allHands) {
+      expect(evaluateHand(hand)).toEqual(evaluateHandReference(hand));
+    }
+  });
+
+  it('235 标记只出现在非同花的 2、3、5', () => {
+    let count = 0;
+    for (const hand of allHands) {
+      if (!is235At(handIndexOf(hand))) continue;
+      count++;
+      expect(hand.map((c) => c.rank).sort()).toEqual(['2', '3', '5']);
+      expect(evaluateHand(hand).handType).toBe('HIGH_CARD');
+    }
+    // 4^3 种花色组合去掉 4 种同花
+    expect(count).toBe(60);
+  });
+});
+
+describe('compareHands', () => {
+  it('随机牌对：查表比较与参考实现一致', () => {
+    fc.assert(
+      fc.property(handArb, handArb, (h1, h2) => {
+        expect(Math.sign(compareHands(h1, h2))).toBe(Math.sign(compareHandsReference(h1, h2)));
+        expect(compareHands(h1, h2)).toBe(compareHandsReference(h1, h2));
+      }),
+      { numRuns: 20000 }
+    );
+  });
+
+  it('235 对全部豹子均与参考实现一致', () => {
+    const specials = allHands.filter((h) => is235At(handIndexOf(h)));
+    const triples = allHands.filter((h) => evaluateHand(h).handType === 'TRIPLE');
+    for (const a of specials) {
+      for (const b of triples) {
+        expect(compareHands(a, b)).toBe(compareHandsReference(a, b));
+        expect(compareHands(b, a)).toBe(compareHandsReference(b, a));
+        expect(compareHands(a, b)).toBeGreaterThan(0);
+      }
+    }
+  });
+});
@@ -0,0 +1,144 @@
+/**
+ * 快速匹配规则测试
+ */
+
+import { describe, it, expect } from 'vitest';
+import fc from 'fast-check';
+
+import {
+  MATCH_TIERS,
+  assignClaimedSeats,
+  claimTiers,
+  freeSeats,
+  groupByUser,
+  isMatchTier,
+  splitIntoTables,
+  tierForChips,
+} from '../matchmaking/plan';
+import { DEFAULT_ROOM_CONFIG, INITIAL_CHIPS } from '../constants';
+
+describe('tierForChips', () => {
+  it('取不超过筹码的最高一档', () => {
+    expect(tierForChips(100)).toBe(100);
+    expect(tierForChips(999)).toBe(100);
+    expect(tierForChips(10_000)).toBe(10_000);
+    expect(tierForChips(5_000_000)).toBe(100_000);
+  });
+
+  it('筹码低于最低档时归入最低档', () => {
+    expect(tierForChips(0)).toBe(MATCH_TIERS[0]);
+    expect(tierForChips(99)).toBe(MATCH_TIERS[0]);
+  });
+
+  it('结果总是合法档位，且不随筹码增加而降档', () => {
+    fc.assert(
+      fc.property(fc.nat(1_000_000), fc.nat(1_000_000), (a, b) => {
+        const [low, high] = a <= b ? [a, b] : [b, a];
+        expect(isMatchTier(tierForChips(low))).toBe(true);
+        expect(tierForChips(low)).toBeLessThanOrEqual(tierForChips(high));
+      })
+    );
+  });
+});
+
+describe('claimTiers', () => {
+  it('先本档位，再从高到低回落到更低档位', () => {
+    expect(claimTiers(10_000)).toEqual([10_000, 1_000, 100]);
+    expect(claimTiers(100_000)).toEqual([100_000, 10_000, 1_000, 100]);
+    expect(claimTiers(100)).toEqual([100]);
+  });
+
+  it('初始筹码的新玩家也能匹配到默认 100 档的自建房', () => {
+    expect(claimTiers(tierForChips(INITIAL_CHIPS))).toContain(DEFAULT_ROOM_CONFIG.minChips);
+  });
+
+  it('只回落到筹码满足入场要求的档位', () => {
+    fc.assert(
+      fc.property(fc.nat(1_000_000), (chips) => {
+        const tiers = claimTiers(tierForChips(chips));
+        expect(tiers[0]).toBe(tierForChips(chips));
+        expect(tiers.every((t) => t <= Math.max(chips, MATCH_TIERS[0]))).toBe(true);
+        expect(tiers.every((t, i) => i === 0 || t < tiers[i - 1])).toBe(true);
+      })
+    );
+  });
+});
+
+describe('splitIntoTables', () => {
+  it('先凑满整桌，余下的人坐最后一桌', () => {
+    expect(splitIntoTables(0, 6)).toEqual([]);
+    expect(splitIntoTables(5, 6)).toEqual([5]);
+    expect(splitIntoTables(12, 6)).toEqual([6, 6]);
+    expect(splitIntoTables(14, 6)).toEqual([6, 6, 2]);
+  });
+
+  it('人数守恒，至多一桌未坐满', () => {
+    fc.assert(
+      fc.property(fc.nat(200), fc.integer({ min: 2, max: 9 }), (count, maxPlayers) => {
+        const tables = splitIntoTables(count, maxPlayers);
+        expect(tables.reduce((sum, size) => sum + size, 0)).toBe(count);
+        expect(tables.every((size) => size >= 1 && size <= maxPlayers)).toBe(true);
+        expect(tables.filter((size) => size < maxPlayers).length).toBeLessThanOrEqual(1);
+        expect(tables.length).toBe(Math.ceil(count / maxPlayers));
+      })
+    );
+  });
+});
+
+describe('freeSeats', () => {
+  it('排除已有记录的座位（含已离开的玩家）', () => {
+    expect(freeSeats([], 6)).toEqual([0, 1, 2, 3, 4, 5]);
+    expect(freeSeats([0, 2, 5], 6)).toEqual([1, 3, 4]);
+    expect(freeSeats([0, 1], 2)).toEqual([]);
+  });
+});
+
+describe('groupByUser', () => {
+  it('同一用户的重复请求合并，保持首次到达顺序', () => {
+    const groups = groupByUser([
+      { userId: 'b', n: 1 },
+      { userId: 'a', n: 2 },
+      { userId: 'b', n: 3 },
+    ]);
+    expect(groups.map((g) => g.map((r) => r.n))).toEqual([[1, 3], [2]]);
+  });
+});
+
+describe('assignClaimedSeats', () => {
+  it('曾在房间坐过的玩家（换桌后再匹配）不入座，座位留给其他人', () => {
+    const waiting = [{ userId: 'returning' }, { userId: 'a' }, { userId: 'b' }];
+    const result = assignClaimedSeats(waiting, [3, 4], new Set(['returning']));
+    expect(result.seated.map((p) => p.userId)).toEqual(['a', 'b']);
+    expect(result.waiting.map((p) => p.userId)).toEqual(['returning']);
+    expect(result.unusedSeats).toEqual([]);
+  });
+
+  it('可入座的人不够时归还多余座位', () => {
+    const result = assignClaimedSeats(
+      [{ userId: 'returning' }, { userId: 'a' }],
+      [1, 2, 5],
+      new Set(['returning'])
+    );
+    expect(result.seated.map((p) => p.userId)).toEqual(['a']);
+    expect(result.waiting.map((p) => p.userId)).toEqual(['returning']);
+    expect(result.unusedSeats).toEqual([2, 5]);
+  });
+
+  it('入座人数不超过座位数，玩家不重不漏', () => {
+    fc.assert(
+      fc.property(
+        fc.array(fc.boolean(), { maxLength: 12 }),
+        fc.integer({ min: 1, max: 6 }),
+        (returning, seatCount) => {
+          const waiting = returning.map((_, i) => ({ userId: `u${i}` }));
+          const past = new Set(waiting.filter((_, i) => returning[i]).map((p) => p.userId));
+          const seats = Array.from({ length: seatCount }, (_, i) => i);
+          const result = assignClaimedSeats(waiting, seats, past);
+          expect(result.seated.length + result.unusedSeats.length).toBe(seatCount);
+          expect(result.seated.every((p) => !past.has(p.userId))).toBe(true);
+          expect(result.seated.length + result.waiting.length).toBe(waiting.length);
+        }
+      )
+    );
+  });
+});
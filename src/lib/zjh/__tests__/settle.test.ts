@@ -0,0 +1,51 @@
+/**
+ * 结算计算测试
+ */
+
+import { describe, it, expect } from 'vitest';
+
+import { buildSettlementRows } from '../settle';
+import type { Card } from '@/types/zjh';
+
+const hands: Card[][] = [
+  [
+    { suit: 'spade', rank: 'A' },
+    { suit: 'heart', rank: 'A' },
+    { suit: 'club', rank: 'A' },
+  ],
+  [
+    { suit: 'spade', rank: '7' },
+    { suit: 'heart', rank: '4' },
+    { suit: 'diamond', rank: '2' },
+  ],
+  [
+    { suit: 'heart', rank: 'Q' },
+    { suit: 'spade', rank: 'Q' },
+    { suit: 'diamond', rank: '9' },
+  ],
+];
+
+const players = [
+  { id: 'gp0', userId: 'u0', hand: hands[0], totalBet: 60, chipsBeforeGame: 1000 },
+  { id: 'gp1', userId: 'u1', hand: hands[1], totalBet: 20, chipsBeforeGame: 500 },
+  { id: 'gp2', userId: 'u2', hand: hands[2], totalBet: 80, chipsBeforeGame: 50 },
+];
+
+describe('buildSettlementRows', () => {
+  it('赢家获得奖池减去自身下注，其余玩家损失各自下注', () => {
+    const rows = buildSettlementRows(players, 'u0', 160);
+    expect(rows.map((r) => r.chipsChange)).toEqual([100, -20, -80]);
+    expect(rows.map((r) => r.isWinner)).toEqual([true, false, false]);
+    expect(rows.reduce((sum, r) => sum + r.chipsChange, 0)).toBe(0);
+  });
+
+  it('结算后筹码不小于 0', () => {
+    const rows = buildSettlementRows(players, 'u0', 160);
+    expect(rows.map((r) => r.finalChips)).toEqual([1100, 480, 0]);
+  });
+
+  it('记录每位玩家的牌型', () => {
+    const rows = buildSettlementRows(players, 'u1', 160);
+    expect(rows.map((r) => r.handType)).toEqual(['TRIPLE', 'HIGH_CARD', 'PAIR']);
+  });
+});
@@ -0,0 +1,102 @@
+/**
+ * 内存牌桌属性测试
+ * 验证操作日志回放可以精确重建牌桌状态
+ */
+
+import fc from 'fast-check';
+import { describe, it, expect } from 'vitest';
+
+import { createShuffledDeck, dealCards } from '../deck';
+import {
+  applyBettingToTable,
+  applyCompareToTable,
+  applyLookToTable,
+  replayTable,
+} from '../live/table-state';
+import type { LiveTable } from '../live/table-state';
+
+function createInitial(playerCount: number, dealerIndex: number, maxRounds: number) {
+  const hands = dealCards(createShuffledDeck(), playerCount);
+  return {
+    gameId: 'game',
+    roomId: 'room',
+    dealerIndex,
+    baseAnte: 10,
+    maxRounds,
+    players: hands.map((hand, i) => ({
+      id: `gp${i}`,
+      userId: `u${i}`,
+      seatIndex: i,
+      status: 'PLAYING' as const,
+      hand,
+      handType: null,
+      handRank: null,
+      hasLooked: false,
+      totalBet: 0,
+      chipsBeforeGame: 200 + i * 150,
+      chips: 0,
+    })),
+  };
+}
+
+/** 按随机选择执行一步操作（非法操作会被拒绝，不影响状态） */
+function step(table: LiveTable, choice: number, pick: number): void {
+  const userId = table.currentTurn;
+  if (!userId) return;
+
+  if (choice === 0) {
+    applyLookToTable(table, table.players[pick % table.players.length].userId);
+  } else if (choice === 1) {
+    const target = table.players.find(
+      (p) => p.userId !== userId && p.status !== 'FOLDED' && p.status !== 'OUT'
+    );
+    if (target) applyCompareToTable(table, userId, target.userId);
+  } else if (choice === 2) {
+    applyBettingToTable(table, userId, 'RAISE', table.currentAnte * (1 + (pick % 4)));
+  } else if (choice === 3) {
+    applyBettingToTable(table, userId, 'ALL_IN');
+  } else if (choice === 4) {
+    applyBettingToTable(table, userId, 'FOLD');
+  } else {
+    applyBettingToTable(table, userId, 'CALL');
+  }
+}
+
+describe('内存牌桌', () => {
+  it('初始状态：底注计入奖池，庄家下一位先行动', () => {
+    const table = replayTable(createInitial(3, 1, 20), []);
+    expect(table.pot).toBe(30);
+    expect(table.currentTurn).toBe('u2');
+    expect(table.players.every((p) => p.chips === p.chipsBeforeGame - 10)).toBe(true);
+  });
+
+  it('非当前回合玩家不能下注', () => {
+    const table = replayTable(createInitial(3, 0, 20), []);
+    const result = applyBettingToTable(table, 'u0', 'CALL');
+    expect(result).toEqual({ ok: false, error: '不是你的回合' });
+    expect(table.actions).toHaveLength(0);
+  });
+
+  it('属性：回放操作日志得到与实时执行相同的状态', () => {
+    fc.assert(
+      fc.property(
+        fc.integer({ min: 2, max: 6 }),
+        fc.nat(),
+        fc.integer({ min: 2, max: 8 }),
+        fc.array(fc.tuple(fc.integer({ min: 0, max: 8 }), fc.nat()), { maxLength: 60 }),
+        (playerCount, dealer, maxRounds, steps) => {
+          const initial = createInitial(playerCount, dealer % playerCount, maxRounds);
+          const table = replayTable(initial, []);
+          for (const [choice, pick] of steps) {
+            step(table, choice, pick);
+          }
+
+          const rebuilt = replayTable(initial, table.actions);
+          expect({ ...rebuilt, flushedActionCount: 0 }).toEqual({ ...table, flushedActionCount: 0 });
+          expect(table.players.reduce((sum, p) => sum + p.totalBet, 0)).toBe(table.pot);
+        }
+      ),
+      { numRuns: 200 }
+    );
+  });
+});
@@ -1,9 +1,8 @@
 /**
- * 炸金花机器人简单策略：基于牌型权重与随机性
+ * 炸金花机器人策略：按胜率计算各下注选项的期望收益，选择期望最高的一项
  */
 
-import { BET_MULTIPLIER, HAND_TYPE_WEIGHT } from '@/lib/zjh/constants';
-import type { HandType } from '@/types/zjh';
+import { BET_MULTIPLIER } from '@/lib/zjh/constants';
 import type { BettingActionType } from '@/lib/zjh/mutations/apply-betting-action';
 
 export interface BotDecision {
@@ -11,56 +10,91 @@ export interface BotDecision {
   amount?: number;
 }
 
+/** 对手面对最小跟注额时继续跟注的概率；下注越大（相对底池）越低 */
+const OPPONENT_CALL_RATE = 0.8;
+
+/**
+ * 投入 bet 筹码的期望收益（相对弃牌，已投入的筹码视为沉没成本）
+ *
+ * 简化模型：每名对手以 callProb 跟注，全部弃牌时直接赢下底池；
+ * 否则与跟注者摊牌（跟注者各投入与 bet 相同的筹码）。
+ * 肯跟注的是对手中牌力靠前的 callProb 部分，对跟注者的单人胜率按此折算：
+ * max(0, p - (1 - callProb)) / callProb，其中 p 为对单个随机对手的胜率
+ */
+export function expectedValue(params: {
+  bet: number;
+  equity: number;
+  pot: number;
+  callCost: number;
+  opponents: number;
+}): number {
+  const { bet, equity, pot, callCost, opponents } = params;
+  if (opponents <= 0) return pot;
+  const callProb = Math.min(1, (OPPONENT_CALL_RATE * (pot + callCost)) / (pot + bet));
+  const allFold = (1 - callProb) ** opponents;
+  if (allFold >= 1) return pot;
+
+  const expectedCallers = (opponents * callProb) / (1 - allFold);
+  const perOpponent = equity ** (1 / opponents);
+  const vsCaller = Math.max(0, perOpponent - (1 - callProb)) / callProb;
+  const showdownEquity = vsCaller ** expectedCallers;
+  const showdownPot = pot + bet + expectedCallers * bet;
+  return allFold * pot + (1 - allFold) * (showdownEquity * showdownPot - bet);
+}
+
 /**
- * @param handType 已看牌后的牌型
+ * @param equity 当前手牌对剩余对手的胜率（0–1）
+ * @param pot 当前底池
  * @param currentAnte 当前底注
  * @param currentChips 机器人剩余筹码
- * @param hasLooked 必须为 true 才会调用
+ * @param opponents 仍在局中的对手人数
+ * @param hasLooked 未看牌时直接跟注（闷跟）
  */
 export function decideBotBetting(params: {
-  handType: HandType;
+  equity: number;
+  pot: number;
   currentAnte: number;
   currentChips: number;
+  opponents: number;
   hasLooked: boolean;
 }): BotDecision {
-  const { handType, currentAnte, currentChips, hasLooked } = params;
+  const { equity, pot, currentAnte, currentChips, opponents, hasLooked } = params;
   if (!hasLooked) {
     return { action: 'CALL' };
   }
+  if (currentChips <= 0) {
+    return { action: 'FOLD' };
+  }
 
-  const strength = HAND_TYPE_WEIGHT[handType];
-  const minBet = currentAnte * 2;
+  const callCost = currentAnte * 2;
   const maxBet = currentAnte * BET_MULTIPLIER.MAX_RAISE;
-  const r = Math.random();
+  const ev = (bet: number) => expectedValue({ bet, equity, pot, callCost, opponents });
 
-  /** 弱牌：偏高概率弃牌 */
-  if (strength <= 2 && r < 0.32) {
-    return { action: 'FOLD' };
-  }
+  let best: BotDecision = { action: 'FOLD' };
+  let bestEv = 0;
 
-  /** 强牌：加注或全押 */
-  if (strength >= 5) {
-    if (r < 0.4 && currentChips >= minBet) {
-      const amt = r < 0.2 ? maxBet : Math.min(maxBet, Math.max(minBet, Math.round((minBet + maxBet) / 2)));
-      return { action: 'RAISE', amount: amt };
-    }
-    if (r < 0.12 && currentChips > 0) {
-      return { action: 'ALL_IN' };
+  if (currentChips >= callCost) {
+    const callEv = ev(callCost);
+    if (callEv > bestEv) {
+      best = { action: 'CALL' };
+      bestEv = callEv;
     }
-  }
 
-  if (strength >= 4 && r < 0.25 && currentChips >= minBet) {
-    return {
-      action: 'RAISE',
-      amount: Math.min(maxBet, Math.max(minBet, minBet * 2)),
-    };
+    // 加注额为新底注，须在 [2 × 底注, MAX_RAISE × 底注] 之间，逐档比较
+    for (let amount = callCost + currentAnte; amount <= maxBet; amount += currentAnte) {
+      if (amount > currentChips) break;
+      const raiseEv = ev(amount);
+      if (raiseEv > bestEv) {
+        best = { action: 'RAISE', amount };
+        bestEv = raiseEv;
+      }
+    }
   }
 
-  const callCost = currentAnte * 2;
-  if (currentChips < callCost) {
-    if (currentChips <= 0) return { action: 'FOLD' };
-    return { action: 'ALL_IN' };
+  const allInEv = ev(currentChips);
+  if (allInEv > bestEv) {
+    best = { action: 'ALL_IN' };
   }
 
-  return { action: 'CALL' };
+  return best;
 }
@@ -1,5 +1,6 @@
 /**
- * 执行机器人一回合：看牌（若未看）→ 决策 → 下注操作
+ * 执行机器人一回合：看牌（若未看）→ 估算胜率 → 按期望收益决策 → 下注操作
+ * 整个回合控制在 BOT_STEP_BUDGET_MS 内：胜率估算只能使用扣除读写预留后的剩余时间
  */
 
 import { prisma } from '@/lib/prisma';
@@ -7,7 +8,70 @@ import { ZJH_BOT_USER_ID } from '@/lib/zjh/bot-constants';
 import { applyLook } from '@/lib/zjh/mutations/apply-look';
 import { applyBettingAction } from '@/lib/zjh/mutations/apply-betting-action';
 import { decideBotBetting } from '@/lib/zjh/bot-ai';
-import type { HandType } from '@/types/zjh';
+import { estimateEquity } from '@/lib/zjh/equity/estimate';
+import { getLiveTable, isLiveTableMode } from '@/lib/zjh/live/table-store';
+import type { LiveTable } from '@/lib/zjh/live/table-state';
+import type { Card } from '@/types/zjh';
+
+/** 机器人一回合的总耗时预算（毫秒） */
+export const BOT_STEP_BUDGET_MS = 250;
+
+/** 为下注写入预留的时间（毫秒），胜率估算不能占用 */
+const BOT_WRITE_RESERVE_MS = 100;
+
+/** 机器人决策所需的牌局状态 */
+interface BotTurnState {
+  currentTurn: string | null;
+  currentAnte: number;
+  pot: number;
+  botPlayer: { hasLooked: boolean; hand: Card[] };
+  /** 仍在局中的对手人数 */
+  opponents: number;
+  currentChips: number;
+}
+
+function isInHand(p: { status: string }): boolean {
+  return p.status !== 'FOLDED' && p.status !== 'OUT';
+}
+
+function readBotStateFromTable(table: LiveTable): BotTurnState | null {
+  const botPlayer = table.players.find((p) => p.userId === ZJH_BOT_USER_ID);
+  if (!botPlayer) return null;
+  return {
+    currentTurn: table.currentTurn,
+    currentAnte: table.currentAnte,
+    pot: table.pot,
+    botPlayer,
+    opponents: table.players.filter((p) => p.userId !== ZJH_BOT_USER_ID && isInHand(p)).length,
+    currentChips: botPlayer.chips,
+  };
+}
+
+async function readBotStateFromDb(gameId: string): Promise<BotTurnState | null> {
+  const gameFresh = await prisma.zjhGame.findUnique({
+    where: { id: gameId },
+    include: { players: true },
+  });
+  if (!gameFresh) return null;
+
+  const botPlayer = gameFresh.players.find((p) => p.userId === ZJH_BOT_USER_ID);
+  if (!botPlayer) return null;
+
+  const roomPlayer = await prisma.zjhRoomPlayer.findFirst({
+    where: { roomId: gameFresh.roomId, userId: ZJH_BOT_USER_ID, leftAt: null },
+  });
+
+  return {
+    currentTurn: gameFresh.currentTurn,
+    currentAnte: gameFresh.currentAnte,
+    pot: gameFresh.pot,
+    botPlayer: { hasLooked: botPlayer.hasLooked, hand: botPlayer.hand as unknown as Card[] },
+    opponents: gameFresh.players.filter(
+      (p) => p.userId !== ZJH_BOT_USER_ID && isInHand(p)
+    ).length,
+    currentChips: roomPlayer?.chips ?? 0,
+  };
+}
 
 /**
  * @param humanUserId 触发者（真实玩家），须在本局游戏中且非机器人
@@ -16,17 +80,24 @@ export async function runZjhBotStep(
   gameId: string,
   humanUserId: string
 ): Promise<{ ok: true } | { ok: false; error: string }> {
+  const startedAt = Date.now();
   if (humanUserId === ZJH_BOT_USER_ID) {
     return { ok: false, error: '无效请求' };
   }
 
-  const game = await prisma.zjhGame.findUnique({
-    where: { id: gameId },
-    include: {
-      room: true,
-      players: { orderBy: { seatIndex: 'asc' } },
-    },
-  });
+  const table = isLiveTableMode() ? await getLiveTable(gameId) : null;
+  const game: {
+    status: string;
+    currentTurn: string | null;
+    players: { userId: string; hasLooked: boolean }[];
+  } | null = table
+    ? { status: table.status, currentTurn: table.currentTurn, players: table.players }
+    : await prisma.zjhGame.findUnique({
+        where: { id: gameId },
+        include: {
+          players: { orderBy: { seatIndex: 'asc' } },
+        },
+      });
 
   if (!game) {
     return { ok: false, error: '游戏不存在' };
@@ -60,32 +131,30 @@ export async function runZjhBotStep(
     }
   }
 
-  const botPlayer = await prisma.zjhGamePlayer.findFirst({
-    where: { gameId, userId: ZJH_BOT_USER_ID },
-  });
-  if (!botPlayer) {
+  const state = table ? readBotStateFromTable(table) : await readBotStateFromDb(gameId);
+  if (!state) {
     return { ok: false, error: '机器人数据异常' };
   }
 
-  const gameFresh = await prisma.zjhGame.findUnique({ where: { id: gameId } });
-  if (!gameFresh || gameFresh.currentTurn !== ZJH_BOT_USER_ID) {
+  if (state.currentTurn !== ZJH_BOT_USER_ID) {
     return { ok: false, error: '回合已变更' };
   }
 
-  const roomPlayer = await prisma.zjhRoomPlayer.findFirst({
-    where: { roomId: game.roomId, userId: ZJH_BOT_USER_ID, leftAt: null },
-  });
-  const currentChips = roomPlayer?.chips ?? 0;
-  const handType = botPlayer.handType as HandType;
+  const { botPlayer, currentChips } = state;
+
+  const equityBudgetMs = BOT_STEP_BUDGET_MS - BOT_WRITE_RESERVE_MS - (Date.now() - startedAt);
+  const equity = await estimateEquity(botPlayer.hand, state.opponents, equityBudgetMs);
 
   const decision = decideBotBetting({
-    handType,
-    currentAnte: gameFresh.currentAnte,
+    equity,
+    pot: state.pot,
+    currentAnte: state.currentAnte,
     currentChips,
+    opponents: state.opponents,
     hasLooked: true,
   });
 
-  const callCost = botPlayer.hasLooked ? gameFresh.currentAnte * 2 : gameFresh.currentAnte;
+  const callCost = botPlayer.hasLooked ? state.currentAnte * 2 : state.currentAnte;
 
   let finalDecision = decision;
   if (decision.action === 'CALL' && currentChips < callCost && currentChips > 0) {
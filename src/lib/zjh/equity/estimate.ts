@@ -0,0 +1,101 @@
+/**
+ * 胜率估算：缓存 + 线程池 + 时间预算
+ *
+ * 胜率只取决于手牌组合与对手人数，按 (组合下标, 对手人数) 缓存，
+ * 同一手牌再次决策时直接命中；并发的相同估算共用一次模拟。
+ * 线程池在截止时间前未返回时，先用当前线程的小样本结果应急，池内结果返回后仍会写入缓存。
+ */
+
+import type { Card } from '@/types/zjh';
+import { encodeHand, handKey, simulateEquity } from './simulate';
+import { simulateInPool } from './worker-pool';
+
+/** 完整估算的模拟次数 */
+export const EQUITY_ITERATIONS = 20000;
+
+/** 超时应急时在当前线程模拟的次数（约 1ms 内完成） */
+export const EQUITY_FALLBACK_ITERATIONS = 1000;
+
+/** 对手人数上限（房间最多 6 人） */
+const MAX_OPPONENTS = 5;
+
+const globalForEquityCache = globalThis as unknown as {
+  zjhEquityCache: Map<number, number> | undefined;
+  zjhEquityInFlight: Map<number, Promise<number>> | undefined;
+};
+
+/** (组合下标, 对手人数) → 胜率；最多 22100 × 5 项 */
+const cache: Map<number, number> =
+  globalForEquityCache.zjhEquityCache ?? (globalForEquityCache.zjhEquityCache = new Map());
+
+const inFlight: Map<number, Promise<number>> =
+  globalForEquityCache.zjhEquityInFlight ??
+  (globalForEquityCache.zjhEquityInFlight = new Map());
+
+function cacheKey(hand: Card[], opponents: number): number {
+  return handKey(hand) * 8 + opponents;
+}
+
+/**
+ * 读取缓存中的胜率（未命中返回 undefined）
+ */
+export function getCachedEquity(hand: Card[], opponents: number): number | undefined {
+  return cache.get(cacheKey(hand, Math.min(opponents, MAX_OPPONENTS)));
+}
+
+/**
+ * 完整估算：优先线程池，不可用、超时或 worker 崩溃时在当前线程计算；结果写入缓存
+ * 线程池任务总会在 TASK_TIMEOUT_MS 内结束，inFlight 中的条目不会一直挂起
+ */
+function computeEquity(hand: Card[], opponents: number, key: number): Promise<number> {
+  const existing = inFlight.get(key);
+  if (existing) return existing;
+
+  const promise = simulateInPool(encodeHand(hand), opponents, EQUITY_ITERATIONS)
+    .then(
+      (share) => share / EQUITY_ITERATIONS,
+      () => simulateEquity(hand, opponents, EQUITY_ITERATIONS)
+    )
+    .then((equity) => {
+      cache.set(key, equity);
+      return equity;
+    })
+    .finally(() => inFlight.delete(key));
+
+  inFlight.set(key, promise);
+  return promise;
+}
+
+/**
+ * 估算手牌对 opponents 名随机对手的胜率（0–1）
+ * @param budgetMs 最长等待时间；超时返回小样本估算（不写缓存）
+ */
+export async function estimateEquity(
+  hand: Card[],
+  opponents: number,
+  budgetMs: number
+): Promise<number> {
+  if (opponents <= 0) return 1;
+  const n = Math.min(opponents, MAX_OPPONENTS);
+  const key = cacheKey(hand, n);
+
+  const cached = cache.get(key);
+  if (cached !== undefined) return cached;
+
+  const full = computeEquity(hand, n, key);
+  if (budgetMs <= 0) {
+    return simulateEquity(hand, n, EQUITY_FALLBACK_ITERATIONS);
+  }
+
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  const timeout = new Promise<null>((resolve) => {
+    timer = setTimeout(() => resolve(null), budgetMs);
+  });
+
+  try {
+    const equity = await Promise.race([full, timeout]);
+    return equity ?? simulateEquity(hand, n, EQUITY_FALLBACK_ITERATIONS);
+  } finally {
+    if (timer) clearTimeout(timer);
+  }
+}
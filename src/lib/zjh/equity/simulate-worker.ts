@@ -0,0 +1,37 @@
+/**
+ * 胜率模拟 worker 入口：接收一批模拟任务，返回赢得的份额
+ */
+
+import { parentPort, workerData } from 'worker_threads';
+import { simulateShowdowns, type ShowdownTables } from './simulate';
+
+export interface SimulateTask {
+  id: number;
+  hero0: number;
+  hero1: number;
+  hero2: number;
+  opponents: number;
+  iterations: number;
+  seed: number;
+}
+
+export interface SimulateReply {
+  id: number;
+  share: number;
+}
+
+const tables = workerData as ShowdownTables;
+
+parentPort?.on('message', (task: SimulateTask) => {
+  const share = simulateShowdowns(
+    tables.rank,
+    tables.flags,
+    task.hero0,
+    task.hero1,
+    task.hero2,
+    task.opponents,
+    task.iterations,
+    task.seed
+  );
+  parentPort?.postMessage({ id: task.id, share } satisfies SimulateReply);
+});
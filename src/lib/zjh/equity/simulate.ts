@@ -0,0 +1,153 @@
+/**
+ * 手牌胜率（equity）蒙特卡洛模拟
+ *
+ * 从剩余 49 张牌中随机给 N 名对手各发三张，统计本手牌赢下摊牌的份额（平局按人数均分）
+ * 牌用 hand-table 的 0–51 编码表示，比牌直接查 handRank 表；
+ * 每次发牌在同一个 Uint8Array 上做部分 Fisher-Yates，循环内不分配内存
+ *
+ * simulateShowdowns 只依赖传入的查表数据，worker 线程（simulate-worker.ts）直接调用它
+ */
+
+import type { Card } from '@/types/zjh';
+import { HAND_COUNT, encodeCard, handIndex, handRankAt, handTypeAt, is235At } from '../hand-table';
+
+/** 比牌标记：235 */
+export const FLAG_235 = 1;
+/** 比牌标记：豹子 */
+export const FLAG_TRIPLE = 2;
+
+/** 比牌所需的查表数据（可通过 postMessage 复制给 worker） */
+export interface ShowdownTables {
+  rank: Int32Array;
+  flags: Uint8Array;
+}
+
+let showdownTables: ShowdownTables | null = null;
+
+/**
+ * 获取比牌查表数据（懒加载，进程内只生成一次）
+ */
+export function getShowdownTables(): ShowdownTables {
+  if (!showdownTables) {
+    const rank = new Int32Array(HAND_COUNT);
+    const flags = new Uint8Array(HAND_COUNT);
+    for (let i = 0; i < HAND_COUNT; i++) {
+      rank[i] = handRankAt(i);
+      flags[i] = (is235At(i) ? FLAG_235 : 0) | (handTypeAt(i) === 'TRIPLE' ? FLAG_TRIPLE : 0);
+    }
+    showdownTables = { rank, flags };
+  }
+  return showdownTables;
+}
+
+/**
+ * 模拟 iterations 次摊牌，返回本手牌赢得的份额总和（除以 iterations 即为胜率）
+ *
+ * 规则与 compareHandIndex 一致：235 通杀豹子，其余按 handRank 比较
+ * @param rank 组合下标 → handRank
+ * @param flags 组合下标 → FLAG_235 | FLAG_TRIPLE
+ * @param hero0 本手牌编码（0–51，互不相同）
+ * @param opponents 对手人数（1–16）
+ * @param seed 随机种子（xorshift32，非 0）
+ */
+export function simulateShowdowns(
+  rank: Int32Array,
+  flags: Uint8Array,
+  hero0: number,
+  hero1: number,
+  hero2: number,
+  opponents: number,
+  iterations: number,
+  seed: number
+): number {
+  const deck = new Uint8Array(49);
+  let size = 0;
+  for (let code = 0; code < 52; code++) {
+    if (code !== hero0 && code !== hero1 && code !== hero2) deck[size++] = code;
+  }
+
+  let a = hero0;
+  let b = hero1;
+  let c = hero2;
+  let t = 0;
+  if (a > b) { t = a; a = b; b = t; }
+  if (b > c) { t = b; b = c; c = t; }
+  if (a > b) { t = a; a = b; b = t; }
+  const heroIndex = (c * (c - 1) * (c - 2)) / 6 + (b * (b - 1)) / 2 + a;
+  const heroRank = rank[heroIndex];
+  const heroFlags = flags[heroIndex];
+
+  let s = seed | 0 || 0x9e3779b9;
+  let share = 0;
+
+  for (let iter = 0; iter < iterations; iter++) {
+    let lost = false;
+    let ties = 0;
+    let top = size;
+
+    for (let o = 0; o < opponents && !lost; o++) {
+      // 从牌堆尾部抽三张（部分 Fisher-Yates，上一轮的排列不需要复原）
+      for (let k = 0; k < 3; k++) {
+        s ^= s << 13;
+        s ^= s >>> 17;
+        s ^= s << 5;
+        const j = (((s >>> 0) * top) / 4294967296) | 0;
+        top--;
+        t = deck[top];
+        deck[top] = deck[j];
+        deck[j] = t;
+      }
+
+      a = deck[top];
+      b = deck[top + 1];
+      c = deck[top + 2];
+      if (a > b) { t = a; a = b; b = t; }
+      if (b > c) { t = b; b = c; c = t; }
+      if (a > b) { t = a; a = b; b = t; }
+      const index = (c * (c - 1) * (c - 2)) / 6 + (b * (b - 1)) / 2 + a;
+
+      // 1 = FLAG_235，2 = FLAG_TRIPLE（函数需自包含，不能引用模块常量）
+      const oppFlags = flags[index];
+      let cmp: number;
+      if (heroFlags & 1 && oppFlags & 2) cmp = 1;
+      else if (oppFlags & 1 && heroFlags & 2) cmp = -1;
+      else cmp = heroRank - rank[index];
+
+      if (cmp < 0) lost = true;
+      else if (cmp === 0) ties++;
+    }
+
+    if (!lost) share += 1 / (ties + 1);
+  }
+
+  return share;
+}
+
+/**
+ * 手牌 → 三个编码
+ */
+export function encodeHand(hand: Card[]): [number, number, number] {
+  return [encodeCard(hand[0]), encodeCard(hand[1]), encodeCard(hand[2])];
+}
+
+/**
+ * 手牌 → 组合下标（用作胜率缓存键）
+ */
+export function handKey(hand: Card[]): number {
+  return handIndex(encodeCard(hand[0]), encodeCard(hand[1]), encodeCard(hand[2]));
+}
+
+/**
+ * 在当前线程同步计算胜率
+ */
+export function simulateEquity(
+  hand: Card[],
+  opponents: number,
+  iterations: number,
+  seed: number = (Math.random() * 0xffffffff) | 0
+): number {
+  if (opponents <= 0) return 1;
+  const { rank, flags } = getShowdownTables();
+  const [c0, c1, c2] = encodeHand(hand);
+  return simulateShowdowns(rank, flags, c0, c1, c2, opponents, iterations, seed) / iterations;
+}
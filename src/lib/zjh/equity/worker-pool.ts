@@ -0,0 +1,202 @@
+/**
+ * 胜率模拟 worker 线程池
+ *
+ * 一次估算拆成若干批，分发到各个 worker 并行模拟后汇总，请求处理线程只做收发。
+ * worker 入口为 simulate-worker.ts，由打包器按 new URL(..., import.meta.url) 单独打包。
+ * 单批超过 TASK_TIMEOUT_MS 未返回、或 worker 崩溃退出时，该 worker 上的任务全部 reject，
+ * 并重启一个新 worker；累计重启次数过多时线程池停用。任务 reject 后调用方回退到当前线程计算。
+ */
+
+import os from 'os';
+import { Worker } from 'worker_threads';
+import { getShowdownTables } from './simulate';
+import type { SimulateReply, SimulateTask } from './simulate-worker';
+
+/** 单批模拟的超时（毫秒）；正常一批只需数毫秒 */
+const TASK_TIMEOUT_MS = 1000;
+
+/** 进程内累计重启 worker 的上限，超过后视为运行环境问题，停用线程池 */
+const MAX_WORKER_RESTARTS = 10;
+
+interface PendingTask {
+  resolve: (share: number) => void;
+  reject: (error: Error) => void;
+  worker: Worker;
+  timer: ReturnType<typeof setTimeout>;
+}
+
+interface EquityPool {
+  workers: Worker[];
+  /** 下一个接收任务的 worker（轮询） */
+  cursor: number;
+  nextTaskId: number;
+  pending: Map<number, PendingTask>;
+  restarts: number;
+  disabled: boolean;
+}
+
+const globalForEquityPool = globalThis as unknown as {
+  zjhEquityPool: EquityPool | undefined;
+};
+
+/**
+ * worker 数量：ZJH_EQUITY_WORKERS 优先，否则为 CPU 数 - 1（1–4）；为 0 时不启用线程池
+ */
+function getPoolSize(): number {
+  const configured = process.env.ZJH_EQUITY_WORKERS;
+  if (configured !== undefined && configured !== '') {
+    const n = Number.parseInt(configured, 10);
+    return Number.isFinite(n) && n > 0 ? n : 0;
+  }
+  return Math.max(1, Math.min(4, os.availableParallelism() - 1));
+}
+
+function disablePool(pool: EquityPool, error: Error): void {
+  if (pool.disabled) return;
+  console.error('胜率线程池停用，改为当前线程计算:', error);
+  pool.disabled = true;
+  for (const task of pool.pending.values()) {
+    clearTimeout(task.timer);
+    task.reject(error);
+  }
+  pool.pending.clear();
+  const workers = pool.workers;
+  pool.workers = [];
+  for (const worker of workers) void worker.terminate();
+}
+
+/**
+ * 终止 slot 上的 worker（超时或崩溃），reject 它名下的任务并换一个新的
+ */
+function replaceWorker(pool: EquityPool, slot: number, worker: Worker, error: Error): void {
+  // 已停用或已替换过（terminate 触发的 exit 事件会再次进入这里）
+  if (pool.disabled || pool.workers[slot] !== worker) return;
+
+  for (const [id, task] of pool.pending) {
+    if (task.worker !== worker) continue;
+    pool.pending.delete(id);
+    clearTimeout(task.timer);
+    task.reject(error);
+  }
+  void worker.terminate();
+
+  pool.restarts++;
+  if (pool.restarts > MAX_WORKER_RESTARTS) {
+    disablePool(pool, error);
+    return;
+  }
+  console.error('胜率 worker 异常，已重启:', error);
+  try {
+    spawnWorker(pool, slot);
+  } catch (spawnError) {
+    disablePool(pool, spawnError as Error);
+  }
+}
+
+function spawnWorker(pool: EquityPool, slot: number): void {
+  const tables = getShowdownTables();
+  const worker = new Worker(new URL('./simulate-worker.ts', import.meta.url), {
+    workerData: { rank: tables.rank, flags: tables.flags },
+  });
+  worker.on('message', (reply: SimulateReply) => {
+    const task = pool.pending.get(reply.id);
+    if (!task) return;
+    pool.pending.delete(reply.id);
+    clearTimeout(task.timer);
+    task.resolve(reply.share);
+  });
+  worker.on('error', (error) => replaceWorker(pool, slot, worker, error));
+  worker.on('exit', (code) =>
+    replaceWorker(pool, slot, worker, new Error(`胜率 worker 意外退出，退出码 ${code}`))
+  );
+  // 空闲 worker 不阻止进程退出
+  worker.unref();
+  pool.workers[slot] = worker;
+}
+
+function createPool(): EquityPool {
+  const pool: EquityPool = {
+    workers: [],
+    cursor: 0,
+    nextTaskId: 1,
+    pending: new Map(),
+    restarts: 0,
+    disabled: false,
+  };
+
+  const size = getPoolSize();
+  if (size === 0) {
+    pool.disabled = true;
+    return pool;
+  }
+
+  try {
+    for (let slot = 0; slot < size; slot++) spawnWorker(pool, slot);
+  } catch (error) {
+    disablePool(pool, error as Error);
+  }
+
+  return pool;
+}
+
+function getPool(): EquityPool {
+  return (globalForEquityPool.zjhEquityPool ??= createPool());
+}
+
+/**
+ * 线程池是否可用
+ */
+export function isEquityPoolAvailable(): boolean {
+  return !getPool().disabled;
+}
+
+function runBatch(pool: EquityPool, task: Omit<SimulateTask, 'id'>): Promise<number> {
+  const id = pool.nextTaskId++;
+  const slot = pool.cursor;
+  const worker = pool.workers[slot];
+  pool.cursor = (pool.cursor + 1) % pool.workers.length;
+
+  return new Promise<number>((resolve, reject) => {
+    const timer = setTimeout(
+      () => replaceWorker(pool, slot, worker, new Error(`胜率模拟超过 ${TASK_TIMEOUT_MS}ms 未返回`)),
+      TASK_TIMEOUT_MS
+    );
+    timer.unref?.();
+    pool.pending.set(id, { resolve, reject, worker, timer });
+    worker.postMessage({ ...task, id } satisfies SimulateTask);
+  });
+}
+
+/**
+ * 在线程池中模拟，iterations 均分给各个 worker
+ * @returns 赢得的份额总和；线程池不可用、任务超时或 worker 崩溃时 reject
+ */
+export async function simulateInPool(
+  hero: [number, number, number],
+  opponents: number,
+  iterations: number
+): Promise<number> {
+  const pool = getPool();
+  if (pool.disabled) {
+    throw new Error('胜率线程池不可用');
+  }
+
+  const batches = Math.min(pool.workers.length, iterations);
+  const perBatch = Math.floor(iterations / batches);
+  const tasks: Promise<number>[] = [];
+  for (let i = 0; i < batches; i++) {
+    tasks.push(
+      runBatch(pool, {
+        hero0: hero[0],
+        hero1: hero[1],
+        hero2: hero[2],
+        opponents,
+        iterations: i === batches - 1 ? iterations - perBatch * (batches - 1) : perBatch,
+        seed: (Math.random() * 0xffffffff) | 0,
+      })
+    );
+  }
+
+  const shares = await Promise.all(tasks);
+  return shares.reduce((sum, share) => sum + share, 0);
+}
@@ -0,0 +1,222 @@
+/**
+ * 炸金花实时事件（牌局增量 / 房间变更）
+ *
+ * 通过 Redis pub/sub 在多个 Next.js 实例间广播；
+ * 每个进程只维持一条订阅连接，再在进程内分发给各个 SSE 连接。
+ * Redis 不可用时退化为进程内分发（单实例部署仍然可用）。
+ */
+
+import { redis } from '@/lib/redis';
+import { prisma } from '@/lib/prisma';
+import type { LiveTable } from '@/lib/zjh/live/table-state';
+import type { ZjhGameDelta, ZjhRoomEvent, ZjhStreamEvent } from '@/types/zjh';
+import type Redis from 'ioredis';
+
+const GAME_CHANNEL_PREFIX = 'zjh:events:game:';
+const ROOM_CHANNEL_PREFIX = 'zjh:events:room:';
+
+type Listener = (event: ZjhStreamEvent) => void;
+
+interface EventBus {
+  listeners: Map<string, Set<Listener>>;
+  subscriber: Redis | null;
+}
+
+const globalForZjhEvents = globalThis as unknown as {
+  zjhEventBus: EventBus | undefined;
+};
+
+const bus: EventBus =
+  globalForZjhEvents.zjhEventBus ??
+  (globalForZjhEvents.zjhEventBus = { listeners: new Map(), subscriber: null });
+
+export function gameChannel(gameId: string): string {
+  return `${GAME_CHANNEL_PREFIX}${gameId}`;
+}
+
+export function roomChannel(roomId: string): string {
+  return `${ROOM_CHANNEL_PREFIX}${roomId}`;
+}
+
+/**
+ * 进程内分发
+ */
+function dispatch(channel: string, event: ZjhStreamEvent): void {
+  const listeners = bus.listeners.get(channel);
+  if (!listeners) return;
+  for (const listener of listeners) {
+    try {
+      listener(event);
+    } catch (error) {
+      console.error('事件分发失败:', channel, error);
+    }
+  }
+}
+
+/**
+ * 懒加载订阅连接（订阅模式下的连接不能执行普通命令，需要单独一条）
+ * 主连接禁用了离线队列，订阅连接需要打开：刚创建时尚未就绪，SUBSCRIBE 要排队等连接建立
+ */
+function getSubscriber(): Redis {
+  if (!bus.subscriber) {
+    const subscriber = redis.duplicate({ enableOfflineQueue: true });
+    subscriber.on('message', (channel: string, message: string) => {
+      try {
+        dispatch(channel, JSON.parse(message) as ZjhStreamEvent);
+      } catch (error) {
+        console.error('事件解析失败:', channel, error);
+      }
+    });
+    subscriber.on('error', (err) => {
+      console.error('Redis subscriber error:', err);
+    });
+    // ioredis 重连后只恢复订阅成功过的频道；连接（重新）就绪时补订阅全部在听的频道，
+    // 之前 SUBSCRIBE 失败的频道借此恢复（重复订阅同一频道无副作用）
+    subscriber.on('ready', () => {
+      const channels = [...bus.listeners.keys()];
+      if (channels.length === 0) return;
+      subscriber
+        .subscribe(...channels)
+        .catch((error) => console.error('补订阅失败:', channels.length, error));
+    });
+    bus.subscriber = subscriber;
+  }
+  return bus.subscriber;
+}
+
+async function publish(channel: string, event: ZjhStreamEvent): Promise<void> {
+  if (redis.status === 'ready') {
+    try {
+      await redis.publish(channel, JSON.stringify(event));
+      return;
+    } catch (error) {
+      console.error('事件发布失败，改为进程内分发:', channel, error);
+    }
+  }
+  dispatch(channel, event);
+}
+
+/**
+ * 订阅频道，返回取消订阅函数
+ */
+export function subscribe(channel: string, listener: Listener): () => void {
+  let listeners = bus.listeners.get(channel);
+  if (!listeners) {
+    listeners = new Set();
+    bus.listeners.set(channel, listeners);
+    getSubscriber()
+      .subscribe(channel)
+      .catch((error) => console.error('订阅失败，连接就绪后重试:', channel, error));
+  }
+  listeners.add(listener);
+
+  return () => {
+    const current = bus.listeners.get(channel);
+    if (!current) return;
+    current.delete(listener);
+    if (current.size === 0) {
+      bus.listeners.delete(channel);
+      bus.subscriber
+        ?.unsubscribe(channel)
+        .catch((error) => console.error('取消订阅失败:', channel, error));
+    }
+  };
+}
+
+/**
+ * 读取牌局的公开增量（不包含任何手牌信息）
+ * 传入内存牌桌时直接读内存，否则查询一次数据库
+ */
+async function buildGameDelta(
+  gameId: string,
+  table?: LiveTable | null
+): Promise<ZjhGameDelta | null> {
+  if (table) {
+    const last = table.actions[table.actions.length - 1];
+    return {
+      type: 'game',
+      gameId,
+      status: table.status,
+      pot: table.pot,
+      currentAnte: table.currentAnte,
+      currentRound: table.currentRound,
+      currentTurn: table.currentTurn,
+      actionCount: table.actions.length,
+      lastAction: last
+        ? {
+            userId: last.userId,
+            actionType: last.actionType,
+            amount: last.amount,
+            round: last.round,
+            createdAt: last.createdAt.toISOString(),
+          }
+        : null,
+      players: table.players.map((p) => ({
+        userId: p.userId,
+        status: p.status,
+        hasLooked: p.hasLooked,
+        totalBet: p.totalBet,
+        chips: p.chips,
+      })),
+    };
+  }
+
+  const game = await prisma.zjhGame.findUnique({
+    where: { id: gameId },
+    include: {
+      players: { orderBy: { seatIndex: 'asc' } },
+      actions: { orderBy: { createdAt: 'desc' }, take: 1 },
+      _count: { select: { actions: true } },
+    },
+  });
+  if (!game) return null;
+
+  const last = game.actions[0];
+  return {
+    type: 'game',
+    gameId,
+    status: game.status,
+    pot: game.pot,
+    currentAnte: game.currentAnte,
+    currentRound: game.currentRound,
+    currentTurn: game.currentTurn,
+    actionCount: game._count.actions,
+    lastAction: last
+      ? {
+          userId: last.userId,
+          actionType: last.actionType,
+          amount: last.amount,
+          round: last.round,
+          createdAt: last.createdAt.toISOString(),
+        }
+      : null,
+    players: game.players.map((p) => ({
+      userId: p.userId,
+      status: p.status,
+      hasLooked: p.hasLooked,
+      totalBet: p.totalBet,
+      chips: p.chipsBeforeGame - p.totalBet,
+    })),
+  };
+}
+
+/**
+ * 广播牌局增量（操作成功后调用，不阻塞请求）
+ */
+export function publishGameUpdate(gameId: string, table?: LiveTable | null): void {
+  void buildGameDelta(gameId, table)
+    .then((delta) => (delta ? publish(gameChannel(gameId), delta) : undefined))
+    .catch((error) => console.error('广播牌局增量失败:', gameId, error));
+}
+
+/**
+ * 广播房间变更（加入 / 离开 / 准备 / 开局 / 结算后回到等待）
+ */
+export function publishRoomUpdate(roomId: string, gameId?: string): void {
+  const event: ZjhRoomEvent = gameId
+    ? { type: 'room', roomId, gameId }
+    : { type: 'room', roomId };
+  void publish(roomChannel(roomId), event).catch((error) =>
+    console.error('广播房间变更失败:', roomId, error)
+  );
+}
@@ -1,10 +1,14 @@
 /**
  * 牌型判定和比较
  * 6 种牌型判定、235 通杀、花色比较
+ *
+ * evaluateHand / compareHands 走 hand-table 的预计算查表；
+ * 逐张计算的实现保留为 evaluateHandReference / compareHandsReference，用于校验查表结果
  */
 
 import type { Card, HandType, HandEvaluation } from '@/types/zjh';
 import { RANK_WEIGHT, SUIT_WEIGHT, HAND_TYPE_WEIGHT } from './constants';
+import { compareHandIndex, handIndexOf, handRankAt, handTypeAt } from './hand-table';
 
 /**
  * 获取牌的点数权重
@@ -171,7 +175,7 @@ function calculateHandRank(handType: HandType, cards: Card[]): number {
 }
 
 /**
- * 评估手牌牌型
+ * 评估手牌牌型（查表）
  * @param cards 三张手牌
  * @returns 牌型评估结果
  */
@@ -180,6 +184,32 @@ export function evaluateHand(cards: Card[]): HandEvaluation {
     throw new Error(`手牌必须为 3 张，当前 ${cards.length} 张`);
   }
 
+  const index = handIndexOf(cards);
+  return {
+    handType: handTypeAt(index),
+    handRank: handRankAt(index),
+    cards: sortCards(cards),
+  };
+}
+
+/**
+ * 比较两手牌的大小（查表，无内存分配）
+ * @returns 正数表示 hand1 赢，负数表示 hand2 赢，0 表示平局
+ */
+export function compareHands(hand1: Card[], hand2: Card[]): number {
+  return compareHandIndex(handIndexOf(hand1), handIndexOf(hand2));
+}
+
+/**
+ * 评估手牌牌型（逐张计算的参考实现）
+ * @param cards 三张手牌
+ * @returns 牌型评估结果
+ */
+export function evaluateHandReference(cards: Card[]): HandEvaluation {
+  if (cards.length !== 3) {
+    throw new Error(`手牌必须为 3 张，当前 ${cards.length} 张`);
+  }
+
   const sorted = sortCards(cards);
   let handType: HandType;
 
@@ -207,12 +237,12 @@ export function evaluateHand(cards: Card[]): HandEvaluation {
 }
 
 /**
- * 比较两手牌的大小
+ * 比较两手牌的大小（参考实现）
  * @returns 正数表示 hand1 赢，负数表示 hand2 赢，0 表示平局
  */
-export function compareHands(hand1: Card[], hand2: Card[]): number {
-  const eval1 = evaluateHand(hand1);
-  const eval2 = evaluateHand(hand2);
+export function compareHandsReference(hand1: Card[], hand2: Card[]): number {
+  const eval1 = evaluateHandReference(hand1);
+  const eval2 = evaluateHandReference(hand2);
 
   // 特殊规则：235 通杀豹子
   const hand1Is235 = is235(hand1);
@@ -0,0 +1,164 @@
+/**
+ * 三张牌查表评估
+ *
+ * 牌编码：code = (点数权重 - 2) * 4 + (花色权重 - 1)，取值 0–51
+ * 编码越大牌越大（先比点数再比花色），与 sortCards 的排序一致
+ *
+ * 三张牌的组合共 C(52,3) = 22100 种，用组合数系统把排序后的 (a < b < c)
+ * 映射为 0–22099 的完美哈希：index = C(c,3) + C(b,2) + a
+ * 每个组合预先计算 handType / handRank / 235 标记，评估与比较均为 O(1) 且无内存分配
+ */
+
+import type { Card, HandType } from '@/types/zjh';
+import { RANK_WEIGHT, SUIT_WEIGHT, HAND_TYPE_WEIGHT, RANKS, SUITS } from './constants';
+
+/** 三张牌组合总数 */
+export const HAND_COUNT = 22100;
+
+/** 牌型权重 → 牌型（下标为 HAND_TYPE_WEIGHT） */
+const HAND_TYPE_BY_WEIGHT: HandType[] = [];
+for (const type of Object.keys(HAND_TYPE_WEIGHT) as HandType[]) {
+  HAND_TYPE_BY_WEIGHT[HAND_TYPE_WEIGHT[type]] = type;
+}
+
+/** 编码 → 牌 */
+const CARD_BY_CODE: Card[] = [];
+for (const rank of RANKS) {
+  for (const suit of SUITS) {
+    CARD_BY_CODE[(RANK_WEIGHT[rank] - 2) * 4 + SUIT_WEIGHT[suit] - 1] = { suit, rank };
+  }
+}
+
+/** C(n,3) 与 C(n,2) 预计算 */
+const C3 = new Int32Array(52);
+const C2 = new Int32Array(52);
+for (let n = 0; n < 52; n++) {
+  C3[n] = (n * (n - 1) * (n - 2)) / 6;
+  C2[n] = (n * (n - 1)) / 2;
+}
+
+/** 每个组合的牌型权重（1–6） */
+const TYPE_TABLE = new Uint8Array(HAND_COUNT);
+/** 每个组合的 handRank（与 evaluateHand 完全一致） */
+const RANK_TABLE = new Int32Array(HAND_COUNT);
+/** 每个组合是否为 235 特殊散牌 */
+const IS_235_TABLE = new Uint8Array(HAND_COUNT);
+
+/**
+ * 牌转编码
+ */
+export function encodeCard(card: Card): number {
+  return (RANK_WEIGHT[card.rank] - 2) * 4 + SUIT_WEIGHT[card.suit] - 1;
+}
+
+/**
+ * 编码转牌（返回共享对象，请勿修改）
+ */
+export function decodeCard(code: number): Card {
+  return CARD_BY_CODE[code];
+}
+
+/**
+ * 三张牌编码（任意顺序、互不相同）→ 组合下标
+ */
+export function handIndex(c0: number, c1: number, c2: number): number {
+  let a = c0;
+  let b = c1;
+  let c = c2;
+  let t: number;
+  if (a > b) { t = a; a = b; b = t; }
+  if (b > c) { t = b; b = c; c = t; }
+  if (a > b) { t = a; a = b; b = t; }
+  return C3[c] + C2[b] + a;
+}
+
+/**
+ * 三张牌 → 组合下标
+ */
+export function handIndexOf(cards: Card[]): number {
+  return handIndex(encodeCard(cards[0]), encodeCard(cards[1]), encodeCard(cards[2]));
+}
+
+/** 组合下标 → 牌型 */
+export function handTypeAt(index: number): HandType {
+  return HAND_TYPE_BY_WEIGHT[TYPE_TABLE[index]];
+}
+
+/** 组合下标 → handRank */
+export function handRankAt(index: number): number {
+  return RANK_TABLE[index];
+}
+
+/** 组合下标 → 是否 235 */
+export function is235At(index: number): boolean {
+  return IS_235_TABLE[index] === 1;
+}
+
+/**
+ * 按组合下标比较两手牌
+ * @returns 正数表示 hand1 赢，负数表示 hand2 赢，0 表示平局（与 compareHands 返回值一致）
+ */
+export function compareHandIndex(index1: number, index2: number): number {
+  const tripleWeight = HAND_TYPE_WEIGHT.TRIPLE;
+  // 特殊规则：235 通杀豹子
+  if (IS_235_TABLE[index1] === 1 && TYPE_TABLE[index2] === tripleWeight) return 1;
+  if (IS_235_TABLE[index2] === 1 && TYPE_TABLE[index1] === tripleWeight) return -1;
+  return RANK_TABLE[index1] - RANK_TABLE[index2];
+}
+
+/**
+ * 生成查表数据（组合 a < b < c，按编码降序即为 sortCards 的顺序）
+ */
+function buildTables(): void {
+  for (let c = 2; c < 52; c++) {
+    for (let b = 1; b < c; b++) {
+      for (let a = 0; a < b; a++) {
+        // 降序：x0 >= x1 >= x2
+        const w0 = (c >> 2) + 2;
+        const w1 = (b >> 2) + 2;
+        const w2 = (a >> 2) + 2;
+        const s0 = (c & 3) + 1;
+        const s1 = (b & 3) + 1;
+        const s2 = (a & 3) + 1;
+
+        const flush = s0 === s1 && s1 === s2;
+        const isA23 = w0 === 14 && w1 === 3 && w2 === 2;
+        const straight = (w0 - w1 === 1 && w1 - w2 === 1) || isA23;
+
+        let type: HandType;
+        if (w0 === w1 && w1 === w2) type = 'TRIPLE';
+        else if (flush && straight) type = 'STRAIGHT_FLUSH';
+        else if (flush) type = 'FLUSH';
+        else if (straight) type = 'STRAIGHT';
+        else if (w0 === w1 || w1 === w2) type = 'PAIR';
+        else type = 'HIGH_CARD';
+
+        const base = HAND_TYPE_WEIGHT[type] * 100000000;
+        let rank: number;
+        switch (type) {
+          case 'TRIPLE':
+            rank = base + w0 * 10000 + s0;
+            break;
+          case 'STRAIGHT_FLUSH':
+          case 'STRAIGHT':
+            rank = base + (isA23 ? 3 : w0) * 10000 + s0;
+            break;
+          case 'PAIR':
+            rank = w0 === w1
+              ? base + w0 * 1000000 + s0 * 10000 + w2 * 100 + s2
+              : base + w1 * 1000000 + s1 * 10000 + w0 * 100 + s0;
+            break;
+          default:
+            rank = base + w0 * 1000000 + w1 * 10000 + w2 * 100 + s0;
+        }
+
+        const index = C3[c] + C2[b] + a;
+        TYPE_TABLE[index] = HAND_TYPE_WEIGHT[type];
+        RANK_TABLE[index] = rank;
+        IS_235_TABLE[index] = w0 === 5 && w1 === 3 && w2 === 2 && !flush ? 1 : 0;
+      }
+    }
+  }
+}
+
+buildTables();
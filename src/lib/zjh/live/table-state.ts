@@ -0,0 +1,490 @@
+/**
+ * 内存牌桌状态与纯函数操作（看牌 / 下注 / 比牌）
+ * 与 mutations 中基于数据库的逻辑保持相同规则，供内存权威模式与操作日志回放共用
+ */
+
+import { compareHands, evaluateHand } from '@/lib/zjh/hand-evaluator';
+import { BET_MULTIPLIER, HAND_TYPE_DISPLAY } from '@/lib/zjh/constants';
+import type { ActionType, Card, GameStatus, HandType, PlayerStatus } from '@/types/zjh';
+import type {
+  ApplyBettingActionResult,
+  BettingActionType,
+} from '@/lib/zjh/mutations/apply-betting-action';
+import type { ApplyLookResult } from '@/lib/zjh/mutations/apply-look';
+import type { ApplyCompareResult } from '@/lib/zjh/mutations/apply-compare';
+
+/** 牌桌中的玩家（对应 ZjhGamePlayer + 房间筹码） */
+export interface LiveTablePlayer {
+  /** ZjhGamePlayer.id */
+  id: string;
+  userId: string;
+  seatIndex: number;
+  status: PlayerStatus;
+  hand: Card[];
+  handType: HandType | null;
+  handRank: number | null;
+  hasLooked: boolean;
+  totalBet: number;
+  chipsBeforeGame: number;
+  /** 房间内剩余筹码（对应 ZjhRoomPlayer.chips） */
+  chips: number;
+}
+
+/** 操作日志（对应 ZjhGameAction） */
+export interface LiveTableAction {
+  userId: string;
+  round: number;
+  actionOrder: number;
+  actionType: ActionType;
+  amount: number;
+  targetUserId: string | null;
+  compareResult: boolean | null;
+  createdAt: Date;
+}
+
+/** 一局游戏的内存权威状态 */
+export interface LiveTable {
+  gameId: string;
+  roomId: string;
+  status: GameStatus;
+  pot: number;
+  currentAnte: number;
+  currentRound: number;
+  currentTurn: string | null;
+  dealerIndex: number;
+  baseAnte: number;
+  maxRounds: number;
+  winnerId: string | null;
+  /** 按座位号升序 */
+  players: LiveTablePlayer[];
+  /** 本局全部操作日志（按发生顺序） */
+  actions: LiveTableAction[];
+  /** 已落库的操作条数（actions 的前缀） */
+  flushedActionCount: number;
+  /** 结算是否已写入数据库 */
+  settled: boolean;
+}
+
+/**
+ * 找到下一位可行动玩家（未弃牌、未出局、未全押）
+ */
+export function getNextActivePlayer(
+  players: { userId: string; seatIndex: number; status: string }[],
+  currentUserId: string
+): string | null {
+  const activePlayers = players.filter(
+    (p) => p.status !== 'FOLDED' && p.status !== 'OUT' && p.status !== 'ALL_IN'
+  );
+  if (activePlayers.length === 0) return null;
+
+  const currentIndex = activePlayers.findIndex((p) => p.userId === currentUserId);
+  const nextIndex = (currentIndex + 1) % activePlayers.length;
+  return activePlayers[nextIndex].userId;
+}
+
+/**
+ * 在仍在局中的玩家里找出牌最大的一位
+ */
+function findBestPlayer(players: LiveTablePlayer[]): LiveTablePlayer {
+  let bestPlayer = players[0];
+  for (let i = 1; i < players.length; i++) {
+    if (compareHands(bestPlayer.hand, players[i].hand) < 0) {
+      bestPlayer = players[i];
+    }
+  }
+  return bestPlayer;
+}
+
+function isInHand(p: LiveTablePlayer): boolean {
+  return p.status !== 'FOLDED' && p.status !== 'OUT';
+}
+
+/**
+ * 追加一条操作日志，actionOrder 为本轮第几次操作
+ */
+function appendAction(
+  table: LiveTable,
+  action: Omit<LiveTableAction, 'actionOrder' | 'round' | 'createdAt'>,
+  createdAt: Date
+): void {
+  let actionOrder = 1;
+  for (const a of table.actions) {
+    if (a.round === table.currentRound) actionOrder++;
+  }
+  table.actions.push({
+    ...action,
+    round: table.currentRound,
+    actionOrder,
+    createdAt,
+  });
+}
+
+/**
+ * 结束牌局：标记结算状态，等待写回数据库
+ */
+function finishTable(table: LiveTable, winnerId: string): void {
+  table.status = 'SETTLEMENT';
+  table.winnerId = winnerId;
+  table.currentTurn = null;
+}
+
+/**
+ * 结算后玩家筹码（与 settleGameInDb 的计算一致）
+ */
+function settledChips(table: LiveTable, player: LiveTablePlayer): number {
+  const chipsChange =
+    player.userId === table.winnerId ? table.pot - player.totalBet : -player.totalBet;
+  return Math.max(0, player.chipsBeforeGame + chipsChange);
+}
+
+/**
+ * 看牌
+ */
+export function applyLookToTable(
+  table: LiveTable,
+  userId: string,
+  createdAt: Date = new Date()
+): ApplyLookResult {
+  const player = table.players.find((p) => p.userId === userId);
+  if (!player) {
+    return { ok: false, error: '你不在该游戏中' };
+  }
+
+  if (table.status !== 'BETTING') {
+    return { ok: false, error: '游戏不在下注阶段' };
+  }
+
+  if (!isInHand(player)) {
+    return { ok: false, error: '你已退出本局' };
+  }
+
+  const evaluation = evaluateHand(player.hand);
+
+  if (player.hasLooked) {
+    const handType = player.handType ?? evaluation.handType;
+    return {
+      ok: true,
+      hand: player.hand,
+      handType,
+      handTypeDisplay: HAND_TYPE_DISPLAY[handType],
+    };
+  }
+
+  player.hasLooked = true;
+  player.status = 'LOOKED';
+  player.handType = evaluation.handType;
+  player.handRank = evaluation.handRank;
+
+  appendAction(
+    table,
+    { userId, actionType: 'LOOK', amount: 0, targetUserId: null, compareResult: null },
+    createdAt
+  );
+
+  return {
+    ok: true,
+    hand: player.hand,
+    handType: evaluation.handType,
+    handTypeDisplay: HAND_TYPE_DISPLAY[evaluation.handType],
+  };
+}
+
+/**
+ * 跟注 / 加注 / 全押 / 弃牌
+ */
+export function applyBettingToTable(
+  table: LiveTable,
+  userId: string,
+  actionType: BettingActionType,
+  amount?: number,
+  createdAt: Date = new Date()
+): ApplyBettingActionResult {
+  if (table.status !== 'BETTING') {
+    return { ok: false, error: '游戏不在下注阶段' };
+  }
+
+  if (table.currentTurn !== userId) {
+    return { ok: false, error: '不是你的回合' };
+  }
+
+  const player = table.players.find((p) => p.userId === userId);
+  if (!player) {
+    return { ok: false, error: '你不在该游戏中' };
+  }
+
+  if (!isInHand(player)) {
+    return { ok: false, error: '你已退出本局' };
+  }
+
+  let betAmount = 0;
+  let newStatus: PlayerStatus = player.status;
+  let newAnte = table.currentAnte;
+  const currentChips = player.chips;
+
+  switch (actionType) {
+    case 'CALL': {
+      betAmount = player.hasLooked ? table.currentAnte * 2 : table.currentAnte;
+      if (currentChips < betAmount) {
+        return { ok: false, error: '筹码不足' };
+      }
+      break;
+    }
+
+    case 'RAISE': {
+      if (amount == null) {
+        return { ok: false, error: '加注必须指定金额' };
+      }
+      const minBet = player.hasLooked ? table.currentAnte * 2 : table.currentAnte;
+      const maxBet = table.currentAnte * BET_MULTIPLIER.MAX_RAISE;
+      if (amount < minBet || amount > maxBet) {
+        return { ok: false, error: `加注金额必须在 ${minBet} - ${maxBet} 之间` };
+      }
+      if (currentChips < amount) {
+        return { ok: false, error: '筹码不足' };
+      }
+      betAmount = amount;
+      newAnte = amount;
+      break;
+    }
+
+    case 'ALL_IN': {
+      betAmount = currentChips;
+      newStatus = 'ALL_IN';
+      break;
+    }
+
+    case 'FOLD': {
+      newStatus = 'FOLDED';
+      break;
+    }
+
+    default:
+      return { ok: false, error: '无效操作类型' };
+  }
+
+  const actionRound = table.currentRound;
+  const newPot = table.pot + betAmount;
+
+  appendAction(
+    table,
+    { userId, actionType, amount: betAmount, targetUserId: null, compareResult: null },
+    createdAt
+  );
+
+  player.status = newStatus;
+  player.totalBet += betAmount;
+  player.chips -= betAmount;
+
+  const activePlayers = table.players.filter(isInHand);
+
+  let gameOver = false;
+  let winnerId: string | undefined;
+
+  if (activePlayers.length === 1) {
+    gameOver = true;
+    winnerId = activePlayers[0].userId;
+  }
+
+  if (!gameOver) {
+    const playableCount = activePlayers.filter((p) => p.status !== 'ALL_IN').length;
+    if (playableCount <= 1 && activePlayers.length > 1) {
+      gameOver = true;
+      winnerId = findBestPlayer(activePlayers).userId;
+    }
+  }
+
+  let nextTurn: string | null = null;
+  if (!gameOver) {
+    nextTurn = getNextActivePlayer(table.players, userId);
+
+    const nextPlayer = table.players.find((p) => p.userId === nextTurn);
+    if (nextPlayer && nextPlayer.seatIndex <= player.seatIndex) {
+      if (table.currentRound + 1 > table.maxRounds) {
+        gameOver = true;
+        winnerId = findBestPlayer(activePlayers).userId;
+      } else {
+        table.currentRound++;
+      }
+    }
+  }
+
+  table.pot = newPot;
+  if (gameOver && winnerId) {
+    finishTable(table, winnerId);
+  } else {
+    table.currentAnte = newAnte;
+    table.currentTurn = nextTurn;
+  }
+
+  return {
+    ok: true,
+    data: {
+      actionType,
+      amount: betAmount,
+      pot: newPot,
+      currentAnte: newAnte,
+      currentTurn: gameOver ? null : nextTurn,
+      round: actionRound,
+      playerStatus: newStatus,
+      remainingChips: gameOver ? settledChips(table, player) : player.chips,
+      gameOver,
+    },
+  };
+}
+
+/**
+ * 比牌
+ */
+export function applyCompareToTable(
+  table: LiveTable,
+  userId: string,
+  targetUserId: string,
+  createdAt: Date = new Date()
+): ApplyCompareResult {
+  if (table.status !== 'BETTING') {
+    return { ok: false, error: '游戏不在下注阶段' };
+  }
+
+  if (table.currentTurn !== userId) {
+    return { ok: false, error: '不是你的回合' };
+  }
+
+  const initiator = table.players.find((p) => p.userId === userId);
+  const target = table.players.find((p) => p.userId === targetUserId);
+
+  if (!initiator || !target) {
+    return { ok: false, error: '玩家不在游戏中' };
+  }
+
+  if (!initiator.hasLooked) {
+    return { ok: false, error: '未看牌不能主动发起比牌' };
+  }
+
+  if (!isInHand(target)) {
+    return { ok: false, error: '目标玩家已退出' };
+  }
+
+  const cost = table.currentAnte * BET_MULTIPLIER.COMPARE_COST;
+  if (initiator.chips < cost) {
+    return { ok: false, error: '筹码不足以发起比牌' };
+  }
+
+  const initiatorEval = evaluateHand(initiator.hand);
+  const targetEval = evaluateHand(target.hand);
+  const initiatorWins = compareHands(initiator.hand, target.hand) > 0;
+  const winnerId = initiatorWins ? userId : targetUserId;
+  const loserId = initiatorWins ? targetUserId : userId;
+
+  initiator.chips -= cost;
+  initiator.totalBet += cost;
+  table.pot += cost;
+  if (initiatorWins) {
+    target.status = 'OUT';
+  } else {
+    initiator.status = 'OUT';
+  }
+
+  appendAction(
+    table,
+    { userId, actionType: 'COMPARE', amount: cost, targetUserId, compareResult: initiatorWins },
+    createdAt
+  );
+
+  const activePlayers = table.players.filter(isInHand);
+  const gameOver = activePlayers.length <= 1;
+  let nextTurn: string | null = null;
+
+  if (gameOver) {
+    finishTable(table, activePlayers.length === 1 ? activePlayers[0].userId : winnerId);
+  } else {
+    nextTurn = getNextActivePlayer(table.players, userId);
+    table.currentTurn = nextTurn;
+  }
+
+  return {
+    ok: true,
+    data: {
+      initiator: {
+        userId,
+        handType: initiatorEval.handType,
+        handTypeDisplay: HAND_TYPE_DISPLAY[initiatorEval.handType],
+      },
+      target: {
+        userId: targetUserId,
+        handType: targetEval.handType,
+        handTypeDisplay: HAND_TYPE_DISPLAY[targetEval.handType],
+      },
+      winnerId,
+      loserId,
+      cost,
+      pot: table.pot,
+      currentTurn: gameOver ? null : nextTurn,
+      gameOver,
+    },
+  };
+}
+
+/**
+ * 按开局状态重建牌桌并回放操作日志（崩溃恢复）
+ * 开局状态：每人已下底注、第 1 轮、庄家下一位先手
+ */
+export function replayTable(
+  initial: Omit<
+    LiveTable,
+    'status' | 'pot' | 'currentAnte' | 'currentRound' | 'currentTurn' | 'winnerId' | 'actions' | 'flushedActionCount' | 'settled'
+  >,
+  actions: LiveTableAction[]
+): LiveTable {
+  const players = initial.players.map((p) => ({
+    ...p,
+    status: 'PLAYING' as PlayerStatus,
+    hasLooked: false,
+    totalBet: initial.baseAnte,
+    chips: p.chipsBeforeGame - initial.baseAnte,
+  }));
+
+  const table: LiveTable = {
+    ...initial,
+    players,
+    status: 'BETTING',
+    pot: initial.baseAnte * players.length,
+    currentAnte: initial.baseAnte,
+    currentRound: 1,
+    currentTurn: players[(initial.dealerIndex + 1) % players.length]?.userId ?? null,
+    winnerId: null,
+    actions: [],
+    flushedActionCount: 0,
+    settled: false,
+  };
+
+  for (const action of actions) {
+    let result: { ok: boolean; error?: string };
+    switch (action.actionType) {
+      case 'LOOK':
+        result = applyLookToTable(table, action.userId, action.createdAt);
+        break;
+      case 'COMPARE':
+        result = applyCompareToTable(
+          table,
+          action.userId,
+          action.targetUserId ?? '',
+          action.createdAt
+        );
+        break;
+      default:
+        result = applyBettingToTable(
+          table,
+          action.userId,
+          action.actionType,
+          action.actionType === 'RAISE' ? action.amount : undefined,
+          action.createdAt
+        );
+    }
+    if (!result.ok) {
+      throw new Error(`操作日志回放失败（${action.actionType}）：${result.error}`);
+    }
+  }
+
+  table.flushedActionCount = table.actions.length;
+  return table;
+}
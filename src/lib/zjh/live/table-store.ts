@@ -0,0 +1,315 @@
+/**
+ * 内存权威牌桌存储（write-behind 持久化）
+ *
+ * 开启 ZJH_LIVE_TABLES=true 后，进行中的牌局以进程内存中的 LiveTable 为准：
+ * - 操作在内存中校验并执行，不再逐条读写数据库
+ * - ZjhGameAction 在本次请求响应后（after）批量写入（createMany），牌局结束时在响应前写回快照并结算
+ * - 进程重启后首次访问某局时，从开局状态回放已落库的操作日志恢复
+ *
+ * 注意：内存状态按进程隔离，需要按 gameId 做会话粘滞的常驻进程；
+ * Serverless 平台（如 Vercel）没有实例粘滞、响应后进程会被冻结，此时始终使用数据库模式
+ */
+
+import { after } from 'next/server';
+import { prisma } from '@/lib/prisma';
+import { settleGameInDb } from '@/lib/zjh/settle';
+import { publishRoomUpdate } from '@/lib/zjh/events';
+import { syncRoomSeats } from '@/lib/zjh/matchmaking/queue';
+import { replayTable } from './table-state';
+import type { LiveTable, LiveTableAction } from './table-state';
+import type { ActionType, Card, HandType, PlayerStatus } from '@/types/zjh';
+import type { ZjhActionType, ZjhHandType, ZjhPlayerStatus } from '@prisma/client';
+
+/** 请求上下文之外（或落库失败重试）时的批量落库间隔（毫秒），仅对常驻进程有效 */
+const FLUSH_INTERVAL_MS = 200;
+
+/** 已结算牌局在内存中保留的时间（毫秒），便于客户端读取最终状态 */
+const SETTLED_TABLE_TTL_MS = 60_000;
+
+interface LiveTableRegistry {
+  tables: Map<string, LiveTable>;
+  loading: Map<string, Promise<LiveTable | null>>;
+  flushing: Map<string, Promise<void>>;
+  dirty: Set<string>;
+  timer: ReturnType<typeof setTimeout> | null;
+}
+
+const globalForLiveTables = globalThis as unknown as {
+  zjhLiveTables: LiveTableRegistry | undefined;
+};
+
+const registry: LiveTableRegistry =
+  globalForLiveTables.zjhLiveTables ??
+  (globalForLiveTables.zjhLiveTables = {
+    tables: new Map(),
+    loading: new Map(),
+    flushing: new Map(),
+    dirty: new Set(),
+    timer: null,
+  });
+
+let warnedServerless = false;
+
+/**
+ * 是否启用内存权威牌桌模式
+ * Serverless 部署没有实例粘滞，同一局的请求可能落到不同实例上，因此即使开启也退回数据库模式
+ */
+export function isLiveTableMode(): boolean {
+  if (process.env.ZJH_LIVE_TABLES !== 'true') return false;
+  if (process.env.VERCEL) {
+    if (!warnedServerless) {
+      warnedServerless = true;
+      console.warn('ZJH_LIVE_TABLES 需要常驻进程与会话粘滞，Serverless 环境下已改用数据库模式');
+    }
+    return false;
+  }
+  return true;
+}
+
+/**
+ * 从数据库加载牌局并回放操作日志
+ */
+async function restoreLiveTable(gameId: string): Promise<LiveTable | null> {
+  const game = await prisma.zjhGame.findUnique({
+    where: { id: gameId },
+    include: {
+      room: true,
+      players: { orderBy: { seatIndex: 'asc' } },
+      actions: { orderBy: [{ round: 'asc' }, { actionOrder: 'asc' }, { createdAt: 'asc' }] },
+    },
+  });
+
+  if (!game || game.status !== 'BETTING') {
+    return null;
+  }
+
+  const actions: LiveTableAction[] = game.actions.map((a) => ({
+    userId: a.userId,
+    round: a.round,
+    actionOrder: a.actionOrder,
+    actionType: a.actionType as ActionType,
+    amount: a.amount,
+    targetUserId: a.targetUserId,
+    compareResult: a.compareResult,
+    createdAt: a.createdAt,
+  }));
+
+  return replayTable(
+    {
+      gameId: game.id,
+      roomId: game.roomId,
+      dealerIndex: game.dealerIndex,
+      baseAnte: game.room.baseAnte,
+      maxRounds: game.room.maxRounds,
+      players: game.players.map((p) => ({
+        id: p.id,
+        userId: p.userId,
+        seatIndex: p.seatIndex,
+        status: p.status as PlayerStatus,
+        hand: p.hand as unknown as Card[],
+        handType: p.handType as HandType | null,
+        handRank: p.handRank,
+        hasLooked: p.hasLooked,
+        totalBet: p.totalBet,
+        chipsBeforeGame: p.chipsBeforeGame,
+        chips: p.chipsBeforeGame - p.totalBet,
+      })),
+    },
+    actions
+  );
+}
+
+/**
+ * 获取内存牌桌，不存在时从数据库恢复
+ * 并发请求共享同一次加载；牌局不存在或不在下注阶段时返回 null
+ */
+export async function getLiveTable(gameId: string): Promise<LiveTable | null> {
+  const cached = registry.tables.get(gameId);
+  if (cached) return cached;
+
+  let pending = registry.loading.get(gameId);
+  if (!pending) {
+    pending = restoreLiveTable(gameId)
+      .then((table) => {
+        if (table) {
+          registry.tables.set(gameId, table);
+          // 回放后发现牌局已结束但尚未结算（崩溃发生在结算前）：补做结算
+          if (table.status === 'SETTLEMENT') void markLiveTableDirty(table);
+        }
+        return table;
+      })
+      .finally(() => {
+        registry.loading.delete(gameId);
+      });
+    registry.loading.set(gameId, pending);
+  }
+  return pending;
+}
+
+/**
+ * 仅读取已在内存中的牌桌（不触发加载）
+ */
+export function peekLiveTable(gameId: string): LiveTable | null {
+  return registry.tables.get(gameId) ?? null;
+}
+
+/**
+ * 标记牌桌有待落库的变更
+ * 牌局结束时在返回前落库并结算；否则在本次请求响应后落库
+ */
+export async function markLiveTableDirty(table: LiveTable): Promise<void> {
+  registry.dirty.add(table.gameId);
+  if (table.status === 'SETTLEMENT') {
+    await flushLiveTable(table.gameId);
+    return;
+  }
+  scheduleFlush(table.gameId);
+}
+
+/**
+ * 安排落库：优先挂到当前请求的 after() 上，由平台保证在响应后执行完毕；
+ * 不在请求上下文中时合并到下一个定时批次
+ */
+function scheduleFlush(gameId: string): void {
+  try {
+    after(() => flushLiveTable(gameId));
+    return;
+  } catch {
+    // 不在请求上下文中
+  }
+  scheduleBatchFlush();
+}
+
+/**
+ * 合并到下一个定时落库批次（请求上下文之外、落库失败重试）
+ */
+function scheduleBatchFlush(): void {
+  if (!registry.timer) {
+    registry.timer = setTimeout(() => {
+      registry.timer = null;
+      void flushAllLiveTables();
+    }, FLUSH_INTERVAL_MS);
+  }
+}
+
+/**
+ * 将牌桌快照写回 ZjhGame / ZjhGamePlayer / ZjhRoomPlayer（单事务）
+ */
+async function writeCheckpoint(table: LiveTable): Promise<void> {
+  await prisma.$transaction([
+    prisma.zjhGame.update({
+      where: { id: table.gameId },
+      data: {
+        pot: table.pot,
+        currentAnte: table.currentAnte,
+        currentRound: table.currentRound,
+        currentTurn: table.currentTurn,
+      },
+    }),
+    ...table.players.map((p) =>
+      prisma.zjhGamePlayer.update({
+        where: { id: p.id },
+        data: {
+          status: p.status as ZjhPlayerStatus,
+          hasLooked: p.hasLooked,
+          totalBet: p.totalBet,
+          handType: p.handType as ZjhHandType | null,
+          handRank: p.handRank,
+        },
+      })
+    ),
+    ...table.players.map((p) =>
+      prisma.zjhRoomPlayer.updateMany({
+        where: { roomId: table.roomId, userId: p.userId, leftAt: null },
+        data: { chips: Math.max(0, p.chips) },
+      })
+    ),
+  ]);
+}
+
+async function doFlush(table: LiveTable, checkpoint: boolean): Promise<void> {
+  const end = table.actions.length;
+  const pending = table.actions.slice(table.flushedActionCount, end);
+
+  if (pending.length > 0) {
+    await prisma.zjhGameAction.createMany({
+      data: pending.map((a) => ({
+        gameId: table.gameId,
+        userId: a.userId,
+        round: a.round,
+        actionOrder: a.actionOrder,
+        actionType: a.actionType as ZjhActionType,
+        amount: a.amount,
+        targetUserId: a.targetUserId,
+        compareResult: a.compareResult,
+        createdAt: a.createdAt,
+      })),
+    });
+    table.flushedActionCount = end;
+  }
+
+  if (table.status === 'SETTLEMENT' && !table.settled && table.winnerId) {
+    await writeCheckpoint(table);
+    await settleGameInDb(table.gameId, table.roomId, table.winnerId, table.pot, table.currentRound);
+    table.settled = true;
+    publishRoomUpdate(table.roomId);
+    void syncRoomSeats(table.roomId);
+
+    const gameId = table.gameId;
+    setTimeout(() => {
+      if (registry.tables.get(gameId) === table) registry.tables.delete(gameId);
+    }, SETTLED_TABLE_TTL_MS).unref?.();
+    return;
+  }
+
+  if (checkpoint) {
+    await writeCheckpoint(table);
+  }
+}
+
+/**
+ * 落库单个牌桌的待写操作；同一牌桌的落库串行执行
+ * @param checkpoint 是否同时写回进行中的快照（供依赖数据库状态的读取方使用）
+ */
+export async function flushLiveTable(gameId: string, checkpoint = false): Promise<void> {
+  const table = registry.tables.get(gameId);
+  if (!table) return;
+
+  const previous = registry.flushing.get(gameId) ?? Promise.resolve();
+  const next = previous
+    .catch(() => undefined)
+    .then(() => {
+      registry.dirty.delete(gameId);
+      return doFlush(table, checkpoint);
+    })
+    .catch((error) => {
+      // 落库失败：保留待写操作，下个批次重试
+      console.error('牌桌落库失败:', gameId, error);
+      registry.dirty.add(gameId);
+      scheduleBatchFlush();
+    });
+
+  registry.flushing.set(gameId, next);
+  await next;
+  if (registry.flushing.get(gameId) === next) {
+    registry.flushing.delete(gameId);
+  }
+}
+
+/**
+ * 落库所有有变更的牌桌
+ */
+export async function flushAllLiveTables(): Promise<void> {
+  const gameIds = [...registry.dirty];
+  await Promise.all(gameIds.map((gameId) => flushLiveTable(gameId)));
+}
+
+/**
+ * 落库某个房间下的所有牌桌（开始新一局等依赖数据库状态的操作前调用）
+ */
+export async function flushLiveTablesForRoom(roomId: string, checkpoint = false): Promise<void> {
+  const gameIds = [...registry.tables.values()]
+    .filter((t) => t.roomId === roomId)
+    .map((t) => t.gameId);
+  await Promise.all(gameIds.map((gameId) => flushLiveTable(gameId, checkpoint)));
+}
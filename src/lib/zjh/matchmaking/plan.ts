@@ -0,0 +1,87 @@
+/**
+ * 快速匹配规则（纯函数）：入场筹码分档、批次组桌、空位计算
+ */
+
+/** 快速匹配的入场筹码档位（房间 minChips），从低到高 */
+export const MATCH_TIERS = [100, 1_000, 10_000, 100_000] as const;
+
+export function isMatchTier(minChips: number): boolean {
+  return (MATCH_TIERS as readonly number[]).includes(minChips);
+}
+
+/**
+ * 玩家所在档位：不超过其筹码的最高一档；筹码低于最低档时归入最低档
+ */
+export function tierForChips(chips: number): number {
+  let tier: number = MATCH_TIERS[0];
+  for (const t of MATCH_TIERS) {
+    if (chips >= t) tier = t;
+  }
+  return tier;
+}
+
+/**
+ * 认领已有房间空位时依次尝试的档位：先本档位，再从高到低尝试更低的档位（筹码都满足其入场要求）
+ * 都没有空位时才按本档位开新房，避免低档位房间（如默认 100 的自建房）只剩少数玩家能匹配到
+ */
+export function claimTiers(tier: number): number[] {
+  return MATCH_TIERS.filter((t) => t <= tier).reverse();
+}
+
+/**
+ * 把一批玩家分到新牌桌：先凑满整桌，余下的人坐最后一桌
+ * @returns 每桌人数，如 14 人、每桌 6 人 → [6, 6, 2]
+ */
+export function splitIntoTables(count: number, maxPlayers: number): number[] {
+  const tables: number[] = [];
+  for (let left = count; left > 0; left -= maxPlayers) {
+    tables.push(Math.min(left, maxPlayers));
+  }
+  return tables;
+}
+
+/**
+ * 房间内可分配的座位号（升序）
+ * @param takenSeats 已有记录的座位号；(roomId, seatIndex) 唯一约束包含已离开的玩家，所以这些座位也不可再用
+ */
+export function freeSeats(takenSeats: number[], maxPlayers: number): number[] {
+  const taken = new Set(takenSeats);
+  const seats: number[] = [];
+  for (let seat = 0; seat < maxPlayers; seat++) {
+    if (!taken.has(seat)) seats.push(seat);
+  }
+  return seats;
+}
+
+/**
+ * 合并同一批次内同一用户的重复请求（如重复点击），保持首次到达的顺序
+ */
+export function groupByUser<T extends { userId: string }>(requests: T[]): T[][] {
+  const groups = new Map<string, T[]>();
+  for (const request of requests) {
+    const group = groups.get(request.userId);
+    if (group) group.push(request);
+    else groups.set(request.userId, [request]);
+  }
+  return [...groups.values()];
+}
+
+/**
+ * 把认领到的座位分给批次中可以入座的玩家
+ * (roomId, userId) 唯一约束包含已离开的玩家，曾在该房间坐过的人（如换桌后再匹配）不能再入座
+ * @param pastMembers 批次中在该房间有过记录的用户
+ * @returns 入座的玩家（与 seats 前若干个一一对应）、仍在等待的玩家、未用上的座位
+ */
+export function assignClaimedSeats<T extends { userId: string }>(
+  waiting: T[],
+  seats: number[],
+  pastMembers: ReadonlySet<string>
+): { seated: T[]; waiting: T[]; unusedSeats: number[] } {
+  const seated: T[] = [];
+  const rest: T[] = [];
+  for (const player of waiting) {
+    if (seated.length < seats.length && !pastMembers.has(player.userId)) seated.push(player);
+    else rest.push(player);
+  }
+  return { seated, waiting: rest, unusedSeats: seats.slice(seated.length) };
+}
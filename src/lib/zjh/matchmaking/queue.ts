@@ -0,0 +1,566 @@
+/**
+ * 炸金花快速匹配队列
+ *
+ * Redis 中按入场筹码档位维护空位索引（key 带 {档位} 哈希标签，同档位的 key 落在同一槽位）：
+ * - zjh:match:{tier}:rooms          ZSET，member 为房间 ID，score 为空位数
+ * - zjh:match:{tier}:seats:<房间ID>  ZSET，空闲座位号，带 TTL，长时间无人同步的房间自动退出匹配
+ *
+ * 同一档位在 ZJH_MATCH_WINDOW_MS 内到达的玩家合并为一批：
+ * 1. Lua 脚本原子认领已有房间的空位（优先空位最少、即人最多的房间），只把认领到的座位写库；
+ *    本档位没有空位时再从高到低认领更低档位的房间
+ * 2. 仍未入座的玩家按本档位整桌开新房，未坐满的座位登记回索引
+ * 曾在房间中坐过的玩家不会再被分到该房间（唯一约束包含已离开的记录），用不上的座位归还索引
+ * 写库冲突（房间已开局、座位已被占）时按数据库重建该房间的索引，本批次换别的房间重试
+ * Redis 不可用时退化为直接查表匹配
+ */
+
+import { Prisma } from '@prisma/client';
+import { prisma } from '@/lib/prisma';
+import { redis } from '@/lib/redis';
+import { publishRoomUpdate } from '@/lib/zjh/events';
+import { generateRoomCode, assignSeat } from '@/lib/zjh/room-manager';
+import { DEFAULT_ROOM_CONFIG, INITIAL_CHIPS } from '@/lib/zjh/constants';
+import { ensureUserById } from '@/lib/user/ensure-user';
+import {
+  assignClaimedSeats,
+  claimTiers,
+  freeSeats,
+  groupByUser,
+  isMatchTier,
+  splitIntoTables,
+  tierForChips,
+} from './plan';
+
+const KEY_PREFIX = 'zjh:match:';
+
+/** 批次窗口（毫秒）；凑够一整桌时立即处理 */
+const MATCH_WINDOW_MS = Number.parseInt(process.env.ZJH_MATCH_WINDOW_MS || '100', 10);
+
+/** 房间空位集合的 TTL（秒），每次同步时刷新 */
+const ROOM_SEATS_TTL_SECONDS = 30 * 60;
+
+/** 一个批次内认领空位的写库冲突上限，超过后其余玩家直接开新房 */
+const MAX_CLAIM_CONFLICTS = 3;
+
+/** 生成房间号的重试次数 */
+const ROOM_CODE_ATTEMPTS = 10;
+
+/**
+ * 认领空位：取空位数最少的房间，弹出至多 ARGV[1] 个座位号
+ * 跳过本批次已排除的房间；座位集合已过期的房间移出索引后继续找下一间
+ * KEYS[1] = 档位索引，ARGV = [需要的座位数, 座位集合 key 前缀, 排除的房间 ID...]
+ * 返回 [房间 ID, 座位号...]，没有可用房间时返回 nil
+ */
+const CLAIM_SEATS_SCRIPT = `
+local excluded = {}
+for i = 3, #ARGV do
+  excluded[ARGV[i]] = true
+end
+local offset = 0
+while true do
+  local rooms = redis.call('ZRANGEBYSCORE', KEYS[1], 1, '+inf', 'LIMIT', offset, 1)
+  if #rooms == 0 then
+    return false
+  end
+  local roomId = rooms[1]
+  if excluded[roomId] then
+    offset = offset + 1
+  else
+    local seatsKey = ARGV[2] .. roomId
+    local popped = redis.call('ZPOPMIN', seatsKey, ARGV[1])
+    if #popped > 0 then
+      local left = redis.call('ZCARD', seatsKey)
+      if left == 0 then
+        redis.call('ZREM', KEYS[1], roomId)
+      else
+        redis.call('ZADD', KEYS[1], left, roomId)
+      end
+      local result = { roomId }
+      for i = 1, #popped, 2 do
+        result[#result + 1] = popped[i]
+      end
+      return result
+    end
+    redis.call('ZREM', KEYS[1], roomId)
+  end
+end
+`;
+
+/**
+ * 归还认领后未用上的座位
+ * KEYS[1] = 档位索引，KEYS[2] = 房间座位集合，ARGV = [房间 ID, TTL 秒, 座位号...]
+ */
+const RELEASE_SEATS_SCRIPT = `
+for i = 3, #ARGV do
+  redis.call('ZADD', KEYS[2], ARGV[i], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+redis.call('ZADD', KEYS[1], redis.call('ZCARD', KEYS[2]), ARGV[1])
+return 1
+`;
+
+/**
+ * 整体替换一个房间的空位；没有空位时移出索引
+ * KEYS[1] = 档位索引，KEYS[2] = 房间座位集合，ARGV = [房间 ID, TTL 秒, 座位号...]
+ */
+const SET_ROOM_SEATS_SCRIPT = `
+redis.call('DEL', KEYS[2])
+local count = #ARGV - 2
+if count <= 0 then
+  redis.call('ZREM', KEYS[1], ARGV[1])
+  return 0
+end
+for i = 3, #ARGV do
+  redis.call('ZADD', KEYS[2], ARGV[i], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+redis.call('ZADD', KEYS[1], count, ARGV[1])
+return count
+`;
+
+export interface MatchResult {
+  roomId: string;
+  roomCode: string;
+  isNewRoom: boolean;
+  seatIndex: number;
+}
+
+export type MatchPlayerResult =
+  | { ok: true; data: MatchResult }
+  | { ok: false; error: string };
+
+/** 待入座的玩家：入座时带入当前筹码 */
+interface MatchSeat {
+  userId: string;
+  chips: number;
+}
+
+interface MatchRequest extends MatchSeat {
+  resolve: (result: MatchPlayerResult) => void;
+  reject: (error: unknown) => void;
+}
+
+interface TierQueue {
+  pending: MatchRequest[];
+  timer: ReturnType<typeof setTimeout> | null;
+  flushing: boolean;
+}
+
+const globalForMatchQueue = globalThis as unknown as {
+  zjhMatchQueues: Map<number, TierQueue> | undefined;
+};
+
+const queues: Map<number, TierQueue> =
+  globalForMatchQueue.zjhMatchQueues ?? (globalForMatchQueue.zjhMatchQueues = new Map());
+
+export function tierIndexKey(tier: number): string {
+  return `${KEY_PREFIX}{${tier}}:rooms`;
+}
+
+function roomSeatsKeyPrefix(tier: number): string {
+  return `${KEY_PREFIX}{${tier}}:seats:`;
+}
+
+export function roomSeatsKey(tier: number, roomId: string): string {
+  return `${roomSeatsKeyPrefix(tier)}${roomId}`;
+}
+
+function isRedisReady(): boolean {
+  return redis.status === 'ready';
+}
+
+function isUniqueViolation(error: unknown): boolean {
+  return error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2002';
+}
+
+async function setRoomSeats(tier: number, roomId: string, seats: number[]): Promise<void> {
+  await redis.eval(
+    SET_ROOM_SEATS_SCRIPT,
+    2,
+    tierIndexKey(tier),
+    roomSeatsKey(tier, roomId),
+    roomId,
+    ROOM_SEATS_TTL_SECONDS,
+    ...seats
+  );
+}
+
+/**
+ * 按数据库重建房间的空位索引：仅等待中、有人在座的房间参与匹配
+ * 在房间人员或状态变化后调用（加入、离开、结算回到等待）；失败只记录日志
+ */
+export async function syncRoomSeats(roomId: string): Promise<void> {
+  if (!isRedisReady()) return;
+  try {
+    const room = await prisma.zjhRoom.findUnique({
+      where: { id: roomId },
+      select: {
+        status: true,
+        minChips: true,
+        maxPlayers: true,
+        players: { select: { seatIndex: true, leftAt: true } },
+      },
+    });
+    if (!room || !isMatchTier(room.minChips)) return;
+
+    const joinable = room.status === 'WAITING' && room.players.some((p) => p.leftAt === null);
+    const seats = joinable
+      ? freeSeats(room.players.map((p) => p.seatIndex), room.maxPlayers)
+      : [];
+    await setRoomSeats(room.minChips, roomId, seats);
+  } catch (error) {
+    console.error('同步匹配空位失败:', roomId, error);
+  }
+}
+
+/**
+ * 房间不再可加入（开局、关闭）时移出匹配索引
+ */
+export async function removeRoomFromQueue(roomId: string, minChips: number): Promise<void> {
+  if (!isRedisReady() || !isMatchTier(minChips)) return;
+  try {
+    await setRoomSeats(minChips, roomId, []);
+  } catch (error) {
+    console.error('移出匹配索引失败:', roomId, error);
+  }
+}
+
+async function claimSeats(
+  tier: number,
+  count: number,
+  excludedRooms: ReadonlySet<string>
+): Promise<{ roomId: string; seats: number[] } | null> {
+  try {
+    const claimed = (await redis.eval(
+      CLAIM_SEATS_SCRIPT,
+      1,
+      tierIndexKey(tier),
+      count,
+      roomSeatsKeyPrefix(tier),
+      ...excludedRooms
+    )) as string[] | null;
+    if (!claimed) return null;
+    return { roomId: claimed[0], seats: claimed.slice(1).map(Number) };
+  } catch (error) {
+    // 认领失败时这一批全部开新房，不影响匹配结果
+    console.error('认领匹配空位失败:', error);
+    return null;
+  }
+}
+
+async function releaseSeats(tier: number, roomId: string, seats: number[]): Promise<void> {
+  if (seats.length === 0) return;
+  try {
+    await redis.eval(
+      RELEASE_SEATS_SCRIPT,
+      2,
+      tierIndexKey(tier),
+      roomSeatsKey(tier, roomId),
+      roomId,
+      ROOM_SEATS_TTL_SECONDS,
+      ...seats
+    );
+  } catch (error) {
+    // 座位留在数据库中仍是空的，下次同步该房间时会重新登记
+    console.error('归还匹配空位失败:', roomId, error);
+  }
+}
+
+/**
+ * 批次中在该房间有过记录（含已离开）的用户
+ */
+async function findPastMembers(roomId: string, players: MatchSeat[]): Promise<Set<string>> {
+  const rows = await prisma.zjhRoomPlayer.findMany({
+    where: { roomId, userId: { in: players.map((p) => p.userId) } },
+    select: { userId: true },
+  });
+  return new Set(rows.map((r) => r.userId));
+}
+
+/**
+ * 把认领到的座位写入数据库；房间已不在等待中或座位冲突时整体回滚并抛错
+ * @returns 房间号
+ */
+async function writeClaimedSeats(
+  roomId: string,
+  players: MatchSeat[],
+  seats: number[]
+): Promise<string> {
+  return prisma.$transaction(async (tx) => {
+    const room = await tx.zjhRoom.update({
+      where: { id: roomId, status: 'WAITING' },
+      data: { currentPlayers: { increment: players.length } },
+      select: { roomCode: true },
+    });
+    await tx.zjhRoomPlayer.createMany({
+      data: players.map((p, i) => ({
+        roomId,
+        userId: p.userId,
+        seatIndex: seats[i],
+        chips: p.chips,
+      })),
+    });
+    return room.roomCode;
+  });
+}
+
+/**
+ * 为一组玩家开新房，座位号按到达顺序从 0 起；第一位玩家为房主
+ * @returns 房间，房间号重试用尽时返回 null
+ */
+async function createMatchedRoom(
+  tier: number,
+  players: MatchSeat[]
+): Promise<{ id: string; roomCode: string } | null> {
+  for (let attempt = 0; attempt < ROOM_CODE_ATTEMPTS; attempt++) {
+    try {
+      return await prisma.zjhRoom.create({
+        data: {
+          roomCode: generateRoomCode(),
+          ownerId: players[0].userId,
+          maxPlayers: DEFAULT_ROOM_CONFIG.maxPlayers,
+          baseAnte: DEFAULT_ROOM_CONFIG.baseAnte,
+          maxRounds: DEFAULT_ROOM_CONFIG.maxRounds,
+          turnTimeout: DEFAULT_ROOM_CONFIG.turnTimeout,
+          minChips: tier,
+          currentPlayers: players.length,
+          players: {
+            createMany: {
+              data: players.map((p, seatIndex) => ({
+                userId: p.userId,
+                seatIndex,
+                chips: p.chips,
+              })),
+            },
+          },
+        },
+        select: { id: true, roomCode: true },
+      });
+    } catch (error) {
+      // 房间号撞车时换一个重试
+      if (!isUniqueViolation(error)) throw error;
+    }
+  }
+  return null;
+}
+
+/**
+ * 处理一个批次：先填已有房间的空位（本档位优先，再到更低档位），再按整桌开新房
+ */
+async function flushBatch(tier: number, batch: MatchRequest[]): Promise<void> {
+  const groups = groupByUser(batch);
+  const pending = new Map(groups.map((group) => [group[0].userId, group]));
+  const finish = (player: MatchSeat, result: MatchPlayerResult) => {
+    for (const request of pending.get(player.userId) ?? []) request.resolve(result);
+    pending.delete(player.userId);
+  };
+
+  try {
+    let waiting: MatchSeat[] = groups.map((group) => group[0]);
+
+    // 本批次不再认领的房间：写库冲突过，或剩下的玩家都在其中坐过
+    const excludedRooms = new Set<string>();
+    let conflicts = 0;
+    for (const claimTier of claimTiers(tier)) {
+      while (waiting.length > 0 && conflicts < MAX_CLAIM_CONFLICTS) {
+        const claim = await claimSeats(claimTier, waiting.length, excludedRooms);
+        if (!claim) break;
+
+        const assigned = assignClaimedSeats(
+          waiting,
+          claim.seats,
+          await findPastMembers(claim.roomId, waiting)
+        );
+        if (assigned.unusedSeats.length > 0) {
+          excludedRooms.add(claim.roomId);
+          await releaseSeats(claimTier, claim.roomId, assigned.unusedSeats);
+        }
+        if (assigned.seated.length === 0) continue;
+
+        const seats = claim.seats.slice(0, assigned.seated.length);
+        try {
+          const roomCode = await writeClaimedSeats(claim.roomId, assigned.seated, seats);
+          assigned.seated.forEach((player, i) =>
+            finish(player, {
+              ok: true,
+              data: { roomId: claim.roomId, roomCode, isNewRoom: false, seatIndex: seats[i] },
+            })
+          );
+          waiting = assigned.waiting;
+          publishRoomUpdate(claim.roomId);
+        } catch (error) {
+          // 认领到的座位已从索引弹出：按数据库重建该房间的空位（开局中的房间会被移出）
+          conflicts++;
+          excludedRooms.add(claim.roomId);
+          console.error('写入匹配座位失败，重试:', claim.roomId, error);
+          await syncRoomSeats(claim.roomId);
+        }
+      }
+    }
+
+    for (const size of splitIntoTables(waiting.length, DEFAULT_ROOM_CONFIG.maxPlayers)) {
+      const players = waiting.slice(0, size);
+      waiting = waiting.slice(size);
+
+      const room = await createMatchedRoom(tier, players);
+      if (!room) {
+        for (const player of players) {
+          finish(player, { ok: false, error: '房间号生成失败，请稍后重试' });
+        }
+        continue;
+      }
+      players.forEach((player, seatIndex) =>
+        finish(player, {
+          ok: true,
+          data: { roomId: room.id, roomCode: room.roomCode, isNewRoom: true, seatIndex },
+        })
+      );
+      if (size < DEFAULT_ROOM_CONFIG.maxPlayers && isRedisReady()) {
+        const seats = freeSeats(
+          players.map((_, seatIndex) => seatIndex),
+          DEFAULT_ROOM_CONFIG.maxPlayers
+        );
+        await setRoomSeats(tier, room.id, seats).catch((error) =>
+          console.error('登记匹配空位失败:', room.id, error)
+        );
+      }
+    }
+  } catch (error) {
+    for (const group of pending.values()) {
+      for (const request of group) request.reject(error);
+    }
+  }
+}
+
+/**
+ * 依次处理该档位的批次；处理期间到达的玩家在本批结束后立即处理
+ */
+async function drainQueue(tier: number, queue: TierQueue): Promise<void> {
+  if (queue.flushing) return;
+  queue.flushing = true;
+  try {
+    while (queue.pending.length > 0) {
+      if (queue.timer) {
+        clearTimeout(queue.timer);
+        queue.timer = null;
+      }
+      await flushBatch(tier, queue.pending.splice(0));
+    }
+  } finally {
+    queue.flushing = false;
+  }
+}
+
+function enqueue(tier: number, request: MatchRequest): void {
+  let queue = queues.get(tier);
+  if (!queue) {
+    queue = { pending: [], timer: null, flushing: false };
+    queues.set(tier, queue);
+  }
+  queue.pending.push(request);
+  if (queue.flushing) return;
+
+  const target = queue;
+  if (target.pending.length >= DEFAULT_ROOM_CONFIG.maxPlayers) {
+    if (target.timer) clearTimeout(target.timer);
+    target.timer = null;
+    void drainQueue(tier, target);
+  } else if (!target.timer) {
+    target.timer = setTimeout(() => {
+      target.timer = null;
+      void drainQueue(tier, target);
+    }, MATCH_WINDOW_MS);
+  }
+}
+
+/**
+ * 不经 Redis 的匹配：按本档位、再从高到低的更低档位，查找人数最多、仍有空位的等待中房间，否则开新房
+ */
+export async function matchPlayerDirect(userId: string, chips: number): Promise<MatchPlayerResult> {
+  const tier = tierForChips(chips);
+  for (const claimTier of claimTiers(tier)) {
+    const candidates = await prisma.zjhRoom.findMany({
+      where: {
+        status: 'WAITING',
+        minChips: claimTier,
+        currentPlayers: { lt: DEFAULT_ROOM_CONFIG.maxPlayers },
+      },
+      include: { players: { select: { userId: true, seatIndex: true } } },
+      orderBy: { currentPlayers: 'desc' },
+      take: 5,
+    });
+
+    for (const room of candidates) {
+      if (room.players.some((p) => p.userId === userId)) continue;
+      const seatIndex = assignSeat(
+        room.players.map((p) => p.seatIndex),
+        room.maxPlayers
+      );
+      if (seatIndex === -1) continue;
+
+      try {
+        const roomCode = await writeClaimedSeats(room.id, [{ userId, chips }], [seatIndex]);
+        publishRoomUpdate(room.id);
+        void syncRoomSeats(room.id);
+        return { ok: true, data: { roomId: room.id, roomCode, isNewRoom: false, seatIndex } };
+      } catch (error) {
+        // 并发加入抢到了同一座位，换下一间
+        console.error('加入匹配房间失败，尝试下一间:', room.id, error);
+      }
+    }
+  }
+
+  const room = await createMatchedRoom(tier, [{ userId, chips }]);
+  if (!room) return { ok: false, error: '房间号生成失败，请稍后重试' };
+  void syncRoomSeats(room.id);
+  return {
+    ok: true,
+    data: { roomId: room.id, roomCode: room.roomCode, isNewRoom: true, seatIndex: 0 },
+  };
+}
+
+/**
+ * 快速匹配入口：已在等待中的房间里则直接返回该房间，否则进入所在档位的匹配批次
+ */
+export async function matchPlayer(userId: string): Promise<MatchPlayerResult> {
+  await ensureUserById(userId);
+
+  const [stats, current] = await Promise.all([
+    prisma.zjhPlayerStats.upsert({
+      where: { userId },
+      create: { userId, currentChips: INITIAL_CHIPS },
+      update: {},
+      select: { currentChips: true },
+    }),
+    prisma.zjhRoomPlayer.findFirst({
+      where: { userId, leftAt: null, room: { status: 'WAITING' } },
+      orderBy: { joinedAt: 'desc' },
+      select: { roomId: true, seatIndex: true, room: { select: { roomCode: true } } },
+    }),
+  ]);
+
+  if (current) {
+    return {
+      ok: true,
+      data: {
+        roomId: current.roomId,
+        roomCode: current.room.roomCode,
+        isNewRoom: false,
+        seatIndex: current.seatIndex,
+      },
+    };
+  }
+
+  if (!isRedisReady()) {
+    return matchPlayerDirect(userId, stats.currentChips);
+  }
+
+  return new Promise<MatchPlayerResult>((resolve, reject) => {
+    enqueue(tierForChips(stats.currentChips), {
+      userId,
+      chips: stats.currentChips,
+      resolve,
+      reject,
+    });
+  });
+}
@@ -6,23 +6,13 @@ import { prisma } from '@/lib/prisma';
 import { compareHands } from '@/lib/zjh/hand-evaluator';
 import { BET_MULTIPLIER } from '@/lib/zjh/constants';
 import { settleGameInDb } from '@/lib/zjh/settle';
+import { applyBettingToTable, getNextActivePlayer } from '@/lib/zjh/live/table-state';
+import { getLiveTable, isLiveTableMode, markLiveTableDirty } from '@/lib/zjh/live/table-store';
+import { publishGameUpdate, publishRoomUpdate } from '@/lib/zjh/events';
+import { syncRoomSeats } from '@/lib/zjh/matchmaking/queue';
 import type { ZjhPlayerStatus } from '@prisma/client';
 import type { Card } from '@/types/zjh';
 
-function getNextActivePlayer(
-  players: { userId: string; seatIndex: number; status: string }[],
-  currentUserId: string
-): string | null {
-  const activePlayers = players.filter(
-    (p) => p.status !== 'FOLDED' && p.status !== 'OUT' && p.status !== 'ALL_IN'
-  );
-  if (activePlayers.length === 0) return null;
-
-  const currentIndex = activePlayers.findIndex((p) => p.userId === currentUserId);
-  const nextIndex = (currentIndex + 1) % activePlayers.length;
-  return activePlayers[nextIndex].userId;
-}
-
 export type BettingActionType = 'CALL' | 'RAISE' | 'ALL_IN' | 'FOLD';
 
 export type ApplyBettingActionOk = {
@@ -47,6 +37,16 @@ export async function applyBettingAction(
   actionType: BettingActionType,
   amount?: number
 ): Promise<ApplyBettingActionResult> {
+  const table = isLiveTableMode() ? await getLiveTable(gameId) : null;
+  if (table) {
+    const result = applyBettingToTable(table, userId, actionType, amount);
+    if (result.ok) {
+      await markLiveTableDirty(table);
+      publishGameUpdate(gameId, table);
+    }
+    return result;
+  }
+
   const game = await prisma.zjhGame.findUnique({
     where: { id: gameId },
     include: {
@@ -234,6 +234,7 @@ export async function applyBettingAction(
 
   if (gameOver && winnerId) {
     await settleGameInDb(gameId, game.roomId, winnerId, newPot, game.currentRound);
+    void syncRoomSeats(game.roomId);
   } else {
     await prisma.zjhGame.update({
       where: { id: gameId },
@@ -249,6 +250,9 @@ export async function applyBettingAction(
     where: { roomId: game.roomId, userId, leftAt: null },
   });
 
+  publishGameUpdate(gameId);
+  if (gameOver) publishRoomUpdate(game.roomId);
+
   return {
     ok: true,
     data: {
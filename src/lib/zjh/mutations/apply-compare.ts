@@ -0,0 +1,203 @@
+/**
+ * 比牌逻辑（供 API 与内存牌桌共用）
+ */
+
+import { prisma } from '@/lib/prisma';
+import { compareHands, evaluateHand } from '@/lib/zjh/hand-evaluator';
+import { BET_MULTIPLIER, HAND_TYPE_DISPLAY } from '@/lib/zjh/constants';
+import { settleGameInDb } from '@/lib/zjh/settle';
+import { applyCompareToTable, getNextActivePlayer } from '@/lib/zjh/live/table-state';
+import { getLiveTable, isLiveTableMode, markLiveTableDirty } from '@/lib/zjh/live/table-store';
+import { publishGameUpdate, publishRoomUpdate } from '@/lib/zjh/events';
+import { syncRoomSeats } from '@/lib/zjh/matchmaking/queue';
+import type { Card, HandType } from '@/types/zjh';
+
+export type ApplyCompareOk = {
+  initiator: { userId: string; handType: HandType; handTypeDisplay: string };
+  target: { userId: string; handType: HandType; handTypeDisplay: string };
+  winnerId: string;
+  loserId: string;
+  cost: number;
+  pot: number;
+  currentTurn: string | null;
+  gameOver: boolean;
+};
+
+export type ApplyCompareResult =
+  | { ok: true; data: ApplyCompareOk }
+  | { ok: false; error: string };
+
+export async function applyCompare(
+  userId: string,
+  gameId: string,
+  targetUserId: string
+): Promise<ApplyCompareResult> {
+  const table = isLiveTableMode() ? await getLiveTable(gameId) : null;
+  if (table) {
+    const result = applyCompareToTable(table, userId, targetUserId);
+    if (result.ok) {
+      await markLiveTableDirty(table);
+      publishGameUpdate(gameId, table);
+    }
+    return result;
+  }
+
+  const game = await prisma.zjhGame.findUnique({
+    where: { id: gameId },
+    include: {
+      players: { orderBy: { seatIndex: 'asc' } },
+    },
+  });
+
+  if (!game) {
+    return { ok: false, error: '游戏不存在' };
+  }
+
+  if (game.status !== 'BETTING') {
+    return { ok: false, error: '游戏不在下注阶段' };
+  }
+
+  if (game.currentTurn !== userId) {
+    return { ok: false, error: '不是你的回合' };
+  }
+
+  const initiator = game.players.find((p) => p.userId === userId);
+  const target = game.players.find((p) => p.userId === targetUserId);
+
+  if (!initiator || !target) {
+    return { ok: false, error: '玩家不在游戏中' };
+  }
+
+  // 发起者必须已看牌
+  if (!initiator.hasLooked) {
+    return { ok: false, error: '未看牌不能主动发起比牌' };
+  }
+
+  // 目标玩家必须在游戏中
+  if (target.status === 'FOLDED' || target.status === 'OUT') {
+    return { ok: false, error: '目标玩家已退出' };
+  }
+
+  // 比牌费用
+  const cost = game.currentAnte * BET_MULTIPLIER.COMPARE_COST;
+
+  // 获取发起者当前筹码
+  const roomPlayer = await prisma.zjhRoomPlayer.findFirst({
+    where: { roomId: game.roomId, userId, leftAt: null },
+  });
+  const currentChips = roomPlayer?.chips ?? 0;
+
+  if (currentChips < cost) {
+    return { ok: false, error: '筹码不足以发起比牌' };
+  }
+
+  // 比较手牌
+  const initiatorHand = initiator.hand as unknown as Card[];
+  const targetHand = target.hand as unknown as Card[];
+  const result = compareHands(initiatorHand, targetHand);
+
+  const initiatorEval = evaluateHand(initiatorHand);
+  const targetEval = evaluateHand(targetHand);
+
+  const initiatorWins = result > 0;
+  const winnerId = initiatorWins ? userId : targetUserId;
+  const loserId = initiatorWins ? targetUserId : userId;
+
+  const newPot = game.pot + cost;
+
+  // 扣除比牌费用
+  await prisma.zjhRoomPlayer.updateMany({
+    where: { roomId: game.roomId, userId, leftAt: null },
+    data: { chips: { decrement: cost } },
+  });
+
+  // 更新发起者下注和状态
+  await prisma.zjhGamePlayer.update({
+    where: { id: initiator.id },
+    data: {
+      totalBet: initiator.totalBet + cost,
+      status: initiatorWins ? initiator.status : 'OUT',
+    },
+  });
+
+  // 更新目标玩家状态（仅当目标是失败者时）
+  if (initiatorWins) {
+    await prisma.zjhGamePlayer.update({
+      where: { id: target.id },
+      data: { status: 'OUT' },
+    });
+  }
+
+  // 记录比牌操作
+  const actionCount = await prisma.zjhGameAction.count({
+    where: { gameId, round: game.currentRound },
+  });
+
+  await prisma.zjhGameAction.create({
+    data: {
+      gameId,
+      userId,
+      round: game.currentRound,
+      actionOrder: actionCount + 1,
+      actionType: 'COMPARE',
+      amount: cost,
+      targetUserId,
+      compareResult: initiatorWins,
+    },
+  });
+
+  // 检查游戏是否结束
+  const updatedPlayers = await prisma.zjhGamePlayer.findMany({
+    where: { gameId },
+    orderBy: { seatIndex: 'asc' },
+  });
+
+  const activePlayers = updatedPlayers.filter(
+    (p) => p.status !== 'FOLDED' && p.status !== 'OUT'
+  );
+
+  const gameOver = activePlayers.length <= 1;
+  let nextTurn: string | null = null;
+
+  if (gameOver) {
+    const finalWinnerId = activePlayers.length === 1 ? activePlayers[0].userId : winnerId;
+    await settleGameInDb(gameId, game.roomId, finalWinnerId, newPot, game.currentRound);
+    void syncRoomSeats(game.roomId);
+  } else {
+    // 找下一个行动玩家
+    nextTurn = getNextActivePlayer(updatedPlayers, userId);
+
+    await prisma.zjhGame.update({
+      where: { id: gameId },
+      data: {
+        pot: newPot,
+        currentTurn: nextTurn,
+      },
+    });
+  }
+
+  publishGameUpdate(gameId);
+  if (gameOver) publishRoomUpdate(game.roomId);
+
+  return {
+    ok: true,
+    data: {
+      initiator: {
+        userId,
+        handType: initiatorEval.handType,
+        handTypeDisplay: HAND_TYPE_DISPLAY[initiatorEval.handType],
+      },
+      target: {
+        userId: targetUserId,
+        handType: targetEval.handType,
+        handTypeDisplay: HAND_TYPE_DISPLAY[targetEval.handType],
+      },
+      winnerId,
+      loserId,
+      cost,
+      pot: newPot,
+      currentTurn: gameOver ? null : nextTurn,
+      gameOver,
+    },
+  };
+}
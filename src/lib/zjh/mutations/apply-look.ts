@@ -5,6 +5,9 @@
 import { prisma } from '@/lib/prisma';
 import { evaluateHand } from '@/lib/zjh/hand-evaluator';
 import { HAND_TYPE_DISPLAY } from '@/lib/zjh/constants';
+import { applyLookToTable } from '@/lib/zjh/live/table-state';
+import { getLiveTable, isLiveTableMode, markLiveTableDirty } from '@/lib/zjh/live/table-store';
+import { publishGameUpdate } from '@/lib/zjh/events';
 import type { Card, HandType } from '@/types/zjh';
 
 export type ApplyLookResult =
@@ -12,6 +15,16 @@ export type ApplyLookResult =
   | { ok: false; error: string };
 
 export async function applyLook(userId: string, gameId: string): Promise<ApplyLookResult> {
+  const table = isLiveTableMode() ? await getLiveTable(gameId) : null;
+  if (table) {
+    const result = applyLookToTable(table, userId);
+    if (result.ok) {
+      await markLiveTableDirty(table);
+      publishGameUpdate(gameId, table);
+    }
+    return result;
+  }
+
   const gamePlayer = await prisma.zjhGamePlayer.findFirst({
     where: { gameId, userId },
     include: { game: true },
@@ -67,6 +80,8 @@ export async function applyLook(userId: string, gameId: string): Promise<ApplyLo
     },
   });
 
+  publishGameUpdate(gameId);
+
   return {
     ok: true,
     hand,
@@ -1,21 +1,159 @@
 /**
  * 游戏结算逻辑（共享模块）
  * 从 action 和 compare 路由中提取的公共结算函数
+ *
+ * 结算在一个事务内完成，语句数与玩家人数无关：
+ * 认领牌局（幂等）→ 批量更新对局玩家 → 批量更新房间筹码 → 批量 upsert 战绩 → 房间回到等待
  */
 
+import { randomUUID } from 'crypto';
+import { Prisma } from '@prisma/client';
 import { prisma } from '@/lib/prisma';
 import { evaluateHand } from './hand-evaluator';
 import type { Card, HandType } from '@/types/zjh';
 
+/** 每位玩家的结算结果 */
+export interface SettlementRow {
+  /** ZjhGamePlayer.id */
+  id: string;
+  userId: string;
+  isWinner: boolean;
+  chipsChange: number;
+  /** 结算后筹码（不小于 0） */
+  finalChips: number;
+  handType: HandType;
+  handRank: number;
+}
+
+/** 牌型 → 战绩计数列 */
+const HAND_COUNT_COLUMN: Record<HandType, string> = {
+  TRIPLE: 'tripleCount',
+  STRAIGHT_FLUSH: 'straightFlushCount',
+  FLUSH: 'flushCount',
+  STRAIGHT: 'straightCount',
+  PAIR: 'pairCount',
+  HIGH_CARD: 'highCardCount',
+};
+
+const HAND_TYPES = Object.keys(HAND_COUNT_COLUMN) as HandType[];
+
+/**
+ * 计算每位玩家的结算结果（纯函数）
+ */
+export function buildSettlementRows(
+  players: {
+    id: string;
+    userId: string;
+    hand: Card[];
+    totalBet: number;
+    chipsBeforeGame: number;
+  }[],
+  winnerId: string,
+  pot: number
+): SettlementRow[] {
+  return players.map((gp) => {
+    const isWinner = gp.userId === winnerId;
+    const chipsChange = isWinner ? pot - gp.totalBet : -gp.totalBet;
+    const evaluation = evaluateHand(gp.hand);
+    return {
+      id: gp.id,
+      userId: gp.userId,
+      isWinner,
+      chipsChange,
+      finalChips: Math.max(0, gp.chipsBeforeGame + chipsChange),
+      handType: evaluation.handType,
+      handRank: evaluation.handRank,
+    };
+  });
+}
+
+/**
+ * 批量更新对局玩家
+ */
+function updateGamePlayersSql(rows: SettlementRow[]): Prisma.Sql {
+  const values = Prisma.join(
+    rows.map(
+      (r) => Prisma.sql`(${r.id}, ${r.isWinner}, ${r.chipsChange}, ${r.handType}, ${r.handRank})`
+    )
+  );
+  return Prisma.sql`
+    UPDATE "ZjhGamePlayer" AS gp
+    SET "isWinner" = v."isWinner"::boolean,
+        "chipsChange" = v."chipsChange"::integer,
+        "handType" = v."handType"::"ZjhHandType",
+        "handRank" = v."handRank"::integer
+    FROM (VALUES ${values}) AS v(id, "isWinner", "chipsChange", "handType", "handRank")
+    WHERE gp.id = v.id
+  `;
+}
+
+/**
+ * 批量更新房间玩家筹码（只更新仍在房间中的玩家）
+ */
+function updateRoomChipsSql(roomId: string, rows: SettlementRow[]): Prisma.Sql {
+  const values = Prisma.join(rows.map((r) => Prisma.sql`(${r.userId}, ${r.finalChips})`));
+  return Prisma.sql`
+    UPDATE "ZjhRoomPlayer" AS rp
+    SET chips = v.chips::integer
+    FROM (VALUES ${values}) AS v("userId", chips)
+    WHERE rp."roomId" = ${roomId} AND rp."userId" = v."userId" AND rp."leftAt" IS NULL
+  `;
+}
+
+/**
+ * 批量 upsert 战绩；maxSingleWin 用 GREATEST 原子更新，不需要先读再写
+ */
+function upsertStatsSql(rows: SettlementRow[]): Prisma.Sql {
+  const handColumns = Prisma.raw(HAND_TYPES.map((t) => `"${HAND_COUNT_COLUMN[t]}"`).join(', '));
+  const handUpdates = Prisma.raw(
+    HAND_TYPES.map((t) => {
+      const column = HAND_COUNT_COLUMN[t];
+      return `"${column}" = s."${column}" + EXCLUDED."${column}"`;
+    }).join(',\n        ')
+  );
+
+  const values = Prisma.join(
+    rows.map((r) => {
+      const won = r.isWinner ? Math.max(0, r.chipsChange) : 0;
+      const lost = r.isWinner ? 0 : Math.abs(r.chipsChange);
+      const handCounts = Prisma.join(HAND_TYPES.map((t) => (t === r.handType ? 1 : 0)));
+      return Prisma.sql`(
+        ${randomUUID()}, ${r.userId}, 1, ${r.isWinner ? 1 : 0}, ${won}, ${lost}, ${won},
+        ${r.finalChips}, ${handCounts}, NOW()
+      )`;
+    })
+  );
+
+  return Prisma.sql`
+    INSERT INTO "ZjhPlayerStats" AS s (
+      id, "userId", "totalGames", "totalWins", "totalChipsWon", "totalChipsLost",
+      "maxSingleWin", "currentChips", ${handColumns}, "updatedAt"
+    )
+    VALUES ${values}
+    ON CONFLICT ("userId") DO UPDATE SET
+        "totalGames" = s."totalGames" + 1,
+        "totalWins" = s."totalWins" + EXCLUDED."totalWins",
+        "totalChipsWon" = s."totalChipsWon" + EXCLUDED."totalChipsWon",
+        "totalChipsLost" = s."totalChipsLost" + EXCLUDED."totalChipsLost",
+        "maxSingleWin" = GREATEST(s."maxSingleWin", EXCLUDED."maxSingleWin"),
+        "currentChips" = EXCLUDED."currentChips",
+        ${handUpdates},
+        "updatedAt" = NOW()
+  `;
+}
+
 /**
  * 结算游戏，更新数据库
  * 包含：更新游戏状态、计算筹码变化、更新玩家战绩
  *
+ * 以 endedAt 为空作为认领条件，同一局重复调用只有第一次生效
+ *
  * @param gameId 游戏 ID
  * @param roomId 房间 ID
  * @param winnerId 获胜者 ID
  * @param pot 当前奖池
  * @param currentRound 当前轮次
+ * @returns 本次调用是否完成了结算（已结算过返回 false）
  */
 export async function settleGameInDb(
   gameId: string,
@@ -23,100 +161,45 @@ export async function settleGameInDb(
   winnerId: string,
   pot: number,
   currentRound: number
-) {
+): Promise<boolean> {
   // 获取所有游戏玩家
   const gamePlayers = await prisma.zjhGamePlayer.findMany({
     where: { gameId },
   });
 
-  const winner = gamePlayers.find(p => p.userId === winnerId);
-  if (!winner) return;
-
-  const winnerEval = evaluateHand(winner.hand as unknown as Card[]);
-
-  // 更新游戏状态为结算
-  await prisma.zjhGame.update({
-    where: { id: gameId },
-    data: {
-      status: 'SETTLEMENT',
-      winnerId,
-      winnerHand: winnerEval.handType,
-      currentRound,
-      endedAt: new Date(),
-    },
-  });
+  const rows = buildSettlementRows(
+    gamePlayers.map((gp) => ({ ...gp, hand: gp.hand as unknown as Card[] })),
+    winnerId,
+    pot
+  );
 
-  // 更新每个玩家的筹码变化
-  for (const gp of gamePlayers) {
-    const isWinner = gp.userId === winnerId;
-    const chipsChange = isWinner ? pot - gp.totalBet : -gp.totalBet;
-    const evaluation = evaluateHand(gp.hand as unknown as Card[]);
-    const finalChips = gp.chipsBeforeGame + chipsChange;
+  const winner = rows.find((r) => r.userId === winnerId);
+  if (!winner) return false;
 
-    await prisma.zjhGamePlayer.update({
-      where: { id: gp.id },
+  return prisma.$transaction(async (tx) => {
+    // 认领：只有尚未结算的牌局会被更新
+    const claimed = await tx.zjhGame.updateMany({
+      where: { id: gameId, endedAt: null },
       data: {
-        isWinner,
-        chipsChange,
-        handType: evaluation.handType,
-        handRank: evaluation.handRank,
+        status: 'SETTLEMENT',
+        winnerId,
+        winnerHand: winner.handType,
+        currentRound,
+        endedAt: new Date(),
       },
     });
+    if (claimed.count === 0) return false;
 
-    // 更新房间玩家筹码
-    await prisma.zjhRoomPlayer.updateMany({
-      where: { roomId, userId: gp.userId, leftAt: null },
-      data: { chips: Math.max(0, finalChips) },
-    });
+    await tx.$executeRaw(updateGamePlayersSql(rows));
+    await tx.$executeRaw(updateRoomChipsSql(roomId, rows));
+    await tx.$executeRaw(upsertStatsSql(rows));
 
-    // 更新玩家战绩
-    const handType = evaluation.handType as HandType;
-    const handCountField = {
-      TRIPLE: 'tripleCount',
-      STRAIGHT_FLUSH: 'straightFlushCount',
-      FLUSH: 'flushCount',
-      STRAIGHT: 'straightCount',
-      PAIR: 'pairCount',
-      HIGH_CARD: 'highCardCount',
-    }[handType] as string;
-
-    // 先读取现有战绩，正确比较 maxSingleWin
-    const existingStats = await prisma.zjhPlayerStats.findUnique({
-      where: { userId: gp.userId },
-    });
-
-    const currentMaxWin = existingStats?.maxSingleWin ?? 0;
-    const newMaxWin = isWinner
-      ? Math.max(currentMaxWin, Math.max(0, chipsChange))
-      : currentMaxWin;
-
-    await prisma.zjhPlayerStats.upsert({
-      where: { userId: gp.userId },
-      create: {
-        userId: gp.userId,
-        totalGames: 1,
-        totalWins: isWinner ? 1 : 0,
-        totalChipsWon: isWinner ? Math.max(0, chipsChange) : 0,
-        totalChipsLost: !isWinner ? Math.abs(chipsChange) : 0,
-        maxSingleWin: isWinner ? Math.max(0, chipsChange) : 0,
-        currentChips: Math.max(0, finalChips),
-        [handCountField]: 1,
-      },
-      update: {
-        totalGames: { increment: 1 },
-        totalWins: isWinner ? { increment: 1 } : undefined,
-        totalChipsWon: isWinner ? { increment: Math.max(0, chipsChange) } : undefined,
-        totalChipsLost: !isWinner ? { increment: Math.abs(chipsChange) } : undefined,
-        maxSingleWin: newMaxWin,
-        currentChips: Math.max(0, finalChips),
-        [handCountField]: { increment: 1 },
-      },
+    // 更新房间状态为等待
+    await tx.zjhRoom.update({
+      where: { id: roomId },
+      data: { status: 'WAITING' },
     });
-  }
 
-  // 更新房间状态为等待
-  await prisma.zjhRoom.update({
-    where: { id: roomId },
-    data: { status: 'WAITING' },
+    return true;
   });
 }
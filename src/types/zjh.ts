@@ -194,6 +194,42 @@ export interface GameResultResponse {
   duration: number; // 秒
 }
 
+// ==================== 实时推送类型 ====================
+
+/** 牌局增量中的玩家公开信息（不含手牌） */
+export interface GameDeltaPlayer {
+  userId: string;
+  status: PlayerStatus;
+  hasLooked: boolean;
+  totalBet: number;
+  chips: number;
+}
+
+/** 牌局增量事件：每次操作成功后推送 */
+export interface ZjhGameDelta {
+  type: 'game';
+  gameId: string;
+  status: GameStatus;
+  pot: number;
+  currentAnte: number;
+  currentRound: number;
+  currentTurn: string | null;
+  /** 本局已发生的操作数，用于丢弃乱序/重复事件 */
+  actionCount: number;
+  lastAction: GameActionInfo | null;
+  players: GameDeltaPlayer[];
+}
+
+/** 房间变更事件：收到后重新拉取房间信息；gameId 存在表示新一局已开始 */
+export interface ZjhRoomEvent {
+  type: 'room';
+  roomId: string;
+  gameId?: string;
+}
+
+/** SSE 推送事件 */
+export type ZjhStreamEvent = ZjhGameDelta | ZjhRoomEvent;
+
 // ==================== 玩家数据类型 ====================
 
 /** 玩家战绩响应 */